@@ -0,0 +1,21 @@
+"""Classroom services behind the lesson: quizzes, attempt storage and class dashboards."""
+
+from classroom.dashboard import ClassDashboard, class_codes, load_dashboard
+from classroom.quiz import QUIZ_BANKS, BatchGrader, GradeResult, Question, Quiz, issue_quiz
+from classroom.store import DEFAULT_DATABASE, Attempt, AttemptStore, Reflection
+
+__all__ = [
+    "Attempt",
+    "AttemptStore",
+    "BatchGrader",
+    "ClassDashboard",
+    "DEFAULT_DATABASE",
+    "GradeResult",
+    "QUIZ_BANKS",
+    "Question",
+    "Quiz",
+    "Reflection",
+    "class_codes",
+    "issue_quiz",
+    "load_dashboard",
+]
@@ -0,0 +1,56 @@
+"""Teacher access to the server's class endpoints, without the access code in any URL.
+
+When ``MAGNETISM_TEACHER_CODE`` is set, a request proves it comes from a
+teacher in one of two ways. Scripts send the code in an ``X-Teacher-Code``
+header. Download links on the teacher dashboard, which a browser follows
+without custom headers, carry a short-lived token instead. The token is
+signed with a key that lives only in this process and is scoped to one kind
+of endpoint, so a URL that ends up in a history, proxy log or Referer header
+stops working within minutes and never reveals the code.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+TEACHER_HEADER = "X-Teacher-Code"
+TOKEN_TTL = 15 * 60  # Seconds a dashboard link stays valid; every rerun of the page issues fresh ones
+
+# Signs tokens; the dashboard page and server.py's routes run in the same process.
+_KEY = secrets.token_bytes(32)
+
+
+def teacher_code():
+    """The access code teachers enter, or ``None`` when class data is open."""
+    return os.environ.get("MAGNETISM_TEACHER_CODE") or None
+
+
+def _signature(scope, expires):
+    return hmac.new(_KEY, f"{scope}:{expires}".encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def access_token(scope, ttl=TOKEN_TTL, now=None):
+    """A token for URLs under ``scope`` (e.g. ``"export/class"``), valid for ``ttl`` seconds."""
+    expires = int((time.time() if now is None else now) + ttl)
+    return f"{expires}.{_signature(scope, expires)}"
+
+
+def valid_token(token, scope, now=None):
+    """Whether ``token`` came from ``access_token(scope)`` and has not expired."""
+    expires, _, signature = (token or "").partition(".")
+    if not expires.isdigit() or int(expires) < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(signature, _signature(scope, int(expires)))
+
+
+def teacher_allowed(headers, token, scope):
+    """Whether a request with ``headers`` and query ``token`` may read ``scope``'s class data."""
+    code = teacher_code()
+    if code is None:
+        return True
+    sent = headers.get(TEACHER_HEADER)
+    if sent is not None and hmac.compare_digest(sent.encode(), code.encode()):
+        return True
+    return valid_token(token, scope)
@@ -0,0 +1,75 @@
+"""Class summaries for the teacher dashboard, read from the store's aggregate tables.
+
+Every query here touches only the per-class aggregates that the store's writer
+keeps up to date, so the cost depends on the number of classes and question
+templates, not on how many attempts have been stored.
+"""
+
+from dataclasses import dataclass
+
+from classroom.quiz import QUESTION_TITLES
+
+SCORE_BUCKETS = 10  # Score distribution in 10-point bands; 100% gets its own band
+
+
+@dataclass(frozen=True)
+class ClassDashboard:
+    classes: list  # One dict per class: code, students, attempted, reflected, attempts, reflections
+    questions: list  # One dict per question: question, title, topic, answered, accuracy
+    scores: list  # Attempts per score band, low to high; the last entry is a perfect score
+
+
+def _placeholders(values):
+    return ", ".join("?" for _ in values)
+
+
+def load_dashboard(connection, class_codes=None):
+    """Summarize ``class_codes`` (every class when ``None``) from the aggregate tables."""
+    if class_codes is not None and not class_codes:
+        return ClassDashboard([], [], [0] * (SCORE_BUCKETS + 1))
+    where = "" if class_codes is None else f"WHERE class_code IN ({_placeholders(class_codes)})"
+    params = () if class_codes is None else tuple(class_codes)
+
+    classes = [
+        {
+            "code": code or "(no class code)",
+            "students": students,
+            "attempted": attempted,
+            "reflected": reflected,
+            "attempts": attempts,
+            "reflections": reflections,
+        }
+        for code, students, attempted, reflected, attempts, reflections in connection.execute(
+            "SELECT class_code, students, attempted_students, reflected_students, attempts, reflections "
+            f"FROM class_summary {where} ORDER BY class_code",
+            params,
+        )
+    ]
+
+    questions = [
+        {
+            "question": question,
+            "title": QUESTION_TITLES.get(question, question),
+            "topic": topic,
+            "answered": answered,
+            "accuracy": correct / answered if answered else 0.0,
+        }
+        for question, topic, answered, correct in connection.execute(
+            "SELECT question, MIN(topic), SUM(answered), SUM(correct) "
+            f"FROM class_questions {where} GROUP BY question ORDER BY question",
+            params,
+        )
+    ]
+
+    scores = [0] * (SCORE_BUCKETS + 1)
+    for correct, total, attempts in connection.execute(
+        f"SELECT correct, total, SUM(attempts) FROM class_scores {where} GROUP BY correct, total",
+        params,
+    ):
+        scores[min(SCORE_BUCKETS, correct * SCORE_BUCKETS // total) if total else 0] += attempts
+    return ClassDashboard(classes, questions, scores)
+
+
+def class_codes(connection):
+    """Every class code that has stored any attempt or reflection."""
+    return [code for (code,) in connection.execute("SELECT class_code FROM class_summary ORDER BY class_code")]
@@ -0,0 +1,248 @@
+"""Chunked exports of lab data and stored results as CSV or Parquet.
+
+An export is a ``Table``: a column schema plus an iterator of chunks, each a
+dict of equal-length columns. Sources compute or fetch one chunk at a time
+(curves by index range, grids by row band, stored attempts through a cursor)
+and the writers turn each chunk into bytes before asking for the next, so an
+export of any size runs in memory proportional to the chunk size.
+
+Tables are single-pass: build a new one for every export.
+"""
+
+import csv
+import io
+import tempfile
+from dataclasses import dataclass
+
+import numpy as np
+
+from magnetism import fields
+
+CHUNK_ROWS = 65_536
+QUERY_CHUNK_ROWS = 16_384  # Fetched rows are Python tuples, so stored-data chunks are kept smaller
+
+# Planar field models that can be evaluated at arbitrary points, keyed like magnetism.FIELD_MODELS.
+GRID_MODELS = {
+    "dipole": fields.dipole_field,
+    "bar_magnet": fields.bar_magnet_field,
+    "wire": fields.wire_field,
+    "superposition": fields.superposed_field,
+    "solenoid_plane": fields.solenoid_plane_field,
+}
+
+
+@dataclass(frozen=True)
+class Table:
+    columns: tuple  # (name, type) pairs; type is "float64", "int64" or "string"
+    chunks: object  # Iterator of {name: sequence} dicts
+
+    @property
+    def names(self):
+        return [name for name, _ in self.columns]
+
+
+# --- Sources ---
+def field_curve(k=100.0, start=1.0, stop=10.0, resolution=1000, chunk_rows=CHUNK_ROWS):
+    """The inverse-square curve ``k / r**2`` at ``resolution`` evenly spaced distances."""
+    def chunks():
+        step = (stop - start) / max(resolution - 1, 1)
+        for first in range(0, resolution, chunk_rows):
+            distance = start + step * np.arange(first, min(first + chunk_rows, resolution))
+            yield {"distance": distance, "field_strength": fields.field_strength(distance, k)}
+
+    return Table((("distance", "float64"), ("field_strength", "float64")), chunks())
+
+
+def field_grid(model, resolution=256, extent=2.0, chunk_rows=CHUNK_ROWS, **params):
+    """A planar field model sampled on the same square grid as ``magnetism.fields.grid``, one band of rows at a time."""
+    if model not in GRID_MODELS:
+        raise ValueError(f"Unknown grid model {model!r}; expected one of {sorted(GRID_MODELS)}")
+
+    def chunks():
+        axis = np.linspace(-extent, extent, resolution)
+        rows_per_chunk = max(1, chunk_rows // resolution)
+        for first in range(0, resolution, rows_per_chunk):
+            x, y = np.meshgrid(axis, axis[first:first + rows_per_chunk])
+            bx, by = GRID_MODELS[model](x, y, **params)
+            yield {"x": x.ravel(), "y": y.ravel(), "bx": bx.ravel(), "by": by.ravel(), "magnitude": np.hypot(bx, by).ravel()}
+
+    return Table(tuple((name, "float64") for name in ("x", "y", "bx", "by", "magnitude")), chunks())
+
+
+def electromagnet_table(max_current=10.0, max_coils=100, current_steps=101, chunk_rows=CHUNK_ROWS):
+    """Field at the coil's centre (mT) for every whole number of coils up to ``max_coils`` at ``current_steps`` currents."""
+    def chunks():
+        currents = np.linspace(0.0, max_current, current_steps)
+        coils = np.arange(1, max_coils + 1)
+        currents_per_chunk = max(1, chunk_rows // max_coils)
+        for first in range(0, current_steps, currents_per_chunk):
+            current, coil = np.meshgrid(currents[first:first + currents_per_chunk], coils, indexing="ij")
+            yield {
+                "current": current.ravel(),
+                "coils": coil.ravel(),
+                "strength": fields.electromagnet_strength(current, coil).ravel(),
+            }
+
+    return Table((("current", "float64"), ("coils", "int64"), ("strength", "float64")), chunks())
+
+
+def _query_table(connection, columns, sql, params, chunk_rows):
+    def chunks():
+        cursor = connection.execute(sql, params)
+        try:
+            while rows := cursor.fetchmany(chunk_rows):
+                yield dict(zip((name for name, _ in columns), zip(*rows)))
+        finally:
+            cursor.close()
+
+    return Table(columns, chunks())
+
+
+def _class_filter(class_codes, column):
+    if class_codes is None:
+        return "", ()
+    return f"WHERE {column} IN ({', '.join('?' for _ in class_codes)})", tuple(class_codes)
+
+
+def attempts_table(connection, class_codes=None, chunk_rows=QUERY_CHUNK_ROWS):
+    """One row per stored quiz attempt, oldest first."""
+    where, params = _class_filter(class_codes, "class_code")
+    return _query_table(
+        connection,
+        (
+            ("attempt_id", "string"), ("class_code", "string"), ("student", "string"),
+            ("submitted_at", "float64"), ("correct", "int64"), ("total", "int64"),
+        ),
+        f"SELECT id, class_code, student, submitted_at, correct, total FROM attempts {where} ORDER BY rowid",
+        params,
+        chunk_rows,
+    )
+
+
+def responses_table(connection, class_codes=None, chunk_rows=QUERY_CHUNK_ROWS):
+    """One row per answered question, with the attempt's class and student."""
+    where, params = _class_filter(class_codes, "a.class_code")
+    return _query_table(
+        connection,
+        (
+            ("attempt_id", "string"), ("class_code", "string"), ("student", "string"), ("position", "int64"),
+            ("question_id", "string"), ("topic", "string"), ("chosen", "int64"), ("correct", "int64"),
+        ),
+        "SELECT r.attempt_id, a.class_code, a.student, r.position, r.question_id, r.topic, r.chosen, r.correct "
+        f"FROM responses r JOIN attempts a ON a.id = r.attempt_id {where} ORDER BY r.rowid",
+        params,
+        chunk_rows,
+    )
+
+
+# Lab datasets offered for download, with the largest resolution each accepts.
+LAB_DATASETS = {
+    "field-curve": ("Field-strength curve (k / r²)", 10_000_000),
+    "field-grid": ("Field grid (bar magnet, wire or solenoid)", 4096),
+    "electromagnet": ("Electromagnet field at the coil's centre (mT) by current and coils", 100_000),
+}
+LAB_GRID_MODELS = {
+    "bar_magnet": {"length": 1.0},
+    "wire": {},
+    "solenoid_plane": {"turns": 10, "length": 2.0, "radius": 0.5},
+}
+# Tighter caps for grid models that cost far more per point: the solenoid sums Biot–Savart over every
+# segment of its wire, so it stays near the resolution of the lesson's own coil maps.
+LAB_GRID_LIMITS = {"solenoid_plane": 129}
+
+
+def lab_limit(dataset, model="bar_magnet"):
+    """The largest resolution ``lab_table`` accepts for ``dataset`` (and, for grids, ``model``)."""
+    limit = LAB_DATASETS[dataset][1]
+    if dataset == "field-grid":
+        limit = min(limit, LAB_GRID_LIMITS.get(model, limit))
+    return limit
+
+
+def lab_table(dataset, resolution, model="bar_magnet"):
+    """A lab dataset from ``LAB_DATASETS`` at the requested resolution (points, grid size or current steps)."""
+    if dataset not in LAB_DATASETS:
+        raise ValueError(f"Unknown lab dataset {dataset!r}; expected one of {sorted(LAB_DATASETS)}")
+    if dataset == "field-grid" and model not in LAB_GRID_MODELS:
+        raise ValueError(f"Unknown grid model {model!r}; expected one of {sorted(LAB_GRID_MODELS)}")
+    limit = lab_limit(dataset, model)
+    if not 2 <= resolution <= limit:
+        raise ValueError(f"Resolution for {dataset} must be between 2 and {limit}")
+    if dataset == "field-curve":
+        return field_curve(resolution=resolution)
+    if dataset == "field-grid":
+        return field_grid(model, resolution, **LAB_GRID_MODELS[model])
+    return electromagnet_table(current_steps=resolution)
+
+
+# --- Writers ---
+def iter_csv(table):
+    """Yield the table as UTF-8 CSV, one encoded chunk at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table.names)
+    for chunk in table.chunks:
+        columns = [chunk[name] for name in table.names]
+        writer.writerows(zip(*(column.tolist() if isinstance(column, np.ndarray) else column for column in columns)))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")  # Header only, when the table is empty
+
+
+class _ByteSink(io.RawIOBase):
+    # Collects what the Parquet writer emits so it can be handed out between row groups.
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self):
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def iter_parquet(table, compression="zstd"):
+    """Yield the table as a Parquet file, one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"float64": pa.float64(), "int64": pa.int64(), "string": pa.string()}
+    schema = pa.schema([(name, types[kind]) for name, kind in table.columns])
+    sink = _ByteSink()
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for chunk in table.chunks:
+            writer.write_table(pa.table({name: chunk[name] for name in table.names}, schema=schema))
+            yield sink.take()
+    yield sink.take()
+
+
+WRITERS = {"csv": iter_csv, "parquet": iter_parquet}
+MIME_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def iter_export(table, fmt):
+    """Yield ``table`` encoded as ``fmt`` ("csv" or "parquet")."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(WRITERS)}")
+    return WRITERS[fmt](table)
+
+
+def spool_export(table, fmt, max_memory=8 * 1024 * 1024):
+    """Write an export to a temporary file (in memory while small) and return it rewound."""
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    for part in iter_export(table, fmt):
+        spool.write(part)
+    spool.seek(0)
+    return spool
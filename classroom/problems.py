@@ -0,0 +1,189 @@
+"""Parametric practice problems, generated, solved and checked in bulk with NumPy.
+
+Each family pairs a prompt template with a grid of parameter values and a
+vectorized solver built on the physics engine. A batch is drawn without
+replacement from the combined parameter space of the chosen families, so
+every problem in it is unique; a full semester of worksheets is one call.
+Answers are checked with a relative tolerance so rounded working still
+counts, and worksheets stream out as printable HTML one page at a time.
+"""
+
+import html
+from dataclasses import dataclass
+
+import numpy as np
+
+from magnetism import fields
+
+
+@dataclass(frozen=True)
+class ProblemFamily:
+    name: str
+    prompt: str  # Formatted with the problem's parameters a, b and c
+    unit: str
+    axes: tuple  # One array of allowed values per free parameter; each must change the answer
+    build: object  # (grid values per axis) -> (a, b, c, answer) arrays
+
+
+def _field_at_distance(k, r):
+    return k, r, np.zeros_like(k), fields.field_strength(r, k)
+
+
+def _distance_for_fraction(r, fraction):
+    # k / d**2 = (k / r**2) / fraction gives d = r * sqrt(fraction): the answer is the same for every magnet.
+    return r, fraction, np.zeros_like(r), r * np.sqrt(fraction)
+
+
+def _distance_for_strength(k, target):
+    # Solve k / d**2 = target for d with the same model the lesson plots.
+    return k, target, np.zeros_like(k), np.sqrt(k / target)
+
+
+def _current_for_strength(coils, current):
+    strength = fields.electromagnet_strength(current, coils)
+    return coils, np.zeros_like(coils), strength, strength / fields.electromagnet_strength(1.0, coils)
+
+
+def _coils_for_strength(current, coils):
+    strength = fields.electromagnet_strength(current, coils)
+    return current, np.zeros_like(current), strength, strength / fields.electromagnet_strength(current, 1.0)
+
+
+FAMILIES = (
+    ProblemFamily(
+        "field_at_distance",
+        "A magnet has strength constant k = {a:g}. Using B = k / r², find the field strength B at r = {b:g}.",
+        "units",
+        (np.arange(10.0, 1001.0, 10.0), np.arange(0.25, 10.01, 0.25)),
+        _field_at_distance,
+    ),
+    ProblemFamily(
+        "distance_for_fraction",
+        "A magnet's field strength is measured at r = {a:g}. Using B = k / r², at what distance does it fall to "
+        "1/{b:g} of that value?",
+        "units of distance",
+        (np.arange(0.25, 10.01, 0.25), np.array([2.0, 3.0, 4.0, 5.0, 9.0, 16.0])),
+        _distance_for_fraction,
+    ),
+    ProblemFamily(
+        "distance_for_strength",
+        "A magnet has strength constant k = {a:g}. Using B = k / r², at what distance r is the field strength "
+        "B = {b:g}?",
+        "units of distance",
+        (np.arange(10.0, 1001.0, 10.0), np.arange(0.5, 100.01, 0.5)),
+        _distance_for_strength,
+    ),
+    ProblemFamily(
+        "current_for_strength",
+        "The lesson's electromagnet is a coil 10 cm long and 2 cm in radius; with an air core the field at its centre "
+        "is B = μ₀ × coils × current / √(L² + 4R²). With {a:g} coils, what current gives B = {c:.4g} mT?",
+        "A",
+        (np.arange(5.0, 501.0, 5.0), np.arange(0.25, 20.01, 0.25)),
+        _current_for_strength,
+    ),
+    ProblemFamily(
+        "coils_for_strength",
+        "The lesson's electromagnet is a coil 10 cm long and 2 cm in radius; with an air core the field at its centre "
+        "is B = μ₀ × coils × current / √(L² + 4R²). At {a:g} A, how many coils give B = {c:.4g} mT?",
+        "coils",
+        (np.arange(0.25, 20.01, 0.25), np.arange(5.0, 501.0, 5.0)),
+        _coils_for_strength,
+    ),
+)
+
+FAMILY_NAMES = tuple(family.name for family in FAMILIES)
+
+
+@dataclass(frozen=True)
+class ProblemBatch:
+    family: np.ndarray  # Index into FAMILIES, one per problem
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    answer: np.ndarray
+
+    def __len__(self):
+        return len(self.family)
+
+    def prompt(self, index):
+        family = FAMILIES[self.family[index]]
+        return family.prompt.format(a=self.a[index], b=self.b[index], c=self.c[index])
+
+    def answer_text(self, index):
+        return f"{self.answer[index]:.4g} {FAMILIES[self.family[index]].unit}"
+
+
+def problem_space(families=FAMILY_NAMES):
+    """Number of distinct problems the given families can produce."""
+    return sum(int(np.prod([len(axis) for axis in FAMILIES[FAMILY_NAMES.index(name)].axes])) for name in families)
+
+
+def generate(count, seed=None, families=FAMILY_NAMES):
+    """Draw ``count`` distinct problems from ``families``, solved, as one ``ProblemBatch``."""
+    indices = [FAMILY_NAMES.index(name) for name in families]
+    sizes = np.array([np.prod([len(axis) for axis in FAMILIES[i].axes]) for i in indices], dtype=np.int64)
+    if count > sizes.sum():
+        raise ValueError(f"Asked for {count} unique problems but {', '.join(families)} only allow {sizes.sum()}")
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(int(sizes.sum()), size=count, replace=False)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    which = np.searchsorted(offsets, picks, side="right") - 1
+
+    family = np.empty(count, dtype=np.int8)
+    a, b, c, answer = (np.empty(count) for _ in range(4))
+    for slot, index in enumerate(indices):
+        mask = which == slot
+        if not mask.any():
+            continue
+        axes = FAMILIES[index].axes
+        positions = np.unravel_index(picks[mask] - offsets[slot], [len(axis) for axis in axes])
+        values = [axis[position] for axis, position in zip(axes, positions)]
+        family[mask] = index
+        a[mask], b[mask], c[mask], answer[mask] = FAMILIES[index].build(*values)
+    return ProblemBatch(family, a, b, c, answer)
+
+
+def parse_responses(responses):
+    """Turn typed answers into floats; blanks and non-numbers become NaN (always marked wrong)."""
+    parsed = np.full(len(responses), np.nan)
+    for i, response in enumerate(responses):
+        try:
+            parsed[i] = float(str(response).replace(",", "").strip())
+        except ValueError:
+            pass
+    return parsed
+
+
+def check_answers(batch, responses, rel_tol=0.02, abs_tol=1e-9):
+    """Mark ``responses`` (one number or NaN per problem) against the batch; returns a bool array."""
+    responses = np.asarray(responses, dtype=np.float64)
+    return np.isfinite(responses) & np.isclose(responses, batch.answer, rtol=rel_tol, atol=abs_tol)
+
+
+PRINT_STYLE = """
+body { font-family: Inter, sans-serif; color: #333; margin: 2rem; }
+h1 { color: #005a9c; font-size: 1.4rem; }
+ol { line-height: 1.6; }
+li { margin-bottom: 1.6rem; }
+.sheet { page-break-after: always; }
+.key li { margin-bottom: 0.2rem; }
+@media print { body { margin: 0; } }
+"""
+
+
+def iter_printable_html(batch, per_sheet=10, title="Magnetism Practice"):
+    """Yield a printable HTML document in chunks: one page per worksheet, then the answer keys."""
+    title = html.escape(title)
+    sheets = range(0, len(batch), per_sheet)
+    yield f"<!DOCTYPE html><html><head><meta charset=\"UTF-8\"><title>{title}</title><style>{PRINT_STYLE}</style></head><body>"
+    for number, start in enumerate(sheets, 1):
+        items = "".join(
+            f"<li>{html.escape(batch.prompt(i))}</li>" for i in range(start, min(start + per_sheet, len(batch)))
+        )
+        yield f'<section class="sheet"><h1>{title}: Worksheet {number}</h1><p>Name: ____________________</p><ol>{items}</ol></section>'
+    for number, start in enumerate(sheets, 1):
+        items = "".join(
+            f"<li>{html.escape(batch.answer_text(i))}</li>" for i in range(start, min(start + per_sheet, len(batch)))
+        )
+        yield f'<section class="key"><h1>Answer Key: Worksheet {number}</h1><ol>{items}</ol></section>'
+    yield "</body></html>"
@@ -0,0 +1,229 @@
+"""Server-side quiz: a question bank with randomized variants and a batched grader.
+
+Answer keys never leave the server. The browser receives ``Quiz.public()``
+(prompts and options only) and sends back one option index per question;
+submissions from every session are queued and graded together with one
+vectorized comparison, then handed to the attempt store as a single batch.
+"""
+
+import queue
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import numpy as np
+
+from classroom.store import Attempt
+from magnetism import fields
+
+
+@dataclass(frozen=True)
+class Question:
+    id: str
+    topic: str
+    prompt: str
+    options: tuple
+    answer: int
+
+
+@dataclass(frozen=True)
+class Quiz:
+    id: str
+    questions: tuple
+
+    def public(self):
+        """The quiz as sent to the browser, without the answer key."""
+        return {
+            "id": self.id,
+            "questions": [{"id": q.id, "prompt": q.prompt, "options": list(q.options)} for q in self.questions],
+        }
+
+
+@dataclass(frozen=True)
+class GradeResult:
+    quiz_id: str
+    correct: int
+    total: int
+    marks: tuple
+
+
+def _choice(rng, question_id, topic, prompt, answer, distractors):
+    options = [answer] + [option for option in dict.fromkeys(distractors) if option != answer][:3]
+    rng.shuffle(options)
+    return Question(question_id, topic, prompt, tuple(options), options.index(answer))
+
+
+def _format(value):
+    return f"{value:.4g}"
+
+
+# --- Conceptual questions (options shuffled per variant) ---
+CONCEPT_QUESTIONS = (
+    (
+        "electromagnet_factors",
+        "electromagnetism",
+        "Which of these factors increases the strength of an electromagnet?",
+        "Increasing the number of coils",
+        ("Decreasing the current", "Using a non-magnetic core", "Increasing the distance from the core"),
+    ),
+    (
+        "distance_law",
+        "inverse_square",
+        "How does magnetic field strength change as you move further from a magnet?",
+        "It decreases by the inverse square of the distance",
+        ("It increases linearly", "It decreases linearly", "It remains constant"),
+    ),
+    (
+        "field_purpose",
+        "fields",
+        "What is the primary function of a magnetic field?",
+        "To exert force on moving electric charges",
+        ("To generate heat", "To produce light", "To conduct electricity"),
+    ),
+)
+
+
+def _concept(rng, index):
+    question_id, topic, prompt, answer, distractors = CONCEPT_QUESTIONS[index]
+    return _choice(rng, question_id, topic, prompt, answer, distractors)
+
+
+# --- Parametric questions (numbers drawn per variant, answers from the physics engine) ---
+def _inverse_square_value(rng):
+    k = rng.choice((50, 80, 100, 120, 150, 200))
+    r = rng.choice((2, 2.5, 4, 5, 8))
+    answer = float(fields.field_strength(r, k))
+    return _choice(
+        rng,
+        f"inverse_square_value:k={k},r={r}",
+        "inverse_square",
+        f"A magnet's field strength follows B = k / r² with k = {k}. What is B at r = {r}?",
+        _format(answer),
+        (_format(k / r), _format(k * r * r), _format(k / (2 * r)), _format(answer * 2)),
+    )
+
+
+def _inverse_square_ratio(rng):
+    factor = rng.choice((2, 3, 4, 5))
+    ratio = float(fields.field_strength(factor, 1.0))
+    return _choice(
+        rng,
+        f"inverse_square_ratio:n={factor}",
+        "inverse_square",
+        f"You move a compass {factor} times further from a magnet. By what factor does the field strength change?",
+        f"× {_format(ratio)}",
+        (f"× {_format(1 / factor)}", f"× {factor}", f"× {factor * factor}", f"× {_format(1 / (2 * factor))}"),
+    )
+
+
+def _electromagnet(rng):
+    current = rng.choice((1, 2, 3, 4, 5))
+    coils = rng.choice((10, 20, 50, 100))
+    answer = float(fields.electromagnet_strength(current, coils))
+    long_coil = float(fields.MU_0 * coils * current / 0.1 * 1e3)  # Ignores the coil's finite length
+    return _choice(
+        rng,
+        f"electromagnet:i={current},n={coils}",
+        "electromagnetism",
+        f"The lesson's electromagnet is a coil 10 cm long and 2 cm in radius. With an air core, the field at its "
+        f"centre is B = μ₀ × coils × current / √(L² + 4R²). What is B for {current} A through {coils} coils?",
+        f"{_format(answer)} mT",
+        tuple(f"{_format(value)} mT" for value in (long_coil, answer / 2, answer * 2, answer * 10)),
+    )
+
+
+PARAMETRIC_QUESTIONS = (_inverse_square_value, _inverse_square_ratio, _electromagnet)
+
+# Short names for reports, keyed by question id without the variant parameters.
+QUESTION_TITLES = {
+    "electromagnet_factors": "What strengthens an electromagnet",
+    "distance_law": "How field strength falls off with distance",
+    "field_purpose": "What a magnetic field does",
+    "inverse_square_value": "Evaluate k / r² (parametric)",
+    "inverse_square_ratio": "Scale factor for n× the distance (parametric)",
+    "electromagnet": "Field at the electromagnet's centre from current and coils (parametric)",
+}
+
+
+def issue_quiz(seed=None, parametric=2):
+    """Draw a quiz: every conceptual question plus ``parametric`` distinct parametric ones."""
+    rng = random.Random(seed)
+    questions = [_concept(rng, index) for index in range(len(CONCEPT_QUESTIONS))]
+    questions += [template(rng) for template in rng.sample(PARAMETRIC_QUESTIONS, parametric)]
+    return Quiz(uuid.uuid4().hex, tuple(questions))
+
+
+# Question banks a lesson spec can name in its "quiz" block.
+QUIZ_BANKS = {"magnetism": issue_quiz}
+
+
+class BatchGrader:
+    """Grades submissions from all sessions in batches on one background thread.
+
+    ``submit`` returns a ``Future`` immediately; the worker collects whatever
+    arrives within ``max_delay`` seconds (up to ``max_batch`` submissions),
+    grades the batch with one NumPy comparison and passes the attempts to
+    ``store.append`` in one call.
+    """
+
+    def __init__(self, store=None, max_batch=256, max_delay=0.02):
+        self.store = store
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="quiz-grader", daemon=True)
+        self._thread.start()
+
+    def submit(self, quiz, answers, session="", student="", class_code=""):
+        future = Future()
+        self._queue.put((quiz, answers, session, student, class_code, time.time(), future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._grade(batch)
+            except Exception as error:  # Never leave a rerun waiting on a dead worker
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+
+    def _grade(self, batch):
+        width = max(len(quiz.questions) for quiz, *_ in batch)
+        keys = np.full((len(batch), width), -2, dtype=np.int16)  # -2 pads short quizzes, -1 means unanswered
+        chosen = np.full((len(batch), width), -1, dtype=np.int16)
+        for row, (quiz, answers, *_) in enumerate(batch):
+            keys[row, :len(quiz.questions)] = [q.answer for q in quiz.questions]
+            for column, (question, answer) in enumerate(zip(quiz.questions, answers)):
+                if isinstance(answer, int) and 0 <= answer < len(question.options):
+                    chosen[row, column] = answer
+        marks = chosen == keys
+        scores = marks.sum(axis=1)
+
+        attempts = []
+        for row, (quiz, _, session, student, class_code, submitted_at, future) in enumerate(batch):
+            total = len(quiz.questions)
+            row_marks = tuple(bool(mark) for mark in marks[row, :total])
+            attempts.append(Attempt(
+                uuid.uuid4().hex, session, student, class_code, quiz.id, submitted_at, int(scores[row]), total,
+                tuple(
+                    (q.id, q.topic, int(chosen[row, column]), row_marks[column])
+                    for column, q in enumerate(quiz.questions)
+                ),
+            ))
+            future.set_result(GradeResult(quiz.id, int(scores[row]), total, row_marks))
+        if self.store is not None:
+            self.store.append(attempts)
@@ -0,0 +1,303 @@
+"""Append-only SQLite store for quiz attempts and reflections, with class aggregates.
+
+The database runs in WAL mode so readers (e.g. the teacher dashboard) never
+block the writer and vice versa. All writes go through one background thread
+that drains its queue into a single transaction per batch, so a class
+submitting at once costs a handful of commits instead of one fsync per
+student, and the Streamlit rerun that produced a record never waits for the
+disk.
+
+The same transaction folds the batch into small per-class aggregate tables
+(question accuracy, score distribution, student totals), so reading a class
+summary never scans the raw attempts.
+
+The app's database is ``data/lesson.db``; set ``MAGNETISM_DATABASE`` to use
+another file (the load test points its server at a throwaway one).
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_DATABASE = Path(
+    os.environ.get("MAGNETISM_DATABASE") or Path(__file__).resolve().parent.parent / "data" / "lesson.db"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id TEXT PRIMARY KEY,
+    session TEXT NOT NULL,
+    student TEXT NOT NULL,
+    class_code TEXT NOT NULL,
+    quiz_id TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    attempt_id TEXT NOT NULL REFERENCES attempts(id),
+    position INTEGER NOT NULL,
+    question_id TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    chosen INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (attempt_id, position)
+);
+CREATE TABLE IF NOT EXISTS reflections (
+    id TEXT PRIMARY KEY,
+    session TEXT NOT NULL,
+    student TEXT NOT NULL,
+    class_code TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_submitted_at ON attempts(submitted_at);
+
+-- Aggregates, updated in the same transaction as the rows they summarize.
+CREATE TABLE IF NOT EXISTS class_questions (
+    class_code TEXT NOT NULL,
+    question TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    answered INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (class_code, question)
+);
+CREATE TABLE IF NOT EXISTS class_scores (
+    class_code TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (class_code, correct, total)
+);
+CREATE TABLE IF NOT EXISTS class_students (
+    class_code TEXT NOT NULL,
+    student TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reflections INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (class_code, student)
+);
+CREATE TABLE IF NOT EXISTS class_summary (
+    class_code TEXT PRIMARY KEY,
+    students INTEGER NOT NULL DEFAULT 0,
+    attempted_students INTEGER NOT NULL DEFAULT 0,
+    reflected_students INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reflections INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Attempt:
+    id: str
+    session: str
+    student: str
+    class_code: str
+    quiz_id: str
+    submitted_at: float
+    correct: int
+    total: int
+    responses: tuple  # (question_id, topic, chosen option or -1, is_correct) per question
+
+
+@dataclass(frozen=True)
+class Reflection:
+    id: str
+    session: str
+    student: str
+    class_code: str
+    submitted_at: float
+    text: str
+
+
+def student_key(record):
+    """Who a record counts towards: the typed name when there is one, otherwise the browser session."""
+    name = " ".join(record.student.split()).casefold()
+    return name or f"session:{record.session}"
+
+
+def question_key(question_id):
+    """Variants of a parametric question (``inverse_square_value:k=50,r=2``) aggregate under one key."""
+    return question_id.split(":", 1)[0]
+
+
+def connect(path):
+    """Open a connection with the pragmas every user of the store relies on."""
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+    return connection
+
+
+def create_schema(path):
+    with closing(connect(path)) as connection:
+        connection.executescript(SCHEMA)
+
+
+class AttemptStore:
+    """Batches attempts and reflections from every session into few, large SQLite transactions."""
+
+    def __init__(self, path=DEFAULT_DATABASE, max_batch=500, max_delay=0.25):
+        self.path = str(path)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        create_schema(self.path)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="attempt-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, records):
+        """Queue attempts and/or reflections for writing; returns immediately.
+
+        The returned ``Future`` resolves once the records are committed, or
+        fails with the error that made the writer drop their batch.
+        """
+        future = Future()
+        self._queue.put((tuple(records), future))
+        return future
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def reader(self):
+        """A new connection for queries; WAL lets it read while the writer commits."""
+        return connect(self.path)
+
+    def _run(self):
+        connection = connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            size = _batch_size(batch[0])
+            deadline = time.monotonic() + self.max_delay
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                size += _batch_size(batch[-1])
+            appends = [item for item in batch if not isinstance(item, threading.Event)]
+            records = [record for group, _ in appends for record in group]
+            try:
+                if records:
+                    self._write(connection, records)
+            except Exception as error:  # One bad batch must not stop the writer for every later session
+                logger.exception("Dropped a batch of %d lesson records", len(records))
+                for _, future in appends:
+                    future.set_exception(error)
+            else:
+                for _, future in appends:
+                    future.set_result(None)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    @staticmethod
+    def _write(connection, records):
+        attempts = [r for r in records if isinstance(r, Attempt)]
+        reflections = [r for r in records if isinstance(r, Reflection)]
+        with connection:
+            # Aggregates only count rows that were actually inserted, so a replayed record is harmless.
+            new_attempts = [
+                a for a in attempts
+                if connection.execute(
+                    "INSERT OR IGNORE INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (a.id, a.session, a.student, a.class_code, a.quiz_id, a.submitted_at, a.correct, a.total),
+                ).rowcount
+            ]
+            new_reflections = [
+                r for r in reflections
+                if connection.execute(
+                    "INSERT OR IGNORE INTO reflections VALUES (?, ?, ?, ?, ?, ?)",
+                    (r.id, r.session, r.student, r.class_code, r.submitted_at, r.text),
+                ).rowcount
+            ]
+            connection.executemany(
+                "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (a.id, position, question_id, topic, chosen, int(correct))
+                    for a in new_attempts
+                    for position, (question_id, topic, chosen, correct) in enumerate(a.responses)
+                ],
+            )
+            _update_aggregates(connection, new_attempts, new_reflections)
+
+
+def _batch_size(item):
+    # Queued appends count by their records toward max_batch; flush markers count for nothing.
+    return 0 if isinstance(item, threading.Event) else len(item[0])
+
+
+def _update_aggregates(connection, attempts, reflections):
+    answered = Counter()
+    correct = Counter()
+    topics = {}
+    for a in attempts:
+        for question_id, topic, _, is_correct in a.responses:
+            key = (a.class_code, question_key(question_id))
+            answered[key] += 1
+            correct[key] += int(is_correct)
+            topics[key] = topic
+    connection.executemany(
+        "INSERT INTO class_questions (class_code, question, topic, answered, correct) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (class_code, question) DO UPDATE SET "
+        "answered = answered + excluded.answered, correct = correct + excluded.correct",
+        [key + (topics[key], answered[key], correct[key]) for key in answered],
+    )
+
+    scores = Counter((a.class_code, a.correct, a.total) for a in attempts)
+    connection.executemany(
+        "INSERT INTO class_scores (class_code, correct, total, attempts) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (class_code, correct, total) DO UPDATE SET attempts = attempts + excluded.attempts",
+        [key + (count,) for key, count in scores.items()],
+    )
+
+    added_attempts = Counter((a.class_code, student_key(a)) for a in attempts)
+    added_reflections = Counter((r.class_code, student_key(r)) for r in reflections)
+    summary = {}
+    for class_code, student in added_attempts.keys() | added_reflections.keys():
+        row = connection.execute(
+            "SELECT attempts, reflections FROM class_students WHERE class_code = ? AND student = ?",
+            (class_code, student),
+        ).fetchone()
+        before_attempts, before_reflections = row if row else (0, 0)
+        new_attempts = added_attempts[(class_code, student)]
+        new_reflections = added_reflections[(class_code, student)]
+        connection.execute(
+            "INSERT INTO class_students (class_code, student, attempts, reflections) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (class_code, student) DO UPDATE SET "
+            "attempts = attempts + excluded.attempts, reflections = reflections + excluded.reflections",
+            (class_code, student, new_attempts, new_reflections),
+        )
+        totals = summary.setdefault(class_code, [0, 0, 0, 0, 0])
+        totals[0] += row is None
+        totals[1] += before_attempts == 0 and new_attempts > 0
+        totals[2] += before_reflections == 0 and new_reflections > 0
+        totals[3] += new_attempts
+        totals[4] += new_reflections
+    connection.executemany(
+        "INSERT INTO class_summary VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (class_code) DO UPDATE SET "
+        "students = students + excluded.students, "
+        "attempted_students = attempted_students + excluded.attempted_students, "
+        "reflected_students = reflected_students + excluded.reflected_students, "
+        "attempts = attempts + excluded.attempts, reflections = reflections + excluded.reflections, "
+        "updated_at = excluded.updated_at",
+        [(class_code, *totals, time.time()) for class_code, totals in summary.items()],
+    )
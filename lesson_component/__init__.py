@@ -0,0 +1,124 @@
+"""Bidirectional Streamlit component that hosts the lesson page.
+
+The frontend (``frontend/``) is static and browser-cacheable; everything
+lesson-specific travels through the component protocol:
+
+* down, each render carries a manifest of section and data-patch digests, plus
+  only the sections and patches the browser does not already hold. Digests
+  hash the content, and the browser keeps recent patches by digest (its
+  ``held`` list), so a patch it received before under any name is not resent;
+* up, the browser sends debounced state deltas and batched events, repeating
+  anything the server has not acknowledged yet.
+
+Each mount of the page picks a random ``mount`` id and numbers its messages
+and events from 1. The server's counters follow the current mount, so a
+remounted iframe (the student visited another page, or the page reloaded)
+starts a fresh sequence, and acknowledgements name the mount they belong to.
+"""
+
+import functools
+import hashlib
+import json
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+
+@functools.lru_cache(maxsize=None)
+def _component():
+    # Declared on first render: Streamlit only registers (and serves the files of) components declared
+    # during a script run, and server.py imports this package before any script runs.
+    return components.declare_component("lesson", path=str(Path(__file__).parent / "frontend"))
+
+
+@functools.lru_cache(maxsize=256)
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _client(key):
+    return st.session_state.setdefault(f"{key}__client", {"mount": None, "seq": 0, "event_id": 0, "state": {}})
+
+
+def apply_message(client, message):
+    """Merge one browser message into ``client`` and return its new events, oldest first.
+
+    A message from another mount, or one whose sequence went backwards,
+    restarts the counters: the browser numbers from 1 again after a remount.
+    """
+    events = []
+    if not message:
+        return events
+    if message.get("mount") != client["mount"] or message["seq"] < client["seq"]:
+        client["mount"] = message.get("mount")
+        client["seq"] = 0
+        client["event_id"] = 0
+    if message["seq"] > client["seq"]:
+        client["seq"] = message["seq"]
+        client["state"].update(message["state"])
+        for event in message["events"]:
+            if event["id"] > client["event_id"]:
+                client["event_id"] = event["id"]
+                events.append(event)
+    return events
+
+
+def acknowledgement(client):
+    """The ``ack`` sent down: the last message applied, and the mount it came from."""
+    return {"mount": client["mount"], "seq": client["seq"]}
+
+
+def held_patches(have):
+    """Digests of the patch data the browser holds, current or kept from earlier renders."""
+    return set(have.get("held", ())) | set(have["patches"].values())
+
+
+def receive(key="lesson"):
+    """Apply the browser's latest message and return ``(state, events)``.
+
+    ``state`` is the merged client state for this session; ``events`` holds
+    the events that arrived since the previous rerun, oldest first. Call this
+    before ``render`` so the patches for this rerun can depend on it.
+    """
+    client = _client(key)
+    events = apply_message(client, st.session_state.get(key))
+    return client["state"], events
+
+
+def render(sections, patches, assets, height=1000, key="lesson", telemetry=None, service_worker=None):
+    """Render the lesson component.
+
+    ``sections`` is an ordered sequence of ``(name, html)`` pairs and
+    ``patches`` maps a name to JSON-serializable lesson data; both are sent
+    only when the browser's copy is missing or stale. A patch whose content
+    the browser still holds from an earlier render is referenced by digest. ``telemetry`` switches
+    on the page's performance beacon (see ``lesson_engine.telemetry``);
+    ``service_worker`` is the app-root-relative URL of a service worker to
+    register (see ``lesson_engine.offline``).
+    """
+    client = _client(key)
+    message = st.session_state.get(key)
+    have = message["have"] if message else {"sections": {}, "patches": {}}
+    held = held_patches(have)
+
+    section_digests = [(name, _digest(html)) for name, html in sections]
+    patch_payloads = {name: json.dumps(data, separators=(",", ":")) for name, data in patches.items()}
+    patch_digests = {name: _digest(payload) for name, payload in patch_payloads.items()}
+
+    _component()(
+        manifest={"sections": section_digests, "patches": patch_digests},
+        sections={
+            name: html
+            for (name, html), (_, digest) in zip(sections, section_digests)
+            if have["sections"].get(name) != digest
+        },
+        patches={name: patches[name] for name, digest in patch_digests.items() if digest not in held},
+        assets=assets,
+        telemetry=telemetry,
+        serviceWorker=service_worker,
+        ack=acknowledgement(client),
+        height=height,
+        key=key,
+        default=None,
+    )
@@ -0,0 +1,285 @@
+// Lesson Bridge
+// A small client for Streamlit's custom-component protocol (no npm component library needed).
+//
+// Down: every render carries a manifest of section and data-patch digests. Only the sections and
+// patches the browser does not already hold are included, so a steady-state rerun ships a few bytes.
+// Patch digests are content hashes, and the last few patches received are kept by digest even after
+// they are replaced, so data the page already held (switching back to a field source) is not resent.
+// Up: state changes are merged and debounced, events are batched, and each message carries everything
+// the server has not acknowledged yet, so nothing is lost when Streamlit coalesces reruns. Unacknowledged
+// events (e.g. a quiz submitted offline) are resent until the server answers, so they sync on reconnect.
+// Each mount numbers its messages from 1 under a random mount id; the server restarts its counters when
+// the id changes and only acknowledgements for this mount are applied.
+(function() {
+    const STATE_DEBOUNCE_MS = 800;
+    const STATE_MAX_WAIT_MS = 4000;
+    const EVENT_DELAY_MS = 50;
+    const EVENT_RESEND_MS = 5000;
+    const PATCH_STORE_SIZE = 32;
+
+    const mountId = Math.random().toString(36).slice(2) + Date.now().toString(36);
+    const lessonData = {};
+    const patchHandlers = {};
+    const sectionDigests = {};
+    const patchDigests = {};
+    const patchStore = new Map(); // Digest -> patch data, oldest first, including patches since replaced
+    const unackedState = {};
+    const unackedStateSeq = {};
+    const requestedPatches = [];
+    let unackedEvents = [];
+    let seq = 0;
+    let eventId = 0;
+    let mounted = false;
+    let assetsLoaded = null;
+    let renderQueue = Promise.resolve();
+    let flushTimer = null;
+    let resendTimer = null;
+    let eventPending = false;
+    let firstChangeAt = 0;
+    let lastChangeAt = 0;
+
+    function post(type, data) {
+        window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+    }
+
+    function flush() {
+        if (flushTimer !== null) {
+            clearTimeout(flushTimer);
+            flushTimer = null;
+        }
+        firstChangeAt = 0;
+        eventPending = false;
+        seq += 1;
+        post('streamlit:setComponentValue', {
+            dataType: 'json',
+            value: {
+                mount: mountId,
+                seq: seq,
+                have: { sections: sectionDigests, patches: patchDigests, held: Array.from(patchStore.keys()) },
+                state: unackedState,
+                events: unackedEvents
+            }
+        });
+        if (unackedEvents.length > 0 && resendTimer === null) {
+            resendTimer = setTimeout(resend, EVENT_RESEND_MS);
+        }
+    }
+
+    function resend() {
+        // While disconnected, Streamlit drops component values; keep offering them until one is acknowledged.
+        resendTimer = null;
+        if (unackedEvents.length > 0 && navigator.onLine !== false) {
+            flush();
+        } else if (unackedEvents.length > 0) {
+            resendTimer = setTimeout(resend, EVENT_RESEND_MS);
+        }
+    }
+
+    function onFlushTimer() {
+        flushTimer = null;
+        const now = performance.now();
+        const quietFor = now - lastChangeAt;
+        if (!eventPending && quietFor < STATE_DEBOUNCE_MS && now - firstChangeAt < STATE_MAX_WAIT_MS) {
+            scheduleFlush(STATE_DEBOUNCE_MS - quietFor); // Still dragging: wait for a pause, up to the max wait
+            return;
+        }
+        flush();
+    }
+
+    function scheduleFlush(delay) {
+        if (flushTimer === null) {
+            flushTimer = setTimeout(onFlushTimer, delay);
+        }
+    }
+
+    function flushSoon() {
+        eventPending = true;
+        if (flushTimer !== null) {
+            clearTimeout(flushTimer);
+            flushTimer = null;
+        }
+        scheduleFlush(EVENT_DELAY_MS);
+    }
+
+    function acknowledge(ack) {
+        if (!ack || ack.mount !== mountId) {
+            return; // Counts from an earlier mount say nothing about this one's messages
+        }
+        for (const key in unackedStateSeq) {
+            if (unackedStateSeq[key] <= ack.seq) {
+                delete unackedState[key];
+                delete unackedStateSeq[key];
+            }
+        }
+        unackedEvents = unackedEvents.filter(event => event.seq > ack.seq);
+    }
+
+    function loadAssets(assets) {
+        return Promise.all(assets.map(asset => new Promise(resolve => {
+            // Relative to the app root, or to this page for files shipped with the component
+            const base = asset.base === 'component' ? window.location.href : new URL('../../', window.location.href);
+            const href = new URL(asset.href, base).href;
+            let element;
+            if (asset.kind === 'script') {
+                element = document.createElement('script');
+                element.src = href;
+                element.async = false;
+                document.head.appendChild(element);
+            } else {
+                element = document.createElement('link');
+                element.href = href;
+                if (asset.kind === 'font') {
+                    element.rel = 'preload';
+                    element.as = 'font';
+                    element.type = 'font/woff2';
+                    element.crossOrigin = 'anonymous';
+                    resolve();
+                } else {
+                    element.rel = 'stylesheet';
+                }
+                document.head.appendChild(element); // In list order, so lesson.css follows the framework styles
+            }
+            element.addEventListener('load', () => resolve());
+            element.addEventListener('error', () => resolve());
+        })));
+    }
+
+    function remember(digest, data) {
+        patchStore.delete(digest);
+        patchStore.set(digest, data);
+        if (patchStore.size > PATCH_STORE_SIZE) {
+            patchStore.delete(patchStore.keys().next().value);
+        }
+    }
+
+    function resync(digests) {
+        // The server believes we hold content we do not have (e.g. the iframe was remounted): ask for it again.
+        for (const name in digests) {
+            delete digests[name];
+        }
+        flush();
+    }
+
+    function applyRender(args) {
+        const manifest = args.manifest;
+        const main = document.getElementById('lesson-main');
+        let changed = false;
+
+        for (const [name, digest] of manifest.sections) {
+            if (sectionDigests[name] !== digest && !(name in args.sections)) {
+                return resync(sectionDigests);
+            }
+        }
+        for (const name in manifest.patches) {
+            const digest = manifest.patches[name];
+            if (patchDigests[name] !== digest && !(name in args.patches) && !patchStore.has(digest)) {
+                return resync(patchDigests);
+            }
+        }
+
+        if (mounted && Object.keys(args.sections).length > 0) {
+            // Markup changed under a running lesson (a redeploy); start over from a clean document.
+            window.location.reload();
+            return;
+        }
+        if (!mounted) {
+            const fragment = document.createDocumentFragment();
+            for (const [name, digest] of manifest.sections) {
+                const template = document.createElement('template');
+                template.innerHTML = args.sections[name];
+                fragment.appendChild(template.content);
+                sectionDigests[name] = digest;
+            }
+            main.appendChild(fragment);
+            changed = true;
+        }
+
+        for (const name in manifest.patches) {
+            const digest = manifest.patches[name];
+            if (patchDigests[name] === digest) {
+                continue;
+            }
+            // Sent with this render, or left out because we still hold it from an earlier one
+            const data = name in args.patches ? args.patches[name] : patchStore.get(digest);
+            remember(digest, data);
+            lessonData[name] = data;
+            patchDigests[name] = digest;
+            changed = true;
+            if (mounted && patchHandlers[name]) {
+                patchHandlers[name](data);
+            }
+        }
+
+        if (!mounted) {
+            mounted = true;
+            window.initLesson(lessonData);
+        }
+        if (changed) {
+            flush(); // Tell the server what we now hold so later reruns can skip it
+        }
+    }
+
+    window.addEventListener('message', function(event) {
+        if (!event.data || event.data.type !== 'streamlit:render') {
+            return;
+        }
+        const args = event.data.args;
+        post('streamlit:setFrameHeight', { height: args.height });
+        acknowledge(args.ack);
+        if (assetsLoaded === null) {
+            window.LessonTelemetry.start(args.telemetry); // Before the assets, so their load times are observed
+            if (args.serviceWorker && 'serviceWorker' in navigator) {
+                // Scoped to the app root, so the next visit loads the page, this component and its assets from cache
+                const appRoot = new URL('../../', window.location.href);
+                navigator.serviceWorker.register(new URL(args.serviceWorker, appRoot).href, { scope: appRoot.href }).catch(() => {});
+            }
+            assetsLoaded = loadAssets(args.assets);
+        }
+        renderQueue = renderQueue.then(() => assetsLoaded).then(() => applyRender(args));
+    });
+
+    window.lessonBridge = {
+        // Record a piece of client state; sent debounced and merged with other changes, or almost
+        // immediately when the server has to answer it (e.g. a selection that needs new data).
+        update: function(key, value, immediate) {
+            const now = performance.now();
+            if (firstChangeAt === 0) {
+                firstChangeAt = now;
+            }
+            lastChangeAt = now;
+            unackedState[key] = value;
+            unackedStateSeq[key] = seq + 1;
+            if (immediate) {
+                flushSoon();
+            } else {
+                scheduleFlush(STATE_DEBOUNCE_MS);
+            }
+        },
+        // Report a discrete action (quiz submitted, plan generated); sent almost immediately, batched.
+        send: function(type, payload) {
+            eventId += 1;
+            unackedEvents.push({ id: eventId, seq: seq + 1, type: type, payload: payload });
+            flushSoon();
+        },
+        // Receive later server-side updates to a named piece of lesson data.
+        onPatch: function(name, handler) {
+            patchHandlers[name] = handler;
+        },
+        // Ask for lesson data the first render leaves out (particle frames, slider tables); it arrives
+        // through the onPatch handler. Called by a widget when it mounts.
+        load: function(name) {
+            if (!requestedPatches.includes(name)) {
+                requestedPatches.push(name);
+                this.update('load', requestedPatches.slice(), true);
+            }
+        }
+    };
+
+    window.addEventListener('online', () => {
+        if (unackedEvents.length > 0) {
+            flush();
+        }
+    });
+
+    post('streamlit:componentReady', { apiVersion: 1 });
+})();
@@ -0,0 +1,424 @@
+// Lesson Runtime
+// Shared by every lesson: the page shell, lazy section mounting, chart helpers and the core widgets
+// (student info, quiz, reflection, resources, study plan). Visualization widgets register themselves
+// from widgets/*.js. The lesson spec arrives as the `lesson` patch and says which widgets mount where.
+(function() {
+    const widgets = {};
+
+    // Lazy Section Mounting
+    // Sections below the fold build their charts and dynamic DOM the first time they come near the viewport.
+    const MOUNT_MARGIN = '300px 0px';
+    const pendingMounts = new Map();
+    const mountObserver = typeof IntersectionObserver === 'undefined' ? null : new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting && pendingMounts.has(entry.target)) {
+                const mount = pendingMounts.get(entry.target);
+                pendingMounts.delete(entry.target);
+                mountObserver.unobserve(entry.target);
+                mount();
+            }
+        });
+    }, { rootMargin: MOUNT_MARGIN });
+
+    function mountWhenNear(sectionId, mount) {
+        const section = document.getElementById(sectionId);
+        if (mountObserver === null) {
+            mount();
+            return;
+        }
+        pendingMounts.set(section, mount);
+        mountObserver.observe(section);
+    }
+
+    // Charts scrolled out of view are paused: updates only mark them stale, and they redraw once on return.
+    function pausableChart(element) {
+        const view = { chart: null, visible: true, stale: false };
+        if (typeof IntersectionObserver !== 'undefined') {
+            new IntersectionObserver(entries => {
+                view.visible = entries[entries.length - 1].isIntersecting;
+                if (view.visible && view.stale && view.chart) {
+                    view.stale = false;
+                    view.chart.update('none');
+                }
+            }).observe(element);
+        }
+        return view;
+    }
+
+    function drawChart(view) {
+        if (view.visible) {
+            const start = performance.now();
+            view.chart.update('none');
+            LessonTelemetry.record('chart.update', performance.now() - start);
+        } else {
+            view.stale = true;
+        }
+    }
+
+    function fillSelect(select, labels) {
+        select.replaceChildren(...labels.map(label => {
+            const option = document.createElement('option');
+            option.textContent = label;
+            return option;
+        }));
+    }
+
+    // Page Shell
+    function buildShell(lesson) {
+        document.title = `${lesson.title} | Cognitive Cloud Education`;
+        document.getElementById('lesson-title').textContent = lesson.title;
+        document.getElementById('lesson-footer').textContent = lesson.footer;
+
+        const nav = document.getElementById('lesson-nav');
+        const mobileMenu = document.getElementById('mobile-menu');
+        lesson.sections.filter(section => section.nav).forEach(section => {
+            const link = document.createElement('a');
+            link.href = `#${section.id}`;
+            link.className = 'nav-link';
+            link.textContent = section.nav;
+            nav.appendChild(link);
+
+            const mobileLink = document.createElement('a');
+            mobileLink.href = `#${section.id}`;
+            mobileLink.className = 'block py-2 text-gray-700';
+            mobileLink.textContent = section.nav;
+            mobileMenu.appendChild(mobileLink);
+        });
+
+        document.getElementById('mobile-menu-button').addEventListener('click', () => {
+            mobileMenu.classList.toggle('hidden');
+        });
+    }
+
+    // Student Info
+    widgets.studentInfo = function(lessonData) {
+        const studentNameInput = document.getElementById('student-name');
+        const avatarSelect = document.getElementById('avatar-select');
+        const welcomeMessageDiv = document.getElementById('welcome-message');
+        const learningModeSelect = document.getElementById('learning-mode');
+        const classCodeInput = document.getElementById('class-code');
+
+        function updateWelcomeMessage() {
+            const name = studentNameInput.value.trim();
+            const avatar = avatarSelect.value;
+            if (name) {
+                welcomeMessageDiv.textContent = `Welcome, ${name} the ${avatar}! Let's begin our exploration of ${lessonData.lesson.topic}.`;
+                welcomeMessageDiv.classList.remove('hidden');
+            } else {
+                welcomeMessageDiv.classList.add('hidden');
+            }
+        }
+        studentNameInput.addEventListener('input', () => {
+            updateWelcomeMessage();
+            lessonBridge.update('studentName', studentNameInput.value.trim());
+        });
+        avatarSelect.addEventListener('change', () => {
+            updateWelcomeMessage();
+            lessonBridge.update('avatar', avatarSelect.value);
+        });
+        learningModeSelect.addEventListener('change', () => lessonBridge.update('learningMode', learningModeSelect.value));
+        classCodeInput.addEventListener('input', () => lessonBridge.update('classCode', classCodeInput.value.trim()));
+    };
+
+    // Quiz (questions and grading live on the server; the browser never sees the answer key)
+    widgets.quiz = function(lessonData) {
+        const feedback = lessonData.lesson.quizFeedback;
+        const quizContainer = document.getElementById('quiz-questions');
+        const quizQuestionsDiv = document.createElement('div');
+        quizContainer.appendChild(quizQuestionsDiv);
+
+        const checkQuizButton = document.createElement('button');
+        checkQuizButton.textContent = 'Check My Answers';
+        checkQuizButton.className = 'mt-4 bg-accent text-white font-bold py-3 px-6 rounded-lg hover:bg-opacity-90 transition-colors';
+        quizContainer.appendChild(checkQuizButton);
+
+        const newQuizButton = document.createElement('button');
+        newQuizButton.textContent = 'Try a New Set of Questions';
+        newQuizButton.className = 'mt-4 ml-2 bg-gray-200 text-gray-800 font-bold py-3 px-6 rounded-lg hover:bg-gray-300 transition-colors hidden';
+        quizContainer.appendChild(newQuizButton);
+
+        const quizFeedbackDiv = document.createElement('div');
+        quizFeedbackDiv.className = 'mt-4 p-3 rounded-md hidden';
+        quizContainer.appendChild(quizFeedbackDiv);
+
+        let currentQuiz = null;
+
+        function feedbackText(template, result) {
+            return template.replace('{correct}', result.correct).replace('{total}', result.total);
+        }
+
+        function renderQuiz(quiz) {
+            if (!currentQuiz || currentQuiz.id !== quiz.id) {
+                const fragment = document.createDocumentFragment();
+                quiz.questions.forEach((q, index) => {
+                    const questionDiv = document.createElement('div');
+                    questionDiv.className = 'mb-6 p-4 border border-gray-200 rounded-lg shadow-sm';
+                    questionDiv.innerHTML = `<p class="font-bold text-gray-800 mb-3">Question ${index + 1}: ${q.prompt}</p>` +
+                        q.options.map((option, optIndex) => `
+                            <label class="block mb-2 text-gray-700">
+                                <input type="radio" name="question${index}" value="${optIndex}" class="mr-2">
+                                ${option}
+                            </label>
+                        `).join('');
+                    fragment.appendChild(questionDiv);
+                });
+                quizQuestionsDiv.replaceChildren(fragment);
+                quizFeedbackDiv.classList.add('hidden');
+            }
+            currentQuiz = quiz;
+
+            const result = quiz.result;
+            checkQuizButton.disabled = result !== null;
+            checkQuizButton.textContent = 'Check My Answers';
+            newQuizButton.classList.toggle('hidden', result === null);
+            if (result === null) {
+                if (quiz.error) {
+                    // The server could not grade the last submission; the answers are still selected.
+                    quizFeedbackDiv.className = 'mt-4 p-3 bg-yellow-100 text-yellow-800 rounded-md';
+                    quizFeedbackDiv.textContent = feedback.unavailable || "We couldn't check your answers just now. Please try again.";
+                }
+                return;
+            }
+            result.marks.forEach((correct, index) => {
+                quizQuestionsDiv.children[index].classList.toggle('border-green-400', correct);
+                quizQuestionsDiv.children[index].classList.toggle('border-red-400', !correct);
+            });
+            if (result.correct === result.total) {
+                quizFeedbackDiv.className = 'mt-4 p-3 bg-green-100 text-green-700 rounded-md';
+                quizFeedbackDiv.textContent = feedbackText(feedback.perfect, result);
+            } else {
+                quizFeedbackDiv.className = 'mt-4 p-3 bg-red-100 text-red-700 rounded-md';
+                quizFeedbackDiv.textContent = feedbackText(feedback.partial, result);
+            }
+        }
+
+        checkQuizButton.addEventListener('click', () => {
+            const answers = currentQuiz.questions.map((q, index) => {
+                const selectedOption = document.querySelector(`input[name="question${index}"]:checked`);
+                return selectedOption ? Number(selectedOption.value) : null;
+            });
+            checkQuizButton.disabled = true;
+            checkQuizButton.textContent = 'Checking...';
+            if (navigator.onLine === false) {
+                quizFeedbackDiv.className = 'mt-4 p-3 bg-yellow-100 text-yellow-800 rounded-md';
+                quizFeedbackDiv.textContent = "You're offline. Your answers are saved and will be checked as soon as the connection returns.";
+            }
+            lessonBridge.send('quiz_submitted', { quizId: currentQuiz.id, answers: answers });
+        });
+        newQuizButton.addEventListener('click', () => {
+            newQuizButton.classList.add('hidden');
+            lessonBridge.send('quiz_retry', { quizId: currentQuiz.id });
+        });
+
+        renderQuiz(lessonData.quiz);
+        lessonBridge.onPatch('quiz', renderQuiz);
+    };
+
+    // Reflection Submission
+    widgets.reflection = function() {
+        const submitReflectionButton = document.getElementById('submit-reflection');
+        const reflectionTextarea = document.getElementById('reflection-text');
+        const reflectionFeedbackDiv = document.getElementById('reflection-feedback');
+
+        submitReflectionButton.addEventListener('click', () => {
+            if (reflectionTextarea.value.trim().length > 20) {
+                reflectionFeedbackDiv.className = 'mt-4 p-3 bg-green-100 text-green-700 rounded-md';
+                reflectionFeedbackDiv.textContent = 'Thank you for your thoughtful reflection! Your insights help us understand how you connect math to the real world.';
+                lessonBridge.send('reflection_submitted', { text: reflectionTextarea.value.trim() });
+            } else {
+                reflectionFeedbackDiv.className = 'mt-4 p-3 bg-red-100 text-red-700 rounded-md';
+                reflectionFeedbackDiv.textContent = 'Please write a bit more for your reflection (at least 20 characters) to help us understand your thoughts!';
+            }
+            reflectionFeedbackDiv.classList.remove('hidden');
+        });
+    };
+
+    // Resources
+    // Each strand's panel (information, recommended links, tabbed extras) is built once at mount;
+    // switching strands swaps the prebuilt panel in with a single insert.
+    widgets.resources = function(lessonData) {
+        const strands = lessonData.resources.strands;
+        const strandSelect = document.getElementById('resource-strand');
+        const resourcePanel = document.getElementById('resource-panel');
+        const ACTIVE_TAB = ['border-accent-color', 'text-accent-color'];
+        const INACTIVE_TAB = ['border-transparent', 'text-gray-500', 'hover:text-gray-700', 'hover:border-gray-300'];
+
+        function element(tag, className, text) {
+            const node = document.createElement(tag);
+            node.className = className;
+            if (text !== undefined) {
+                node.textContent = text;
+            }
+            return node;
+        }
+
+        function linkList(items, className) {
+            const list = element('ul', className);
+            items.forEach(item => {
+                const link = element('a', 'text-blue-600 hover:underline', item.name || item.title);
+                link.href = item.url;
+                link.target = '_blank';
+                const li = document.createElement('li');
+                li.appendChild(link);
+                list.appendChild(li);
+            });
+            return list;
+        }
+
+        function buildPanel(strand) {
+            const panel = document.createElement('div');
+            const info = element('div', 'bg-blue-100 border-l-4 border-blue-500 text-blue-700 p-4 mb-6 rounded-md');
+            info.setAttribute('role', 'alert');
+            info.appendChild(element('p', '', strand.info));
+            const title = element('h3', 'text-2xl font-bold accent-color mb-3', '🎯 Recommended Resources: ');
+            title.appendChild(element('span', '', strand.name));
+
+            const tabs = element('div', 'border-b border-gray-200 mb-8');
+            const nav = element('nav', '-mb-px flex space-x-6 justify-center');
+            nav.setAttribute('aria-label', 'Resource Tabs');
+            tabs.appendChild(nav);
+            const content = document.createElement('div');
+            const tabButtons = [];
+            const tabContents = [];
+            Object.entries(strand.tabs).forEach(([tabName, items], index) => {
+                const tabButton = element('button', 'py-2 px-4 text-sm font-medium text-center rounded-t-lg border-b-2', tabName);
+                tabButton.classList.add(...(index === 0 ? ACTIVE_TAB : INACTIVE_TAB));
+                const tabContent = element('div', index === 0 ? 'p-4' : 'p-4 hidden');
+                tabContent.appendChild(linkList(items, 'list-disc list-inside space-y-2'));
+                tabButton.addEventListener('click', () => {
+                    tabButtons.forEach((button, other) => {
+                        button.classList.remove(...(other === index ? INACTIVE_TAB : ACTIVE_TAB));
+                        button.classList.add(...(other === index ? ACTIVE_TAB : INACTIVE_TAB));
+                        tabContents[other].classList.toggle('hidden', other !== index);
+                    });
+                });
+                tabButtons.push(tabButton);
+                tabContents.push(tabContent);
+            });
+            nav.append(...tabButtons);
+            content.append(...tabContents);
+
+            panel.append(
+                info,
+                title,
+                linkList(strand.links, 'list-disc list-inside text-gray-700 space-y-2 mb-6'),
+                element('h2', 'text-3xl font-bold accent-color mb-4 mt-8', '🌐 Additional Learning Resources'),
+                tabs,
+                content
+            );
+            return panel;
+        }
+
+        const panels = strands.map(buildPanel);
+        fillSelect(strandSelect, strands.map(strand => strand.name));
+        strandSelect.addEventListener('change', () => {
+            resourcePanel.replaceChildren(panels[strandSelect.selectedIndex]);
+            lessonBridge.update('strand', strandSelect.value);
+        });
+        resourcePanel.replaceChildren(panels[0]);
+    };
+
+    // Study Plan
+    // Every plan is precomputed by the server (lesson_engine/recommend.py) for each level, time budget,
+    // resource strand and quiz band; the page only looks one up, and builds a plan's DOM at most once.
+    widgets.studyPlan = function(lessonData) {
+        const studyPlan = lessonData.studyPlan;
+        const currentLevelSelect = document.getElementById('study-level');
+        const studyTimeSelect = document.getElementById('study-time');
+        const generateStudyPlanButton = document.getElementById('generate-study-plan');
+        const studyPlanOutputDiv = document.getElementById('study-plan-output');
+        const planNodes = new Map();
+
+        fillSelect(currentLevelSelect, studyPlan.levels.map(level => level.label));
+        fillSelect(studyTimeSelect, studyPlan.times);
+
+        function quizBand() {
+            // Band 0 is "no quiz yet"; otherwise the last band whose minimum score was reached.
+            const result = lessonData.quiz ? lessonData.quiz.result : null;
+            if (!result) {
+                return 0;
+            }
+            const score = result.correct / result.total;
+            let band = 1;
+            for (let i = 2; i < studyPlan.bands.length; i++) {
+                if (score >= studyPlan.bands[i]) {
+                    band = i;
+                }
+            }
+            return band;
+        }
+
+        function strandIndex() {
+            // Follows the strand picked under Resources, when the lesson has one.
+            const strandSelect = document.getElementById('resource-strand');
+            return strandSelect ? Math.min(Math.max(strandSelect.selectedIndex, 0), studyPlan.strands - 1) : 0;
+        }
+
+        function planNode(index, level, time) {
+            let node = planNodes.get(index);
+            if (node === undefined) {
+                node = document.createElement('div');
+                const heading = document.createElement('p');
+                heading.className = 'font-bold text-lg mb-2';
+                heading.textContent = `Your ${level.name} Study Plan (${time}):`;
+                const steps = document.createElement('ul');
+                steps.className = 'list-disc list-inside space-y-1';
+                studyPlan.plans[index].forEach(stepId => {
+                    const step = studyPlan.steps[stepId];
+                    const li = document.createElement('li');
+                    if (step.url) {
+                        const link = document.createElement('a');
+                        link.href = step.url;
+                        link.target = '_blank';
+                        link.className = 'text-blue-600 hover:underline';
+                        link.textContent = step.text;
+                        li.appendChild(link);
+                    } else {
+                        li.textContent = step.text;
+                    }
+                    steps.appendChild(li);
+                });
+                node.append(heading, steps);
+                planNodes.set(index, node);
+            }
+            return node;
+        }
+
+        generateStudyPlanButton.addEventListener('click', () => {
+            const levelIndex = currentLevelSelect.selectedIndex;
+            const timeIndex = studyTimeSelect.selectedIndex;
+            const level = studyPlan.levels[levelIndex];
+            const time = studyPlan.times[timeIndex];
+            const index = ((levelIndex * studyPlan.times.length + timeIndex) * studyPlan.strands + strandIndex())
+                * studyPlan.bands.length + quizBand();
+
+            studyPlanOutputDiv.replaceChildren(planNode(index, level, time));
+            lessonBridge.send('study_plan_generated', { level: level.label, time: time });
+            studyPlanOutputDiv.classList.remove('hidden');
+        });
+    };
+
+    window.LessonRuntime = {
+        // Make a widget available to lesson specs; `mount(lessonData, section)` runs when its section nears the viewport.
+        register: function(name, mount) {
+            widgets[name] = mount;
+        },
+        pausableChart: pausableChart,
+        drawChart: drawChart
+    };
+
+    // Called by bridge.js once the assets are loaded and the sections are mounted.
+    window.initLesson = function(lessonData) {
+        buildShell(lessonData.lesson);
+        lessonData.lesson.sections.forEach(section => {
+            if (section.widgets.length === 0) {
+                return;
+            }
+            mountWhenNear(section.id, function() {
+                const element = document.getElementById(section.id);
+                section.widgets.forEach(name => widgets[name](lessonData, element));
+            });
+        });
+        performance.mark('lesson-interactive'); // Read by scripts/benchmark.py
+    };
+})();
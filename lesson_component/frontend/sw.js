@@ -0,0 +1,79 @@
+// Lesson Service Worker
+// Served at the app root by server.py (/lesson-sw.js), which prepends `LESSON_OFFLINE = {version, precache}`.
+// - Content-hashed files (?v=..., Streamlit's /static/ bundle) are cache-first: their URL changes with their bytes.
+// - The app page, the lesson component and CDN framework files are stale-while-revalidate: served from the
+//   cache at once and refreshed in the background for the next load.
+// - A navigation that fails with nothing cached gets offline.html.
+// Streamlit's WebSocket, its /_stcore/ endpoints, exports, particle streams and telemetry always go to the network.
+const CACHE_PREFIX = 'lesson-';
+const CACHE_NAME = CACHE_PREFIX + LESSON_OFFLINE.version;
+const OFFLINE_PAGE = new URL('component/lesson_component.lesson/offline.html', self.registration.scope).href;
+const NETWORK_ONLY = ['/_stcore/', '/export/', '/particles/', '/telemetry'];
+
+self.addEventListener('install', event => {
+    // A file that cannot be fetched (an asset bundle that was never built, an unreachable CDN) is skipped rather
+    // than failing the install; fetches below cache it on first use instead.
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => Promise.all(LESSON_OFFLINE.precache.map(url => cache.add(url).catch(() => {}))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    // A new version replaces the whole cache, so stale component files never mix with a new runtime.
+    event.waitUntil(
+        caches.keys()
+            .then(names => Promise.all(names
+                .filter(name => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+                .map(name => caches.delete(name))))
+            .then(() => self.clients.claim())
+    );
+});
+
+function isVersioned(url) {
+    return url.searchParams.has('v') || (url.origin === self.location.origin && url.pathname.startsWith('/static/'));
+}
+
+function cacheFirst(request) {
+    return caches.open(CACHE_NAME).then(cache => cache.match(request).then(cached => cached || fetch(request).then(response => {
+        if (response.ok) {
+            cache.put(request, response.clone());
+        }
+        return response;
+    })));
+}
+
+function staleWhileRevalidate(event) {
+    const request = event.request;
+    return caches.open(CACHE_NAME).then(cache => cache.match(request, { ignoreSearch: request.mode === 'navigate' }).then(cached => {
+        const refresh = fetch(request).then(response => {
+            if (response.ok || response.type === 'opaque') {
+                cache.put(request, response.clone());
+            }
+            return response;
+        });
+        if (cached) {
+            event.waitUntil(refresh.catch(() => {}));
+            return cached;
+        }
+        return refresh.catch(error => {
+            if (request.mode === 'navigate') {
+                return cache.match(OFFLINE_PAGE).then(page => page || Promise.reject(error));
+            }
+            throw error;
+        });
+    }));
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    if (url.origin === self.location.origin && NETWORK_ONLY.some(prefix => url.pathname.startsWith(prefix))) {
+        return;
+    }
+    event.respondWith(isVersioned(url) ? cacheFirst(request) : staleWhileRevalidate(event));
+});
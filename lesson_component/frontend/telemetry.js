@@ -0,0 +1,161 @@
+// Lesson Telemetry
+// Performance measurements from students' own devices: navigation timing, asset load times, chart
+// builds and updates, long tasks and slider frames. Samples go straight into per-metric histograms
+// (a few array writes, cheap enough for the slider path) and the counts are sent gzip-compressed to
+// the collector at most once per interval, plus a last uncompressed beacon when the page is hidden.
+// Nothing is recorded until the server enables telemetry with the first render.
+(function() {
+    let config = null;
+    let collectorUrl = null;
+    let bounds = null;
+    let histograms = new Map();
+    let counters = new Map();
+    let dirty = false;
+
+    function bucket(value) {
+        let index = 0;
+        while (index < bounds.length && value > bounds[index]) {
+            index++;
+        }
+        return index;
+    }
+
+    function record(metric, ms) {
+        if (bounds === null) {
+            return;
+        }
+        let histogram = histograms.get(metric);
+        if (histogram === undefined) {
+            histogram = { counts: new Uint32Array(bounds.length + 1), sum: 0 };
+            histograms.set(metric, histogram);
+        }
+        histogram.counts[bucket(ms)] += 1;
+        histogram.sum += ms;
+        dirty = true;
+    }
+
+    function count(counter, amount) {
+        if (bounds === null) {
+            return;
+        }
+        counters.set(counter, (counters.get(counter) || 0) + amount);
+        dirty = true;
+    }
+
+    function time(metric, run) {
+        const start = performance.now();
+        try {
+            return run();
+        } finally {
+            record(metric, performance.now() - start);
+        }
+    }
+
+    // Browser Timings
+    function observe(type, handler) {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(handler)).observe({ type: type, buffered: true });
+        } catch (error) {
+            // Entry type not supported by this browser
+        }
+    }
+
+    function recordNavigation(entry) {
+        record('navigation.ttfb', entry.responseStart - entry.requestStart);
+        record('navigation.dom_content_loaded', entry.domContentLoadedEventEnd - entry.startTime);
+        if (entry.loadEventEnd > 0) {
+            record('navigation.load', entry.loadEventEnd - entry.startTime);
+        }
+    }
+
+    function recordResource(entry) {
+        let kind;
+        if (entry.initiatorType === 'script') {
+            kind = 'script';
+        } else if (entry.initiatorType === 'link' || entry.initiatorType === 'css') {
+            kind = /\.woff2?(\?|$)/.test(entry.name) ? 'font' : 'stylesheet';
+        } else {
+            return;
+        }
+        const origin = new URL(entry.name).origin === window.location.origin ? 'local' : 'cdn';
+        record(`asset.${origin}.${kind}`, entry.duration);
+    }
+
+    function deviceInfo() {
+        return {
+            cores: navigator.hardwareConcurrency || 0,
+            memory: navigator.deviceMemory || 0,
+            width: window.screen ? window.screen.width : 0,
+            coarse: window.matchMedia ? window.matchMedia('(pointer: coarse)').matches : false
+        };
+    }
+
+    // Batching
+    function takeBatch() {
+        const metrics = {};
+        histograms.forEach((histogram, name) => {
+            metrics[name] = { counts: Array.from(histogram.counts), sum: Math.round(histogram.sum * 10) / 10 };
+        });
+        const batch = { device: deviceInfo(), metrics: metrics, counters: Object.fromEntries(counters) };
+        histograms = new Map();
+        counters = new Map();
+        dirty = false;
+        return JSON.stringify(batch);
+    }
+
+    function send() {
+        if (!dirty) {
+            return;
+        }
+        const body = takeBatch();
+        if (typeof CompressionStream === 'undefined') {
+            fetch(collectorUrl, { method: 'POST', body: body, headers: { 'Content-Type': 'application/json' }, keepalive: true }).catch(() => {});
+            return;
+        }
+        const compressed = new Blob([body]).stream().pipeThrough(new CompressionStream('gzip'));
+        new Response(compressed).arrayBuffer().then(data => fetch(collectorUrl, {
+            method: 'POST',
+            body: data,
+            headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' },
+            keepalive: true
+        })).catch(() => {});
+    }
+
+    function sendFinal() {
+        // Compression is asynchronous and may not finish while the page goes away; beacons always do.
+        if (dirty && navigator.sendBeacon) {
+            navigator.sendBeacon(collectorUrl, new Blob([takeBatch()], { type: 'application/json' }));
+        }
+    }
+
+    window.LessonTelemetry = {
+        // Called by bridge.js with the render's telemetry settings ({url, interval, bounds}), once.
+        start: function(settings) {
+            if (config !== null || !settings) {
+                return;
+            }
+            config = settings;
+            bounds = settings.bounds;
+            // Relative to the app root, like the lesson assets
+            collectorUrl = new URL(settings.url, new URL('../../', window.location.href)).href;
+            observe('navigation', recordNavigation);
+            observe('resource', recordResource);
+            observe('longtask', entry => record('long_task', entry.duration));
+            observe('mark', entry => {
+                if (entry.name === 'lesson-interactive') {
+                    record('lesson.interactive', entry.startTime);
+                }
+            });
+            setInterval(send, settings.interval * 1000);
+            document.addEventListener('visibilitychange', () => {
+                if (document.visibilityState === 'hidden') {
+                    sendFinal();
+                }
+            });
+            window.addEventListener('pagehide', sendFinal);
+        },
+        record: record,
+        count: count,
+        time: time
+    };
+})();
@@ -0,0 +1,240 @@
+// Compass Board
+// A draggable compass over a scene of field sources. The server sends the superposed field of every
+// source in the scene sampled on a grid, so finding the needle direction while dragging is one
+// bilinear lookup per frame, however many sources the scene holds. Registers the `compass` widget.
+(function() {
+    const ARROW_GRID = 11;
+    const SOURCE_COLORS = { north: '#dc2626', south: '#3b82f6', wire: '#333' };
+
+    function prepare(data) {
+        return {
+            scenario: data.scenario,
+            n: data.resolution,
+            extent: data.extent,
+            sources: data.sources,
+            bx: FieldLines.decodeFloat32(data.bx),
+            by: FieldLines.decodeFloat32(data.by)
+        };
+    }
+
+    // Bilinear interpolation of the field components (superposition is linear, so interpolating the
+    // summed components is exact at the grid points and smooth between them). Writes (Bx, By) to `out`.
+    function sample(field, x, y, out) {
+        const n = field.n;
+        const scale = (n - 1) / (2 * field.extent);
+        const gx = Math.min(n - 1.001, Math.max(0, (x + field.extent) * scale));
+        const gy = Math.min(n - 1.001, Math.max(0, (y + field.extent) * scale));
+        const i = gx | 0;
+        const j = gy | 0;
+        const fx = gx - i;
+        const fy = gy - j;
+        const k = j * n + i;
+        const w00 = (1 - fx) * (1 - fy);
+        const w10 = fx * (1 - fy);
+        const w01 = (1 - fx) * fy;
+        const w11 = fx * fy;
+        out[0] = w00 * field.bx[k] + w10 * field.bx[k + 1] + w01 * field.bx[k + n] + w11 * field.bx[k + n + 1];
+        out[1] = w00 * field.by[k] + w10 * field.by[k + 1] + w01 * field.by[k + n] + w11 * field.by[k + n + 1];
+        return out;
+    }
+
+    function create(board, options) {
+        const canvas = board.querySelector('canvas');
+        const compass = board.querySelector('.compass-container');
+        const needle = compass.querySelector('.compass-needle');
+        const ctx = canvas.getContext('2d');
+        const vector = new Float64Array(2);
+        let field = null;
+        const position = options.position.slice(); // Compass centre in field coordinates (metres)
+        let bearing = 0; // Unwrapped, so the needle never swings the long way round
+        let frameRequest = 0;
+
+        function toBoardX(x) {
+            return (x + field.extent) / (2 * field.extent) * board.clientWidth;
+        }
+
+        function toBoardY(y) {
+            return (field.extent - y) / (2 * field.extent) * board.clientHeight;
+        }
+
+        function drawScene() {
+            const ratio = window.devicePixelRatio || 1;
+            canvas.width = Math.round(board.clientWidth * ratio);
+            canvas.height = Math.round(board.clientHeight * ratio);
+            ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+            ctx.clearRect(0, 0, board.clientWidth, board.clientHeight);
+            if (!field) return;
+
+            // Faint arrows of the total field so the superposition is visible before dragging.
+            const spacing = board.clientWidth / ARROW_GRID;
+            ctx.strokeStyle = 'rgba(0, 90, 156, 0.35)';
+            ctx.lineWidth = 1.5;
+            ctx.beginPath();
+            for (let row = 0; row < ARROW_GRID; row++) {
+                for (let col = 0; col < ARROW_GRID; col++) {
+                    const cx = (col + 0.5) * spacing;
+                    const cy = (row + 0.5) * spacing;
+                    const x = (cx / board.clientWidth * 2 - 1) * field.extent;
+                    const y = (1 - cy / board.clientHeight * 2) * field.extent;
+                    sample(field, x, y, vector);
+                    const length = Math.hypot(vector[0], vector[1]);
+                    if (length === 0) continue;
+                    const dx = vector[0] / length * spacing * 0.3;
+                    const dy = -vector[1] / length * spacing * 0.3;
+                    ctx.moveTo(cx - dx, cy - dy);
+                    ctx.lineTo(cx + dx, cy + dy);
+                    ctx.lineTo(cx + dx * 0.4 - dy * 0.35, cy + dy * 0.4 + dx * 0.35);
+                    ctx.moveTo(cx + dx, cy + dy);
+                    ctx.lineTo(cx + dx * 0.4 + dy * 0.35, cy + dy * 0.4 - dx * 0.35);
+                }
+            }
+            ctx.stroke();
+
+            ctx.font = 'bold 14px Inter, sans-serif';
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'middle';
+            for (const source of field.sources) {
+                if (source.kind === 'bar_magnet') {
+                    const left = toBoardX(source.x0 - source.length / 2);
+                    const right = toBoardX(source.x0 + source.length / 2);
+                    const middle = (left + right) / 2;
+                    const height = Math.max(16, (right - left) * 0.3);
+                    const top = toBoardY(source.y0) - height / 2;
+                    const northRight = source.strength > 0;
+                    ctx.fillStyle = northRight ? SOURCE_COLORS.south : SOURCE_COLORS.north;
+                    ctx.fillRect(left, top, middle - left, height);
+                    ctx.fillStyle = northRight ? SOURCE_COLORS.north : SOURCE_COLORS.south;
+                    ctx.fillRect(middle, top, right - middle, height);
+                    ctx.fillStyle = '#fff';
+                    ctx.fillText(northRight ? 'S' : 'N', (left + middle) / 2, top + height / 2);
+                    ctx.fillText(northRight ? 'N' : 'S', (middle + right) / 2, top + height / 2);
+                } else if (source.kind === 'wire') {
+                    const cx = toBoardX(source.x0);
+                    const cy = toBoardY(source.y0);
+                    ctx.fillStyle = '#fff';
+                    ctx.strokeStyle = SOURCE_COLORS.wire;
+                    ctx.lineWidth = 2;
+                    ctx.beginPath();
+                    ctx.arc(cx, cy, 10, 0, Math.PI * 2);
+                    ctx.fill();
+                    ctx.stroke();
+                    ctx.beginPath();
+                    if (source.current > 0) { // Out of the page: a dot
+                        ctx.fillStyle = SOURCE_COLORS.wire;
+                        ctx.arc(cx, cy, 3, 0, Math.PI * 2);
+                        ctx.fill();
+                    } else { // Into the page: a cross
+                        ctx.moveTo(cx - 6, cy - 6);
+                        ctx.lineTo(cx + 6, cy + 6);
+                        ctx.moveTo(cx + 6, cy - 6);
+                        ctx.lineTo(cx - 6, cy + 6);
+                        ctx.stroke();
+                    }
+                }
+            }
+        }
+
+        function placeCompass() {
+            frameRequest = 0;
+            if (!field) return;
+            compass.style.left = `${toBoardX(position[0])}px`;
+            compass.style.top = `${toBoardY(position[1])}px`;
+            sample(field, position[0], position[1], vector);
+            const target = Math.atan2(vector[0], vector[1]) * 180 / Math.PI; // Clockwise from north (+y)
+            bearing += ((target - bearing) % 360 + 540) % 360 - 180;
+            needle.style.transform = `rotate(${bearing}deg)`;
+            if (options.onSample) {
+                options.onSample(Math.hypot(vector[0], vector[1]), (target + 360) % 360);
+            }
+        }
+
+        function schedulePlace() {
+            if (!frameRequest) {
+                frameRequest = requestAnimationFrame(placeCompass);
+            }
+        }
+
+        function moveTo(clientX, clientY) {
+            const rect = board.getBoundingClientRect();
+            const fx = Math.min(1, Math.max(0, (clientX - rect.left) / rect.width));
+            const fy = Math.min(1, Math.max(0, (clientY - rect.top) / rect.height));
+            position[0] = (fx * 2 - 1) * field.extent;
+            position[1] = (1 - fy * 2) * field.extent;
+            schedulePlace();
+        }
+
+        compass.addEventListener('pointerdown', event => {
+            if (!field) return;
+            compass.setPointerCapture(event.pointerId);
+            compass.classList.add('dragging');
+            event.preventDefault();
+        });
+        compass.addEventListener('pointermove', event => {
+            if (compass.hasPointerCapture(event.pointerId)) {
+                moveTo(event.clientX, event.clientY);
+            }
+        });
+        compass.addEventListener('pointerup', () => {
+            compass.classList.remove('dragging');
+        });
+        compass.addEventListener('keydown', event => {
+            const step = field ? field.extent / 40 : 0;
+            const moves = { ArrowLeft: [-step, 0], ArrowRight: [step, 0], ArrowUp: [0, step], ArrowDown: [0, -step] };
+            if (!field || !moves[event.key]) return;
+            event.preventDefault();
+            position[0] = Math.min(field.extent, Math.max(-field.extent, position[0] + moves[event.key][0]));
+            position[1] = Math.min(field.extent, Math.max(-field.extent, position[1] + moves[event.key][1]));
+            schedulePlace();
+        });
+        new ResizeObserver(() => {
+            drawScene();
+            placeCompass();
+        }).observe(board);
+
+        return {
+            setField: function(next) {
+                field = next;
+                drawScene();
+                placeCompass();
+            }
+        };
+    }
+
+    window.CompassBoard = { prepare: prepare, sample: sample, create: create };
+
+    if (window.LessonRuntime) {
+        LessonRuntime.register('compass', function(lessonData) {
+            // Compass Interaction (the needle follows the superposed field sampled by the server)
+            const compassScenarioSelect = document.getElementById('compass-scenario');
+            const compassFieldValue = document.getElementById('compass-field');
+            const compassBearingValue = document.getElementById('compass-bearing');
+            const compassCache = new Map(); // scenario -> prepared field
+            const compassBoard = CompassBoard.create(document.querySelector('.compass-board'), {
+                position: lessonData.compass.position,
+                onSample: function(magnitude, bearing) {
+                    compassFieldValue.textContent = (magnitude * 1e6).toFixed(1); // Tesla to microtesla
+                    compassBearingValue.textContent = bearing.toFixed(0);
+                }
+            });
+
+            function showCompassScene(data) {
+                const field = CompassBoard.prepare(data);
+                compassCache.set(data.scenario, field);
+                if (data.scenario === compassScenarioSelect.value) {
+                    compassBoard.setField(field);
+                }
+            }
+
+            compassScenarioSelect.value = lessonData.compass.scenario;
+            showCompassScene(lessonData.compass);
+            lessonBridge.onPatch('compass', showCompassScene);
+            compassScenarioSelect.addEventListener('change', () => {
+                const cached = compassCache.get(compassScenarioSelect.value);
+                if (cached) {
+                    compassBoard.setField(cached);
+                }
+                lessonBridge.update('compassScenario', compassScenarioSelect.value, true);
+            });
+        });
+    }
+})();
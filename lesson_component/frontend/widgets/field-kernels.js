@@ -0,0 +1,141 @@
+// Field Kernels
+// Batched forms of the field models in magnetism/fields.py for sampling in the browser. Each kernel
+// evaluates a whole Float64Array of positions in one tight loop and writes into output arrays the
+// caller allocates once and reuses, so sampling thousands of points per frame allocates nothing and
+// never calls a function per point. Units, conventions and the zero at singular points match the
+// Python models. Every kernel returns its output(s); inputs and outputs have the same length. The
+// field-strength chart uses `inverseSquare`; the field-line view moves its tracer particles with
+// the kernel `bind` returns for the model named in its patch.
+(function() {
+    const MU_0 = 4e-7 * Math.PI;
+
+    // Inverse-square strength k / r^2 of the distance slider (field_strength).
+    function inverseSquare(distance, k, out) {
+        for (let i = 0; i < distance.length; i++) {
+            const d = distance[i];
+            out[i] = k / (d * d);
+        }
+        return out;
+    }
+
+    // Point dipole at the origin along +y, with mu_0 / 4 pi folded into the moment (dipole_field).
+    function dipole(x, y, moment, bx, by) {
+        for (let i = 0; i < x.length; i++) {
+            const px = x[i];
+            const py = y[i];
+            const r2 = px * px + py * py;
+            const scale = r2 > 0 ? moment / (r2 * r2 * Math.sqrt(r2)) : 0;
+            bx[i] = 3 * px * py * scale;
+            by[i] = (3 * py * py - r2) * scale;
+        }
+        return [bx, by];
+    }
+
+    // Bar magnet along x centred on (x0, y0) as two opposite poles, north at +length / 2 (bar_magnet_field).
+    function barMagnet(x, y, length, strength, x0, y0, bx, by) {
+        const north = x0 + length / 2;
+        const south = x0 - length / 2;
+        for (let i = 0; i < x.length; i++) {
+            const dy = y[i] - y0;
+            const dn = x[i] - north;
+            const ds = x[i] - south;
+            const rn = dn * dn + dy * dy;
+            const rs = ds * ds + dy * dy;
+            const sn = rn > 0 ? strength / (rn * Math.sqrt(rn)) : 0;
+            const ss = rs > 0 ? -strength / (rs * Math.sqrt(rs)) : 0;
+            bx[i] = dn * sn + ds * ss;
+            by[i] = dy * (sn + ss);
+        }
+        return [bx, by];
+    }
+
+    // Infinite straight wire through (x0, y0), current out of the page (wire_field).
+    function wire(x, y, current, x0, y0, bx, by) {
+        const k = MU_0 * current / (2 * Math.PI);
+        for (let i = 0; i < x.length; i++) {
+            const dx = x[i] - x0;
+            const dy = y[i] - y0;
+            const r2 = dx * dx + dy * dy;
+            const scale = r2 > 0 ? k / r2 : 0;
+            bx[i] = -dy * scale;
+            by[i] = dx * scale;
+        }
+        return [bx, by];
+    }
+
+    // Coil wound around the x axis and centred on the origin, in the plane containing its axis
+    // (solenoid_plane_field). Each turn is a circular loop, whose off-axis field is closed-form in the
+    // complete elliptic integrals K and E (computed by the arithmetic-geometric mean), so a point costs
+    // a few square roots per turn instead of a Biot-Savart sum over the wire. Away from the windings the
+    // stacked loops are typically within 1% of the server's helix.
+    function solenoid(x, y, current, turns, length, radius, bx, by) {
+        const c = MU_0 * current / Math.PI;
+        const a2 = radius * radius;
+        for (let i = 0; i < x.length; i++) {
+            const rho = Math.abs(y[i]);
+            let axial = 0;
+            let radial = 0;
+            for (let turn = 0; turn < turns; turn++) {
+                const z = x[i] + length / 2 - (turn + 0.5) * length / turns;
+                const s = a2 + rho * rho + z * z;
+                const alpha2 = s - 2 * radius * rho;
+                if (!(alpha2 > 0)) continue; // On the wire itself
+                const beta2 = s + 2 * radius * rho;
+                const beta = Math.sqrt(beta2);
+                // AGM from (1, alpha / beta): K = pi / (2 a), E = K (1 - sum 2^(n-1) c_n^2).
+                let a = 1;
+                let b = Math.sqrt(alpha2 / beta2);
+                let sum = (1 - alpha2 / beta2) / 2;
+                let weight = 0.5;
+                while (Math.abs(a - b) > 1e-15 * a) {
+                    const cn = (a - b) / 2;
+                    const mean = (a + b) / 2;
+                    b = Math.sqrt(a * b);
+                    a = mean;
+                    weight *= 2;
+                    sum += weight * cn * cn;
+                }
+                const k = Math.PI / (2 * a);
+                const e = k * (1 - sum);
+                const scale = c / (2 * alpha2 * beta);
+                axial += scale * ((a2 - rho * rho - z * z) * e + alpha2 * k);
+                if (rho > 0) radial += scale * z / rho * (s * e - alpha2 * k);
+            }
+            bx[i] = axial;
+            by[i] = y[i] < 0 ? -radial : radial;
+        }
+        return [bx, by];
+    }
+
+    // Model name (as in FIELD_MODELS) -> the Python model's defaults and the kernel taking them.
+    const MODELS = {
+        dipole: [{ moment: 1 }, (p, x, y, bx, by) => dipole(x, y, p.moment, bx, by)],
+        bar_magnet: [
+            { length: 1, strength: 1, x0: 0, y0: 0 },
+            (p, x, y, bx, by) => barMagnet(x, y, p.length, p.strength, p.x0, p.y0, bx, by)
+        ],
+        wire: [{ current: 1, x0: 0, y0: 0 }, (p, x, y, bx, by) => wire(x, y, p.current, p.x0, p.y0, bx, by)],
+        solenoid_plane: [
+            { current: 1, turns: 10, length: 2, radius: 0.5 },
+            (p, x, y, bx, by) => solenoid(x, y, p.current, p.turns, p.length, p.radius, bx, by)
+        ]
+    };
+
+    // The kernel for `model` with `params` fixed, as (x, y, bx, by) => [bx, by]; null for a model
+    // without one. Bind once per field, then call it every frame.
+    function bind(model, params) {
+        const entry = MODELS[model];
+        if (!entry) return null;
+        const resolved = Object.assign({}, entry[0], params);
+        return (x, y, bx, by) => entry[1](resolved, x, y, bx, by);
+    }
+
+    window.FieldKernels = {
+        inverseSquare: inverseSquare,
+        dipole: dipole,
+        barMagnet: barMagnet,
+        wire: wire,
+        solenoid: solenoid,
+        bind: bind
+    };
+})();
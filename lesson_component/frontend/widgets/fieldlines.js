@@ -0,0 +1,621 @@
+// Field-Line Renderer
+// Draws streamlines and animated tracer particles for a 2D field sampled on a square grid.
+// Streamlines are integrated through the grid once per field and cached as an image; particles live
+// in typed-array buffers (no per-particle objects), and the active count backs off when frames run
+// long so the animation holds its frame rate on integrated graphics. When the patch names a model with
+// a batched kernel (widgets/field-kernels.js), every frame moves all particles with one kernel call on
+// the exact field instead of a grid lookup per particle. Preparing a field and tracing its
+// streamlines run in a Web Worker, which is this same script (see Field Worker below). Registers the
+// `fieldLines` widget.
+(function() {
+    // Captured while the script runs: the URL the worker is started from (null inside the worker).
+    const SCRIPT_URL = typeof document !== 'undefined' && document.currentScript ? document.currentScript.src : null;
+    const MAX_PARTICLES = 5000;
+    const MIN_PARTICLES = 500;
+    const FRAME_BUDGET_MS = 1000 / 60;
+    const PARTICLE_LIFETIME = 180; // Frames
+    const STREAMLINE_STEPS = 600;
+    const STRENGTH_BANDS = ['rgba(0, 90, 156, 0.55)', 'rgba(0, 90, 156, 0.8)', 'rgba(242, 169, 0, 0.95)'];
+
+    function decodeFloat32(base64) {
+        const binary = atob(base64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return new Float32Array(bytes.buffer);
+    }
+
+    // Turns a server grid into unit directions plus a 0..1 strength (log magnitude between the 5th and
+    // 95th percentiles), which is all the renderer needs.
+    function prepare(data) {
+        const n = data.resolution;
+        const bx = data.bx instanceof Float32Array ? data.bx : decodeFloat32(data.bx);
+        const by = data.by instanceof Float32Array ? data.by : decodeFloat32(data.by);
+        const ux = new Float32Array(n * n);
+        const uy = new Float32Array(n * n);
+        const strength = new Float32Array(n * n);
+        const logs = new Float32Array(n * n);
+        for (let i = 0; i < n * n; i++) {
+            const magnitude = Math.hypot(bx[i], by[i]);
+            if (magnitude > 0) {
+                ux[i] = bx[i] / magnitude;
+                uy[i] = by[i] / magnitude;
+                logs[i] = Math.log(magnitude);
+            } else {
+                logs[i] = -Infinity;
+            }
+        }
+        const sorted = logs.filter(Number.isFinite).sort();
+        const low = sorted[Math.floor(sorted.length * 0.05)];
+        const range = sorted[Math.floor(sorted.length * 0.95)] - low || 1;
+        for (let i = 0; i < n * n; i++) {
+            strength[i] = Math.min(1, Math.max(0, (logs[i] - low) / range));
+        }
+        return {
+            source: data.source,
+            model: data.model || null,
+            params: data.params || {},
+            low: low,
+            range: range,
+            n: n,
+            extent: data.extent,
+            geometry: data.geometry,
+            ux: ux,
+            uy: uy,
+            strength: strength,
+            streamlines: null
+        };
+    }
+
+    // Bilinear interpolation into the grid. Writes the unit direction into `out` and returns the
+    // strength, or -1 outside the grid or where the field vanishes.
+    function sample(field, x, y, out) {
+        const n = field.n;
+        const scale = (n - 1) / (2 * field.extent);
+        const gx = (x + field.extent) * scale;
+        const gy = (y + field.extent) * scale;
+        if (!(gx >= 0 && gy >= 0 && gx < n - 1 && gy < n - 1)) {
+            return -1;
+        }
+        const i = gx | 0;
+        const j = gy | 0;
+        const fx = gx - i;
+        const fy = gy - j;
+        const k = j * n + i;
+        const w00 = (1 - fx) * (1 - fy);
+        const w10 = fx * (1 - fy);
+        const w01 = (1 - fx) * fy;
+        const w11 = fx * fy;
+        const ux = w00 * field.ux[k] + w10 * field.ux[k + 1] + w01 * field.ux[k + n] + w11 * field.ux[k + n + 1];
+        const uy = w00 * field.uy[k] + w10 * field.uy[k + 1] + w01 * field.uy[k + n] + w11 * field.uy[k + n + 1];
+        const length = Math.hypot(ux, uy);
+        if (length < 1e-6) {
+            return -1;
+        }
+        out[0] = ux / length;
+        out[1] = uy / length;
+        return w00 * field.strength[k] + w10 * field.strength[k + 1] + w01 * field.strength[k + n] + w11 * field.strength[k + n + 1];
+    }
+
+    function streamlineSeeds(field) {
+        const g = field.geometry;
+        const seeds = [];
+        if (field.source === 'dipole') {
+            for (let i = 0; i < 24; i++) {
+                const angle = (i + 0.5) * Math.PI * 2 / 24;
+                seeds.push([0.15 * Math.cos(angle), 0.15 * Math.sin(angle)]);
+            }
+        } else if (field.source === 'bar_magnet') {
+            for (let i = 0; i < 24; i++) {
+                const angle = (i + 0.5) * Math.PI * 2 / 24;
+                seeds.push([g.length / 2 + 0.12 * Math.cos(angle), 0.12 * Math.sin(angle)]);
+            }
+        } else if (field.source === 'wire') {
+            for (let r = 0.2; r < field.extent; r += 0.25) {
+                seeds.push([g.x + r, g.y]);
+            }
+        } else {
+            for (let i = -4; i <= 4; i++) {
+                seeds.push([0, i * g.radius * 0.2]);
+            }
+            for (let r = g.radius * 1.4; r < field.extent; r += 0.35) {
+                seeds.push([0, r], [0, -r]);
+            }
+        }
+        return seeds;
+    }
+
+    // Midpoint (RK2) integration along the unit field in both directions from each seed. The lines are
+    // packed end to end as x, y pairs in `points`; line i spans points[starts[i]] to points[starts[i + 1]].
+    function traceStreamlines(field) {
+        const h = field.extent / 150;
+        const direction = new Float32Array(2);
+        const seeds = streamlineSeeds(field);
+        const points = new Float32Array(seeds.length * 2 * (STREAMLINE_STEPS + 1) * 2);
+        const starts = new Uint32Array(seeds.length * 2 + 1);
+        let count = 0;
+        let line = 0;
+        for (const [sx, sy] of seeds) {
+            for (const sign of [1, -1]) {
+                starts[line++] = count;
+                points[count++] = sx;
+                points[count++] = sy;
+                let x = sx;
+                let y = sy;
+                for (let step = 0; step < STREAMLINE_STEPS; step++) {
+                    if (sample(field, x, y, direction) < 0) break;
+                    const mx = x + sign * direction[0] * h / 2;
+                    const my = y + sign * direction[1] * h / 2;
+                    if (sample(field, mx, my, direction) < 0) break;
+                    x += sign * direction[0] * h;
+                    y += sign * direction[1] * h;
+                    points[count++] = x;
+                    points[count++] = y;
+                    if (step > 20 && Math.hypot(x - sx, y - sy) < h) break; // Closed loop (wire)
+                }
+            }
+        }
+        starts[line] = count;
+        return { points: points.slice(0, count), starts: starts };
+    }
+
+    function create(canvas, options) {
+        const ctx = canvas.getContext('2d');
+        const layer = document.createElement('canvas');
+        const layerCtx = layer.getContext('2d');
+        const px = new Float64Array(MAX_PARTICLES);
+        const py = new Float64Array(MAX_PARTICLES);
+        const bx = new Float64Array(MAX_PARTICLES);
+        const by = new Float64Array(MAX_PARTICLES);
+        const life = new Float32Array(MAX_PARTICLES);
+        const band = new Uint8Array(MAX_PARTICLES);
+        const direction = new Float32Array(2);
+        let field = null;
+        let kernel = null; // Batched field of the current source, or null to sample the grid
+        let views = null; // The buffers' first `active` entries, the kernel's inputs and outputs
+        let active = MAX_PARTICLES;
+        let running = false;
+        let visible = false;
+        let frameRequest = 0;
+        let lastFrameAt = 0;
+        let workAverage = 0;
+        let intervalAverage = FRAME_BUDGET_MS;
+        let frameCount = 0;
+
+        function toCanvasX(x) {
+            return (x + field.extent) / (2 * field.extent) * canvas.width;
+        }
+
+        function toCanvasY(y) {
+            return canvas.height - (y + field.extent) / (2 * field.extent) * canvas.height;
+        }
+
+        function resize() {
+            const ratio = window.devicePixelRatio || 1;
+            const size = Math.round(canvas.clientWidth * ratio);
+            if (size > 0 && canvas.width !== size) {
+                canvas.width = size;
+                canvas.height = size;
+                layer.width = size;
+                layer.height = size;
+                if (field) drawLayer();
+            }
+        }
+
+        function drawGeometry() {
+            const g = field.geometry;
+            const unit = canvas.width / (2 * field.extent);
+            layerCtx.lineWidth = Math.max(1, unit * 0.015);
+            layerCtx.font = `bold ${Math.round(unit * 0.12)}px Inter, sans-serif`;
+            layerCtx.textAlign = 'center';
+            layerCtx.textBaseline = 'middle';
+            if (field.source === 'dipole') {
+                const size = unit * 0.12;
+                layerCtx.fillStyle = '#3b82f6';
+                layerCtx.fillRect(toCanvasX(0) - size / 2, toCanvasY(0), size, size);
+                layerCtx.fillStyle = '#dc2626';
+                layerCtx.fillRect(toCanvasX(0) - size / 2, toCanvasY(0) - size, size, size);
+            } else if (field.source === 'bar_magnet') {
+                const half = g.thickness / 2 * unit;
+                layerCtx.fillStyle = '#3b82f6';
+                layerCtx.fillRect(toCanvasX(-g.length / 2), toCanvasY(0) - half, g.length / 2 * unit, 2 * half);
+                layerCtx.fillStyle = '#dc2626';
+                layerCtx.fillRect(toCanvasX(0), toCanvasY(0) - half, g.length / 2 * unit, 2 * half);
+                layerCtx.fillStyle = '#ffffff';
+                layerCtx.fillText('S', toCanvasX(-g.length / 4), toCanvasY(0));
+                layerCtx.fillText('N', toCanvasX(g.length / 4), toCanvasY(0));
+            } else {
+                const conductors = field.source === 'wire'
+                    ? [[g.x, g.y, true]]
+                    : Array.from({ length: g.turns }, (_, i) => -g.length / 2 + (i + 0.5) * g.length / g.turns)
+                        .flatMap(x => [[x, g.radius, true], [x, -g.radius, false]]);
+                const radius = field.source === 'wire' ? unit * 0.08 : unit * (g.wire || 0.05);
+                for (const [x, y, outOfPage] of conductors) {
+                    layerCtx.beginPath();
+                    layerCtx.arc(toCanvasX(x), toCanvasY(y), radius, 0, Math.PI * 2);
+                    layerCtx.fillStyle = '#fefefe';
+                    layerCtx.fill();
+                    layerCtx.strokeStyle = '#333333';
+                    layerCtx.stroke();
+                    layerCtx.fillStyle = '#333333';
+                    layerCtx.fillText(outOfPage ? '•' : '×', toCanvasX(x), toCanvasY(y));
+                }
+            }
+        }
+
+        function drawLayer() {
+            if (field.streamlines === null) {
+                field.streamlines = traceStreamlines(field);
+            }
+            layerCtx.fillStyle = '#fefefe';
+            layerCtx.fillRect(0, 0, layer.width, layer.height);
+            layerCtx.strokeStyle = 'rgba(51, 51, 51, 0.35)';
+            layerCtx.lineWidth = Math.max(1, canvas.width / 400);
+            layerCtx.beginPath();
+            const points = field.streamlines.points;
+            const starts = field.streamlines.starts;
+            for (let line = 0; line + 1 < starts.length; line++) {
+                layerCtx.moveTo(toCanvasX(points[starts[line]]), toCanvasY(points[starts[line] + 1]));
+                for (let i = starts[line] + 2; i < starts[line + 1]; i += 2) {
+                    layerCtx.lineTo(toCanvasX(points[i]), toCanvasY(points[i + 1]));
+                }
+            }
+            layerCtx.stroke();
+            drawGeometry();
+        }
+
+        function respawn(i) {
+            px[i] = (Math.random() * 2 - 1) * field.extent;
+            py[i] = (Math.random() * 2 - 1) * field.extent;
+            life[i] = 1 + Math.random() * PARTICLE_LIFETIME;
+        }
+
+        // All particles at once: one kernel call, then a plain loop over its outputs.
+        function stepWithKernel(base) {
+            if (views === null || views.count !== active) {
+                views = {
+                    count: active,
+                    x: px.subarray(0, active),
+                    y: py.subarray(0, active),
+                    bx: bx.subarray(0, active),
+                    by: by.subarray(0, active)
+                };
+            }
+            kernel(views.x, views.y, views.bx, views.by);
+            for (let i = 0; i < active; i++) {
+                const magnitude = Math.hypot(bx[i], by[i]);
+                if (life[i] <= 0 || !(magnitude > 0) || Math.abs(px[i]) >= field.extent || Math.abs(py[i]) >= field.extent) {
+                    respawn(i);
+                    continue;
+                }
+                const strength = Math.min(1, Math.max(0, (Math.log(magnitude) - field.low) / field.range));
+                const speed = base * (0.3 + 0.7 * strength) / magnitude;
+                px[i] += bx[i] * speed;
+                py[i] += by[i] * speed;
+                life[i] -= 1;
+                band[i] = strength < 0.33 ? 0 : strength < 0.66 ? 1 : 2;
+            }
+        }
+
+        function step() {
+            const base = field.extent / 120;
+            if (kernel) {
+                stepWithKernel(base);
+                return;
+            }
+            for (let i = 0; i < active; i++) {
+                const strength = life[i] > 0 ? sample(field, px[i], py[i], direction) : -1;
+                if (strength < 0) {
+                    respawn(i);
+                    continue;
+                }
+                const speed = base * (0.3 + 0.7 * strength);
+                px[i] += direction[0] * speed;
+                py[i] += direction[1] * speed;
+                life[i] -= 1;
+                band[i] = strength < 0.33 ? 0 : strength < 0.66 ? 1 : 2;
+            }
+        }
+
+        function draw() {
+            ctx.drawImage(layer, 0, 0);
+            const size = Math.max(1.5, canvas.width / 350);
+            const scale = canvas.width / (2 * field.extent);
+            for (let b = 0; b < STRENGTH_BANDS.length; b++) {
+                ctx.fillStyle = STRENGTH_BANDS[b];
+                ctx.beginPath();
+                for (let i = 0; i < active; i++) {
+                    if (band[i] === b) {
+                        ctx.rect((px[i] + field.extent) * scale, canvas.height - (py[i] + field.extent) * scale, size, size);
+                    }
+                }
+                ctx.fill();
+            }
+        }
+
+        // Shed particles quickly when frames run long, and win them back slowly when there is headroom.
+        function adapt(work, interval) {
+            workAverage = workAverage * 0.9 + work * 0.1;
+            intervalAverage = intervalAverage * 0.9 + interval * 0.1;
+            frameCount += 1;
+            if (frameCount % 15 === 0 && (workAverage > FRAME_BUDGET_MS * 0.5 || intervalAverage > FRAME_BUDGET_MS * 1.25)) {
+                active = Math.max(MIN_PARTICLES, Math.floor(active * 0.8));
+            } else if (frameCount % 60 === 0 && workAverage < FRAME_BUDGET_MS * 0.25 && intervalAverage < FRAME_BUDGET_MS * 1.1) {
+                const previous = active;
+                active = Math.min(MAX_PARTICLES, Math.ceil(active * 1.1));
+                for (let i = previous; i < active; i++) respawn(i);
+            }
+            if (frameCount % 30 === 0 && options.onStats) {
+                options.onStats(active, 1000 / intervalAverage);
+            }
+        }
+
+        function frame(now) {
+            if (!running) return;
+            const start = performance.now();
+            step();
+            draw();
+            adapt(performance.now() - start, lastFrameAt ? now - lastFrameAt : FRAME_BUDGET_MS);
+            lastFrameAt = now;
+            frameRequest = requestAnimationFrame(frame);
+        }
+
+        // Fields arrive from the worker, so the canvas can come into view before there is one to animate.
+        function start() {
+            visible = true;
+            if (running || !field) return;
+            running = true;
+            lastFrameAt = 0;
+            resize();
+            frameRequest = requestAnimationFrame(frame);
+        }
+
+        return {
+            setField: function(next) {
+                field = next;
+                kernel = field.model && window.FieldKernels ? FieldKernels.bind(field.model, field.params) : null;
+                resize();
+                drawLayer();
+                for (let i = 0; i < MAX_PARTICLES; i++) respawn(i);
+                if (!running) {
+                    draw();
+                    if (visible) start();
+                }
+            },
+            start: start,
+            stop: function() {
+                visible = false;
+                running = false;
+                cancelAnimationFrame(frameRequest);
+            }
+        };
+    }
+
+    // The same from a grid the server has already reduced to directions (256ths of a turn) and 0-255 strengths.
+    function unpack(data, angle, strength) {
+        const count = data.resolution * data.resolution;
+        const ux = new Float32Array(count);
+        const uy = new Float32Array(count);
+        const unit = new Float32Array(count);
+        for (let i = 0; i < count; i++) {
+            const radians = angle[i] * Math.PI / 128;
+            ux[i] = Math.cos(radians);
+            uy[i] = Math.sin(radians);
+            unit[i] = strength[i] / 255;
+        }
+        return {
+            source: data.source,
+            model: null,
+            n: data.resolution,
+            extent: data.extent,
+            geometry: data.geometry,
+            ux: ux,
+            uy: uy,
+            strength: unit,
+            streamlines: null
+        };
+    }
+
+    // Field Worker
+    // A job prepares a server grid (`prepare`) or a table's packed directions (`unpack`) and traces its
+    // streamlines; the result's arrays come back as transferred buffers, never copied. Each widget posts
+    // on its own channel and only the newest job on a channel runs: one still waiting when a newer job
+    // arrives is dropped, so a dragged slider never leaves a queue of stops it has already passed. Jobs
+    // run one per task, which lets those newer messages in between them. Where workers are unavailable
+    // the same runner works through the jobs on the page, still one per task.
+    function runJob(job) {
+        const field = job.kind === 'unpack' ? unpack(job.data, job.angle, job.strength) : prepare(job.data);
+        field.streamlines = traceStreamlines(field);
+        return field;
+    }
+
+    function serveJobs(post) {
+        const waiting = new Map(); // channel -> newest job not yet started
+        let scheduled = false;
+
+        function schedule() {
+            if (!scheduled && waiting.size > 0) {
+                scheduled = true;
+                setTimeout(drain, 0);
+            }
+        }
+
+        function drain() {
+            scheduled = false;
+            const [channel, job] = waiting.entries().next().value;
+            waiting.delete(channel);
+            try {
+                const field = runJob(job);
+                post({ id: job.id, channel: channel, field: field }, [
+                    field.ux.buffer, field.uy.buffer, field.strength.buffer,
+                    field.streamlines.points.buffer, field.streamlines.starts.buffer
+                ]);
+            } catch (error) {
+                post({ id: job.id, channel: channel, field: null, error: String(error) }, []);
+            }
+            schedule();
+        }
+
+        return function(message) {
+            if (message.cancel) {
+                waiting.delete(message.cancel);
+            } else {
+                waiting.set(message.channel, message);
+                schedule();
+            }
+        };
+    }
+
+    if (typeof window === 'undefined') {
+        // Started as the worker: serve the page's jobs and stop here.
+        const receive = serveJobs((message, transfer) => self.postMessage(message, transfer));
+        self.onmessage = event => receive(event.data);
+        return;
+    }
+
+    const jobs = new Map(); // channel -> the job whose result the page is waiting for
+    let worker; // Started on the first job; null once jobs run on the page
+    let runHere = null;
+    let nextJobId = 0;
+
+    function deliver(message) {
+        const job = jobs.get(message.channel);
+        if (!job || job.id !== message.id) return; // Superseded while it ran
+        jobs.delete(message.channel);
+        if (message.error) {
+            LessonTelemetry.count('fieldlines.job_errors', 1);
+        } else {
+            LessonTelemetry.record('fieldlines.job', performance.now() - job.postedAt);
+        }
+        job.resolve(message.field);
+    }
+
+    function startWorker() {
+        runHere = serveJobs(deliver);
+        worker = null;
+        if (SCRIPT_URL && typeof Worker !== 'undefined') {
+            try {
+                worker = new Worker(SCRIPT_URL);
+                worker.onmessage = event => deliver(event.data);
+                worker.onerror = () => {
+                    // The script could not start as a worker (e.g. blocked by policy): run the jobs here.
+                    worker.terminate();
+                    worker = null;
+                    jobs.forEach(job => runHere(job.retry));
+                };
+            } catch (error) {
+                worker = null;
+            }
+        }
+    }
+
+    function post(message, transfer) {
+        if (worker === undefined) {
+            startWorker();
+        }
+        if (worker) {
+            worker.postMessage(message, transfer);
+        } else {
+            runHere(message);
+        }
+    }
+
+    function supersede(channel) {
+        const job = jobs.get(channel);
+        if (!job) return false;
+        jobs.delete(channel);
+        job.resolve(null);
+        LessonTelemetry.count('fieldlines.jobs_superseded', 1);
+        return true;
+    }
+
+    // Prepares a field off the main thread: `kind` is 'prepare' for a server grid, or 'unpack' with a
+    // table's angle and strength bytes. Resolves to the field, streamlines traced, or to null when a
+    // newer job on `channel` replaced this one.
+    function compute(channel, kind, data, angle, strength) {
+        supersede(channel);
+        const id = ++nextJobId;
+        return new Promise(resolve => {
+            const message = { id: id, channel: channel, kind: kind, data: data };
+            const transfer = [];
+            if (kind === 'unpack') {
+                // Copies go to the worker, so the table they came from stays whole here.
+                message.angle = angle.slice();
+                message.strength = strength.slice();
+                transfer.push(message.angle.buffer, message.strength.buffer);
+            }
+            jobs.set(channel, {
+                id: id,
+                resolve: resolve,
+                postedAt: performance.now(),
+                retry: Object.assign({}, message, { angle: angle, strength: strength })
+            });
+            post(message, transfer);
+        });
+    }
+
+    // Drops the job waiting on `channel`, e.g. once the widget has shown a field it already held.
+    function cancel(channel) {
+        if (supersede(channel)) {
+            post({ cancel: channel }, []);
+        }
+    }
+
+    window.FieldLines = {
+        decodeFloat32: decodeFloat32,
+        prepare: prepare,
+        unpack: unpack,
+        sample: sample,
+        create: create,
+        compute: compute,
+        cancel: cancel
+    };
+
+    if (window.LessonRuntime) {
+        LessonRuntime.register('fieldLines', function(lessonData) {
+            // Field Lines (grids come from the server; only the selected source is sent)
+            const fieldLineSelect = document.getElementById('field-line-source');
+            const fieldLineCanvas = document.getElementById('field-lines-canvas');
+            const fieldLineParticles = document.getElementById('field-lines-particles');
+            const fieldLineFps = document.getElementById('field-lines-fps');
+            const fieldLineCache = new Map(); // source -> prepared field, so switching back needs no round trip
+            const fieldLines = FieldLines.create(fieldLineCanvas, {
+                onStats: function(active, fps) {
+                    fieldLineParticles.textContent = active;
+                    fieldLineFps.textContent = fps.toFixed(0);
+                }
+            });
+
+            function showFieldLines(data) {
+                FieldLines.compute('fieldLines', 'prepare', data).then(field => {
+                    if (field === null) return;
+                    fieldLineCache.set(data.source, field);
+                    if (data.source === fieldLineSelect.value) {
+                        fieldLines.setField(field);
+                    }
+                });
+            }
+
+            fieldLineSelect.value = lessonData.fieldLines.source;
+            showFieldLines(lessonData.fieldLines);
+            lessonBridge.onPatch('fieldLines', showFieldLines);
+            fieldLineSelect.addEventListener('change', () => {
+                const cached = fieldLineCache.get(fieldLineSelect.value);
+                if (cached) {
+                    FieldLines.cancel('fieldLines');
+                    fieldLines.setField(cached);
+                }
+                lessonBridge.update('fieldLineSource', fieldLineSelect.value, true);
+            });
+
+            new IntersectionObserver(entries => {
+                if (entries[0].isIntersecting) {
+                    fieldLines.start();
+                } else {
+                    fieldLines.stop();
+                }
+            }).observe(fieldLineCanvas);
+        });
+    }
+})();
@@ -0,0 +1,467 @@
+// Magnetism Charts
+// The field-strength and electromagnet charts of the magnetism lesson's visualizations section.
+(function() {
+    // Frame Timing
+    // Slider input fires far more often than the screen refreshes, so each chart
+    // queues at most one update per animation frame and reports how long it took.
+    // Input that waits longer than a frame for its update counts as dropped frames.
+    const FRAME_MS = 1000 / 60;
+    let frameTimeSpans = null;
+    let frameTimeMax = 0;
+
+    function recordFrameTime(elapsed) {
+        if (frameTimeSpans === null) {
+            frameTimeSpans = [document.getElementById('frame-time-value'), document.getElementById('frame-time-max')];
+        }
+        frameTimeMax = Math.max(frameTimeMax, elapsed);
+        frameTimeSpans[0].textContent = elapsed.toFixed(1);
+        frameTimeSpans[1].textContent = frameTimeMax.toFixed(1);
+        frameTimeSpans[0].className = elapsed > 16 ? 'text-red-600' : 'text-green-700';
+    }
+
+    function scheduleOnFrame(update) {
+        let pending = false;
+        let queuedAt = 0;
+        function run() {
+            pending = false;
+            const start = performance.now();
+            update();
+            const elapsed = performance.now() - start;
+            recordFrameTime(elapsed);
+            LessonTelemetry.record('slider.frame', elapsed);
+            LessonTelemetry.record('slider.input_delay', start - queuedAt);
+            LessonTelemetry.count('slider.frames', 1);
+            const dropped = Math.floor((start - queuedAt) / FRAME_MS);
+            if (dropped > 0) {
+                LessonTelemetry.count('slider.dropped_frames', dropped);
+            }
+        }
+        return function() {
+            if (!pending) {
+                pending = true;
+                queuedAt = performance.now();
+                requestAnimationFrame(run);
+            }
+        };
+    }
+
+    // Slider Tables
+    // Each model's output at every slider stop, computed once on the server and shipped as one binary
+    // blob (lesson_engine/tables.py): inlined as base64, or fetched once from an immutable URL. Resolves
+    // to typed-array views into the blob plus the stop index of a slider value; null when there is no
+    // table or it cannot be fetched, in which case the widgets compute as before. Tables are left out of
+    // the first render: each chart asks for its own when it mounts (requestTable).
+    const TABLE_TYPES = { float32: Float32Array, uint8: Uint8Array };
+
+    function loadTable(table) {
+        if (!table) {
+            return Promise.resolve(null);
+        }
+        const start = performance.now();
+        let buffer;
+        if (table.data) {
+            const binary = atob(table.data);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            buffer = Promise.resolve(bytes.buffer);
+        } else {
+            buffer = fetch(new URL(table.url, new URL('../../', window.location.href)).href).then(response => {
+                if (!response.ok) throw new Error(`Slider table ${response.status}`);
+                return response.arrayBuffer();
+            });
+        }
+        return buffer.then(data => {
+            const arrays = {};
+            for (const [name, entry] of Object.entries(table.arrays)) {
+                arrays[name] = new TABLE_TYPES[entry.dtype](data, entry.offset, entry.shape.reduce((a, b) => a * b, 1));
+            }
+            LessonTelemetry.record('tables.load', performance.now() - start);
+            return {
+                arrays: arrays,
+                stop: function(slider, value) {
+                    return Math.round((value - table.sliders[slider].min) / table.sliders[slider].step);
+                }
+            };
+        }).catch(() => null);
+    }
+
+    function requestTable(lessonData, name, use) {
+        function receive(table) {
+            loadTable(table).then(loaded => {
+                if (loaded) use(loaded);
+            });
+        }
+        lessonBridge.onPatch(name, receive);
+        if (lessonData[name]) {
+            receive(lessonData[name]);
+        }
+        lessonBridge.load(name);
+    }
+
+    LessonRuntime.register('fieldStrengthChart', function(lessonData) {
+        // Magnetic Field Strength Chart
+        const distanceSlider = document.getElementById('distance-slider');
+        const distanceValueSpan = document.getElementById('distance-value');
+        const strengthValueSpan = document.getElementById('strength-value');
+        const kSlider = document.getElementById('k-slider');
+        const kValueSpan = document.getElementById('k-value');
+        const fieldStrengthChartCtx = document.getElementById('fieldStrengthChart').getContext('2d');
+        const fieldStrengthView = LessonRuntime.pausableChart(fieldStrengthChartCtx.canvas.parentElement);
+        const fieldStrengthMarker = { x: 1, y: 0 };
+        let fieldStrengthChart;
+
+        // The curve only depends on (k, range, resolution), so it is sampled once per key into
+        // typed arrays (FieldKernels.inverseSquare, the batched k / r^2). Slider stops get their label strings up front, which keeps a distance
+        // drag free of allocations: it only looks up a stop and moves the marker.
+        const FIELD_CURVE_MIN = lessonData.fieldCurve.min;
+        const FIELD_CURVE_MAX = lessonData.fieldCurve.max;
+        const FIELD_CURVE_RESOLUTION = lessonData.fieldCurve.resolution;
+        const distanceMin = parseFloat(distanceSlider.min);
+        const distanceStep = parseFloat(distanceSlider.step);
+        const distanceStopCount = Math.round((parseFloat(distanceSlider.max) - distanceMin) / distanceStep) + 1;
+        const distanceStops = Float64Array.from({ length: distanceStopCount }, (_, i) => distanceMin + i * distanceStep);
+        const distanceLabels = Array.from(distanceStops, d => d.toFixed(1));
+        const fieldCurveCache = new Map();
+        let fieldCurve;
+        let fieldCurveTable = null; // Strengths at every (k, distance) stop and the curve for every k
+        requestTable(lessonData, 'fieldCurveTable', table => {
+            fieldCurveTable = table;
+        });
+
+        function fieldCurveKey(k, min, max, resolution) {
+            return `${k}|${min}|${max}|${resolution}`;
+        }
+
+        function curveAxis(min, max, resolution) {
+            const xs = new Float64Array(resolution);
+            const step = (max - min) / (resolution - 1);
+            for (let i = 0; i < resolution; i++) {
+                xs[i] = min + i * step;
+            }
+            return xs;
+        }
+
+        function makeFieldCurve(k, xs, ys, stopStrengths) {
+            stopStrengths = stopStrengths || FieldKernels.inverseSquare(distanceStops, k, new Float64Array(distanceStopCount));
+            return {
+                k: k,
+                xs: xs,
+                ys: ys,
+                points: Array.from(xs, (x, i) => ({ x: x, y: ys[i] })), // Chart.js needs point objects, built once per curve
+                stopStrengths: stopStrengths,
+                stopLabels: Array.from(stopStrengths, y => y.toFixed(2))
+            };
+        }
+
+        function getFieldCurve(k, min, max, resolution) {
+            const key = fieldCurveKey(k, min, max, resolution);
+            let curve = fieldCurveCache.get(key);
+            if (!curve) {
+                const xs = curveAxis(min, max, resolution);
+                const row = fieldCurveTable ? fieldCurveTable.stop('k', k) : -1;
+                if (row >= 0 && resolution === FIELD_CURVE_RESOLUTION && (row + 1) * resolution <= fieldCurveTable.arrays.curves.length) {
+                    // A k stop: both the curve and the strength at every distance stop are rows of the table.
+                    curve = makeFieldCurve(
+                        k,
+                        xs,
+                        fieldCurveTable.arrays.curves.subarray(row * resolution, (row + 1) * resolution),
+                        fieldCurveTable.arrays.strength.subarray(row * distanceStopCount, (row + 1) * distanceStopCount)
+                    );
+                } else {
+                    curve = makeFieldCurve(k, xs, FieldKernels.inverseSquare(xs, k, new Float64Array(resolution)));
+                }
+                fieldCurveCache.set(key, curve);
+            }
+            return curve;
+        }
+
+        // The default curve comes from the Python field engine, so the page starts from the same numbers the server uses.
+        const serverCurve = lessonData.fieldCurve;
+        fieldCurveCache.set(
+            fieldCurveKey(serverCurve.k, serverCurve.min, serverCurve.max, serverCurve.resolution),
+            makeFieldCurve(serverCurve.k, curveAxis(serverCurve.min, serverCurve.max, serverCurve.resolution), Float64Array.from(serverCurve.ys))
+        );
+
+        function buildFieldStrengthChart() {
+            fieldStrengthChart = new Chart(fieldStrengthChartCtx, {
+                type: 'line',
+                data: {
+                    datasets: [{
+                        label: 'Magnetic Field Strength',
+                        data: fieldCurve.points,
+                        parsing: false,
+                        normalized: true,
+                        borderColor: '#005A9C',
+                        borderWidth: 2,
+                        fill: false,
+                        tension: 0.1,
+                        pointRadius: 0
+                    }, {
+                        label: 'Current Distance',
+                        data: [fieldStrengthMarker],
+                        borderColor: '#F2A900',
+                        backgroundColor: '#F2A900',
+                        pointRadius: 6,
+                        pointHoverRadius: 8,
+                        showLine: false
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    animation: false,
+                    scales: {
+                        x: {
+                            type: 'linear',
+                            min: 1,
+                            max: 10,
+                            title: { display: true, text: 'Distance (units)' }
+                        },
+                        y: {
+                            beginAtZero: true,
+                            title: { display: true, text: 'Field Strength (arbitrary units)' }
+                        }
+                    },
+                    plugins: {
+                        tooltip: {
+                            callbacks: {
+                                label: function(context) {
+                                    return `Strength: ${context.parsed.y.toFixed(2)}`;
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+        }
+
+        function updateFieldStrengthChart() {
+            const stop = Math.round((parseFloat(distanceSlider.value) - distanceMin) / distanceStep);
+            distanceValueSpan.textContent = distanceLabels[stop];
+            strengthValueSpan.textContent = fieldCurve.stopLabels[stop];
+
+            fieldStrengthMarker.x = distanceStops[stop];
+            fieldStrengthMarker.y = fieldCurve.stopStrengths[stop];
+            LessonRuntime.drawChart(fieldStrengthView);
+        }
+
+        function updateFieldStrengthCurve() {
+            const k = parseFloat(kSlider.value);
+            kValueSpan.textContent = kSlider.value;
+            const curve = getFieldCurve(k, FIELD_CURVE_MIN, FIELD_CURVE_MAX, FIELD_CURVE_RESOLUTION);
+            if (curve !== fieldCurve) {
+                fieldCurve = curve;
+                fieldStrengthChart.data.datasets[0].data = curve.points;
+            }
+            updateFieldStrengthChart();
+        }
+
+        fieldCurve = getFieldCurve(parseFloat(kSlider.value), FIELD_CURVE_MIN, FIELD_CURVE_MAX, FIELD_CURVE_RESOLUTION);
+        LessonTelemetry.time('chart.build', buildFieldStrengthChart);
+        fieldStrengthView.chart = fieldStrengthChart;
+        // Both sliders are drawn entirely in the browser: the server never reads them, so they are not
+        // reported and dragging them never reruns the page.
+        distanceSlider.addEventListener('input', scheduleOnFrame(updateFieldStrengthChart));
+        kSlider.addEventListener('input', scheduleOnFrame(updateFieldStrengthCurve));
+        updateFieldStrengthChart(); // Initial chart render
+    });
+
+    LessonRuntime.register('electromagnetChart', function(lessonData) {
+        // Electromagnet (the server solves the coil with Biot–Savart for 1 A in air; the current and the
+        // core's gain only scale that solution, so those sliders never wait for the server. The coils
+        // slider reads the table's profile for its stop and the nearest tabled cross-section until the
+        // server's exact solution for that many turns arrives. Only the coils slider is reported, once
+        // when it is let go; dragging never reruns the page.)
+        const currentSlider = document.getElementById('current-slider');
+        const currentValueSpan = document.getElementById('current-value');
+        const coilsSlider = document.getElementById('coils-slider');
+        const coilsValueSpan = document.getElementById('coils-value');
+        const coreSelect = document.getElementById('coil-core');
+        const electromagnetStrengthValueSpan = document.getElementById('electromagnet-strength-value');
+        const coilSolvedSpan = document.getElementById('coil-solved');
+        const coilPointsSpan = document.getElementById('coil-points');
+        const electromagnetChartCtx = document.getElementById('electromagnetChart').getContext('2d');
+        const electromagnetView = LessonRuntime.pausableChart(electromagnetChartCtx.canvas.parentElement);
+        const coilFieldCanvas = document.getElementById('coil-field-canvas');
+        const coilFieldLines = FieldLines.create(coilFieldCanvas, {});
+        const coilCache = new Map(); // turns -> {turns, axis, map, solved, compute}, exact solutions from the server
+        const tableCoils = new Map(); // turns -> the same, from the table
+        const coilFields = new Map(); // map -> its cross-section, prepared by the field worker
+        let coilTable = null;
+        let coil = null; // The coil on screen
+        let shownField = null;
+        let requestedMap = null; // The cross-section the worker is preparing
+        let electromagnetChart;
+
+        function prepareCoil(data) {
+            return {
+                turns: data.turns,
+                axis: FieldLines.decodeFloat32(data.axis),
+                map: `solved:${data.turns}`,
+                solved: data.solved,
+                compute: () => FieldLines.compute('coil', 'prepare', data)
+            };
+        }
+
+        function tableCoil(coils) {
+            let entry = tableCoils.get(coils);
+            if (!entry) {
+                const n = lessonData.coil.resolution;
+                const cells = n * n;
+                const row = coilTable.stop('coils', coils);
+                const mapTurns = coilTable.arrays.mapTurns;
+                let nearest = 0;
+                for (let i = 1; i < mapTurns.length; i++) {
+                    if (Math.abs(mapTurns[i] - coils) < Math.abs(mapTurns[nearest] - coils)) nearest = i;
+                }
+                const coilData = lessonData.coil;
+                const geometry = Object.assign({}, coilData.geometry, { turns: mapTurns[nearest] });
+                entry = {
+                    turns: coils,
+                    axis: coilTable.arrays.axis.subarray(row * n, (row + 1) * n),
+                    map: `table:${nearest}`,
+                    solved: coilTable.arrays.mapSolved[nearest],
+                    compute: () => FieldLines.compute(
+                        'coil',
+                        'unpack',
+                        { source: coilData.source, resolution: n, extent: coilData.extent, geometry: geometry },
+                        coilTable.arrays.mapAngle.subarray(nearest * cells, (nearest + 1) * cells),
+                        coilTable.arrays.mapStrength.subarray(nearest * cells, (nearest + 1) * cells)
+                    )
+                };
+                tableCoils.set(coils, entry);
+            }
+            return entry;
+        }
+
+        function buildElectromagnetChart() {
+            const n = lessonData.coil.resolution;
+            const extent = lessonData.coil.extent;
+            electromagnetChart = new Chart(electromagnetChartCtx, {
+                type: 'line',
+                data: {
+                    labels: Array.from({ length: n }, (_, i) => ((-extent + 2 * extent * i / (n - 1)) * 100).toFixed(1)),
+                    datasets: [{
+                        label: 'Field along the axis (mT)',
+                        data: new Array(n).fill(0),
+                        borderColor: '#005A9C',
+                        backgroundColor: 'rgba(0, 90, 156, 0.1)',
+                        fill: true,
+                        pointRadius: 0,
+                        tension: 0.1
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    animation: false,
+                    scales: {
+                        x: {
+                            title: { display: true, text: 'Position Along the Coil Axis (cm)' },
+                            ticks: { maxTicksLimit: 9 }
+                        },
+                        y: {
+                            beginAtZero: true,
+                            title: { display: true, text: 'Magnetic Field (mT)' }
+                        }
+                    },
+                    plugins: {
+                        legend: {
+                            display: false
+                        }
+                    }
+                }
+            });
+        }
+
+        function showField(field, solved) {
+            if (field !== shownField) {
+                shownField = field;
+                coilFieldLines.setField(field);
+                coilSolvedSpan.textContent = solved;
+                coilPointsSpan.textContent = lessonData.coil.resolution * lessonData.coil.resolution;
+            }
+        }
+
+        // The profile is shown at once; the cross-section follows when the worker has it. A slider that
+        // moves on replaces the job, and frames that keep asking for the same map do not repost it.
+        function showCoil(next) {
+            coil = next;
+            const field = coilFields.get(next.map);
+            if (field) {
+                if (requestedMap !== null) {
+                    requestedMap = null;
+                    FieldLines.cancel('coil');
+                }
+                showField(field, next.solved);
+            } else if (requestedMap !== next.map) {
+                requestedMap = next.map;
+                next.compute().then(prepared => {
+                    if (requestedMap === next.map) {
+                        requestedMap = null;
+                    }
+                    if (prepared === null) return; // Replaced by a newer map
+                    coilFields.set(next.map, prepared);
+                    if (coil.map === next.map) {
+                        showField(prepared, next.solved);
+                    }
+                });
+            }
+        }
+
+        function updateElectromagnetChart() {
+            const current = parseFloat(currentSlider.value);
+            const coils = parseInt(coilsSlider.value);
+            currentValueSpan.textContent = current.toFixed(1);
+            coilsValueSpan.textContent = coils;
+            const next = coilCache.get(coils) || (coilTable && tableCoil(coils));
+            if (next) {
+                showCoil(next);
+            }
+
+            // Without a table, scale the last solution until the server has solved this many turns:
+            // at a fixed length the field grows almost exactly in proportion to the number of turns.
+            const scale = current * lessonData.coil.cores[coreSelect.value] * 1000 * coils / coil.turns; // Tesla to mT
+            const data = electromagnetChart.data.datasets[0].data;
+            for (let i = 0; i < coil.axis.length; i++) {
+                data[i] = coil.axis[i] * scale;
+            }
+            electromagnetStrengthValueSpan.textContent = (coil.axis[coil.axis.length >> 1] * scale).toFixed(2);
+            LessonRuntime.drawChart(electromagnetView);
+        }
+
+        function receiveCoil(data) {
+            const prepared = prepareCoil(data);
+            coilCache.set(data.turns, prepared);
+            if (data.turns === parseInt(coilsSlider.value)) {
+                updateElectromagnetChart();
+            }
+        }
+
+        LessonTelemetry.time('chart.build', buildElectromagnetChart);
+        electromagnetView.chart = electromagnetChart;
+        const firstCoil = prepareCoil(lessonData.coil);
+        coilCache.set(lessonData.coil.turns, firstCoil);
+        showCoil(firstCoil);
+        lessonBridge.onPatch('coil', receiveCoil);
+        requestTable(lessonData, 'coilTable', table => {
+            coilTable = table;
+        });
+        const scheduleElectromagnetUpdate = scheduleOnFrame(updateElectromagnetChart);
+        currentSlider.addEventListener('input', scheduleElectromagnetUpdate);
+        coilsSlider.addEventListener('input', scheduleElectromagnetUpdate);
+        coreSelect.addEventListener('change', scheduleElectromagnetUpdate);
+        // Letting go of the slider asks for the exact solution for its stop.
+        coilsSlider.addEventListener('change', () => lessonBridge.update('coils', parseInt(coilsSlider.value), true));
+        new IntersectionObserver(entries => {
+            if (entries[0].isIntersecting) {
+                coilFieldLines.start();
+            } else {
+                coilFieldLines.stop();
+            }
+        }).observe(coilFieldCanvas);
+        updateElectromagnetChart(); // Initial chart render
+    });
+})();
@@ -0,0 +1,340 @@
+// Particle Lab
+// Plays back charged-particle trajectories integrated on the server (10,000 charges, Boris pusher).
+// Frames arrive as int16 screen coordinates, [frame][particle][2] over +/-extent with -32768 for
+// "off the board". They are not part of the first render: the widget asks for them when it mounts.
+// Under server.py the patch carries only the launch positions (the first frame) and a URL; the server
+// integrates the run when it is fetched and streams it: the body is read chunk by chunk into one
+// preallocated buffer, playback starts with the first chunk and the run's stats (JSON) follow the last
+// frame. Otherwise the patch inlines the frames and stats.
+// Trails fade on their own layer over a static scene layer. Registers the `particleLab` widget.
+(function() {
+    const OUTSIDE = -32768;
+    const FRAMES_PER_SECOND = 24; // Recorded frames played per second
+    const TRAIL_FADE = 'rgba(0, 0, 0, 0.06)';
+    const CHARGE_COLORS = ['#dc2626', '#005A9C']; // Particles alternate positive and negative charge
+    const SCENE_NOTES = {
+        cyclotron: 'B uniform, out of the page',
+        drift: 'B out of the page, stronger to the right →',
+        mirror: 'B along the bottle axis, strongest at its ends'
+    };
+
+    function decodeInt16(base64) {
+        const binary = atob(base64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return new Int16Array(bytes.buffer);
+    }
+
+    function concat(parts) {
+        const joined = new Uint8Array(parts.reduce((total, part) => total + part.length, 0));
+        let offset = 0;
+        for (const part of parts) {
+            joined.set(part, offset);
+            offset += part.length;
+        }
+        return joined;
+    }
+
+    // A run whose `loaded` frames grow as the stream arrives; `onProgress` fires after each chunk and
+    // once more when the stats have arrived.
+    function prepare(data, onProgress) {
+        const run = {
+            scene: data.scene,
+            frames: data.frames,
+            display: data.display,
+            view: data.view,
+            extent: data.extent,
+            bottle: data.bottle,
+            stats: data.stats || null,
+            particles: data.particles,
+            steps: data.steps,
+            positions: null,
+            loaded: 0
+        };
+        if (data.data) {
+            run.positions = decodeInt16(data.data);
+            run.loaded = data.frames;
+            return run;
+        }
+        const frameBytes = data.display * 4;
+        const buffer = new ArrayBuffer(data.frames * frameBytes);
+        const bytes = new Uint8Array(buffer);
+        run.positions = new Int16Array(buffer);
+        if (data.preview) {
+            bytes.set(new Uint8Array(decodeInt16(data.preview).buffer));
+            run.loaded = 1;
+        }
+        let received = 0;
+        const trailer = []; // Bytes after the last frame: the stats
+        fetch(new URL(data.stream, new URL('../../', window.location.href)).href)
+            .then(response => {
+                if (!response.ok) throw new Error(`Particle stream ${response.status}`);
+                const reader = response.body.getReader();
+                function read() {
+                    return reader.read().then(chunk => {
+                        if (chunk.done) {
+                            run.stats = JSON.parse(new TextDecoder().decode(concat(trailer)));
+                            if (onProgress) onProgress(run);
+                            return;
+                        }
+                        const room = Math.min(chunk.value.length, bytes.length - received);
+                        bytes.set(chunk.value.subarray(0, room), received);
+                        if (room < chunk.value.length) trailer.push(chunk.value.subarray(room));
+                        received += room;
+                        run.loaded = Math.max(run.loaded, Math.floor(received / frameBytes));
+                        if (onProgress) onProgress(run);
+                        return read();
+                    });
+                }
+                return read();
+            })
+            .catch(() => {
+                run.failed = true;
+                if (onProgress) onProgress(run);
+            });
+        return run;
+    }
+
+    function create(canvas, options) {
+        const ctx = canvas.getContext('2d');
+        const layer = document.createElement('canvas'); // Scene: axes labels, bottle ends
+        const layerCtx = layer.getContext('2d');
+        const trails = document.createElement('canvas');
+        const trailsCtx = trails.getContext('2d');
+        let run = null;
+        let running = false;
+        let frameRequest = 0;
+        let playhead = 0; // Fractional frame index
+        let lastFrameAt = 0;
+        let shownAt = 0;
+
+        function resize() {
+            const ratio = window.devicePixelRatio || 1;
+            const size = Math.round(canvas.clientWidth * ratio);
+            if (size > 0 && canvas.width !== size) {
+                canvas.width = size;
+                canvas.height = size;
+                layer.width = size;
+                layer.height = size;
+                trails.width = size;
+                trails.height = size;
+                if (run) drawLayer();
+            }
+        }
+
+        function drawLayer() {
+            const size = layer.width;
+            layerCtx.fillStyle = '#fefefe';
+            layerCtx.fillRect(0, 0, size, size);
+            layerCtx.font = `${Math.max(11, size / 45)}px Inter, sans-serif`;
+            layerCtx.fillStyle = '#6b7280';
+            layerCtx.textAlign = 'left';
+            layerCtx.textBaseline = 'top';
+            layerCtx.fillText(SCENE_NOTES[run.scene] || '', size * 0.02, size * 0.02);
+            if (run.bottle) {
+                // The view's horizontal axis is the bottle axis: mark the strong-field ends.
+                layerCtx.strokeStyle = 'rgba(242, 169, 0, 0.9)';
+                layerCtx.lineWidth = Math.max(2, size / 200);
+                layerCtx.setLineDash([size / 60, size / 90]);
+                layerCtx.beginPath();
+                for (const end of [-run.bottle, run.bottle]) {
+                    const x = (end + run.extent) / (2 * run.extent) * size;
+                    layerCtx.moveTo(x, size * 0.1);
+                    layerCtx.lineTo(x, size * 0.9);
+                }
+                layerCtx.stroke();
+                layerCtx.setLineDash([]);
+            }
+        }
+
+        // Screen position of particle i at fractional frame t, written to out; false when off the board.
+        function position(t, i, out) {
+            const positions = run.positions;
+            const n = run.display;
+            const f = Math.min(Math.floor(t), run.loaded - 1);
+            const g = Math.min(f + 1, run.loaded - 1);
+            const a = (f * n + i) * 2;
+            const b = (g * n + i) * 2;
+            if (positions[a] === OUTSIDE || positions[b] === OUTSIDE) return false;
+            const w = t - f;
+            const scale = canvas.width / 65534;
+            out[0] = ((1 - w) * positions[a] + w * positions[b] + 32767) * scale;
+            out[1] = canvas.height - ((1 - w) * positions[a + 1] + w * positions[b + 1] + 32767) * scale;
+            return true;
+        }
+
+        const from = new Float64Array(2);
+        const to = new Float64Array(2);
+
+        function drawTrails(previous, current) {
+            trailsCtx.globalCompositeOperation = 'destination-out';
+            trailsCtx.fillStyle = TRAIL_FADE;
+            trailsCtx.fillRect(0, 0, trails.width, trails.height);
+            trailsCtx.globalCompositeOperation = 'source-over';
+            trailsCtx.lineWidth = Math.max(1, trails.width / 400);
+            for (let charge = 0; charge < 2; charge++) {
+                trailsCtx.strokeStyle = CHARGE_COLORS[charge];
+                trailsCtx.beginPath();
+                for (let i = charge; i < run.display; i += 2) {
+                    if (position(previous, i, from) && position(current, i, to)) {
+                        trailsCtx.moveTo(from[0], from[1]);
+                        trailsCtx.lineTo(to[0], to[1]);
+                    }
+                }
+                trailsCtx.stroke();
+            }
+        }
+
+        // The launch positions, shown while the first frames are still being integrated.
+        function drawPreview() {
+            ctx.drawImage(layer, 0, 0);
+            const dot = Math.max(2, canvas.width / 250);
+            for (let charge = 0; charge < 2; charge++) {
+                ctx.fillStyle = CHARGE_COLORS[charge];
+                for (let i = charge; i < run.display; i += 2) {
+                    if (position(0, i, to)) ctx.fillRect(to[0] - dot / 2, to[1] - dot / 2, dot, dot);
+                }
+            }
+        }
+
+        function frame(now) {
+            if (!running) return;
+            frameRequest = requestAnimationFrame(frame);
+            if (!run || run.loaded < 1) return;
+            if (run.loaded < 2) {
+                drawPreview();
+                return;
+            }
+            const elapsed = lastFrameAt ? Math.min(100, now - lastFrameAt) : 0;
+            lastFrameAt = now;
+            const previous = playhead;
+            // Wait at the edge of what has arrived; loop once the whole run is in.
+            playhead = Math.min(run.loaded - 1, playhead + elapsed / 1000 * FRAMES_PER_SECOND);
+            if (previous === run.frames - 1) {
+                playhead = 0;
+                trailsCtx.clearRect(0, 0, trails.width, trails.height);
+            } else if (playhead > previous) {
+                drawTrails(previous, playhead);
+            }
+            ctx.drawImage(layer, 0, 0);
+            ctx.drawImage(trails, 0, 0);
+            if (shownAt) {
+                options.onFirstFrame(now - shownAt);
+                shownAt = 0;
+            }
+        }
+
+        return {
+            setRun: function(next, requestedAt) {
+                run = next;
+                playhead = 0;
+                lastFrameAt = 0;
+                shownAt = requestedAt || performance.now();
+                resize();
+                drawLayer();
+                trailsCtx.clearRect(0, 0, trails.width, trails.height);
+                if (run.loaded === 1) {
+                    drawPreview();
+                } else {
+                    ctx.drawImage(layer, 0, 0);
+                }
+            },
+            start: function() {
+                if (running) return;
+                running = true;
+                lastFrameAt = 0;
+                resize();
+                frameRequest = requestAnimationFrame(frame);
+            },
+            stop: function() {
+                running = false;
+                cancelAnimationFrame(frameRequest);
+            }
+        };
+    }
+
+    function describe(run) {
+        const stats = run.stats;
+        if (!stats) {
+            return `${run.particles.toLocaleString()} charges × ${run.steps.toLocaleString()} steps: integrating on the server…`
+                + (run.failed ? ' The trajectories could not be loaded; pick the field again to retry.' : '');
+        }
+        let text = `${run.particles.toLocaleString()} charges × ${run.steps.toLocaleString()} steps computed in ${stats.computeMs} ms; `
+            + `speed kept to within ${(stats.speedDrift * 100).toExponential(1)}%.`;
+        if (stats.trapped !== undefined) {
+            text += ` Trapped: ${(stats.trapped * 100).toFixed(1)}% (loss-cone estimate ${(stats.trappedTheory * 100).toFixed(1)}%).`;
+        } else if (run.scene === 'drift') {
+            const positive = stats.displacement.positive[1];
+            const negative = stats.displacement.negative[1];
+            text += ` Average drift: ${positive >= 0 ? '+' : ''}${positive.toFixed(2)} (positive) and ${negative >= 0 ? '+' : ''}${negative.toFixed(2)} (negative) along y.`;
+        }
+        if (run.failed) {
+            text += ' The trajectories could not be loaded; pick the field again to retry.';
+        }
+        return text;
+    }
+
+    window.ParticleLab = { decodeInt16: decodeInt16, prepare: prepare, create: create };
+
+    if (window.LessonRuntime) {
+        LessonRuntime.register('particleLab', function(lessonData) {
+            // Particle Lab (the server integrates every charge; the browser only plays frames back)
+            const sceneSelect = document.getElementById('particle-scene');
+            const canvas = document.getElementById('particle-canvas');
+            const statsLine = document.getElementById('particle-stats');
+            const runCache = new Map(); // scene -> prepared run, so switching back needs no round trip
+            let requestedAt = performance.now();
+            let firstRun = true;
+            const lab = ParticleLab.create(canvas, {
+                onFirstFrame: function(ms) {
+                    LessonTelemetry.record('particles.first_frame', ms);
+                }
+            });
+
+            function showRun(data) {
+                if (firstRun) {
+                    firstRun = false;
+                    sceneSelect.value = data.scene; // The scene the server picked for this session
+                }
+                const run = ParticleLab.prepare(data, progress => {
+                    if (progress.failed) runCache.delete(progress.scene);
+                    if ((progress.failed || progress.stats) && progress.scene === sceneSelect.value) {
+                        statsLine.textContent = describe(progress);
+                    }
+                });
+                runCache.set(data.scene, run);
+                if (data.scene === sceneSelect.value) {
+                    lab.setRun(run, requestedAt);
+                    statsLine.textContent = describe(run);
+                    requestedAt = 0;
+                }
+            }
+
+            lessonBridge.onPatch('particleLab', showRun);
+            if (lessonData.particleLab) {
+                showRun(lessonData.particleLab);
+            }
+            lessonBridge.load('particleLab');
+            sceneSelect.addEventListener('change', () => {
+                const cached = runCache.get(sceneSelect.value);
+                if (cached) {
+                    lab.setRun(cached);
+                    statsLine.textContent = describe(cached);
+                } else {
+                    requestedAt = performance.now();
+                }
+                lessonBridge.update('particleScene', sceneSelect.value, true);
+            });
+
+            new IntersectionObserver(entries => {
+                if (entries[0].isIntersecting) {
+                    lab.start();
+                } else {
+                    lab.stop();
+                }
+            }).observe(canvas);
+        });
+    }
+})();
@@ -0,0 +1,21 @@
+"""Lesson engine: renders any MathCraft lesson from a declarative spec on a shared runtime."""
+
+from lesson_engine.page import get_field_cache, run_lesson
+from lesson_engine.runtime import WIDGETS, runtime_assets
+from lesson_engine.spec import LessonSpec, Section, load_lesson
+from lesson_engine.telemetry import TelemetryCollector, decode_batch, device_class
+from lesson_engine.visualizations import VISUALIZATIONS
+
+__all__ = [
+    "LessonSpec",
+    "Section",
+    "TelemetryCollector",
+    "VISUALIZATIONS",
+    "WIDGETS",
+    "decode_batch",
+    "device_class",
+    "get_field_cache",
+    "load_lesson",
+    "run_lesson",
+    "runtime_assets",
+]
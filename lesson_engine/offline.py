@@ -0,0 +1,38 @@
+"""The lesson's service worker, versioned by the content of everything it precaches.
+
+``sw.js`` is static; ``service_worker_script`` prepends the precache list
+(the lesson component, the shared runtime and the framework assets) and a
+version derived from their content hashes. Any rebuild or runtime change
+yields a new version, which installs alongside the old one and replaces
+its cache on activation.
+"""
+
+import functools
+import hashlib
+import json
+
+from lesson_engine.page import load_assets
+from lesson_engine.runtime import FRONTEND_DIR, WIDGETS, file_hash, runtime_assets
+
+# Where Streamlit serves the lesson component's files, relative to the app root.
+COMPONENT_URL = "component/lesson_component.lesson"
+COMPONENT_FILES = ("index.html", "bridge.js", "telemetry.js", "offline.html")
+
+
+def precache_urls(runtime_url):
+    """URLs, relative to the app root, that a first visit stores for offline and repeat loads."""
+    urls = ["./"] + [f"{COMPONENT_URL}/{name}" for name in COMPONENT_FILES]
+    urls += [asset["href"] for asset in load_assets() + runtime_assets(sorted(WIDGETS), runtime_url)]
+    return urls
+
+
+@functools.lru_cache(maxsize=None)
+def service_worker_script(runtime_url):
+    """The service worker served at the app root, for lessons loading the runtime from ``runtime_url``."""
+    urls = precache_urls(runtime_url)
+    digest = hashlib.sha256()
+    digest.update(json.dumps(urls).encode())
+    for name in COMPONENT_FILES + ("sw.js",):
+        digest.update(file_hash(name).encode())
+    config = {"version": digest.hexdigest()[:12], "precache": urls}
+    return f"const LESSON_OFFLINE = {json.dumps(config)};\n" + (FRONTEND_DIR / "sw.js").read_text(encoding="utf-8")
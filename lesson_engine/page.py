@@ -0,0 +1,228 @@
+"""Run a lesson spec as a Streamlit page.
+
+``run_lesson`` is the page flow every lesson shares: credits, framework and
+runtime assets, quiz services, browser updates, visualization data and the
+progress sidebar. Services are process-wide ``st.cache_resource`` singletons
+and session state is namespaced by lesson, so one server process can serve
+any number of lessons (one page script each).
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+
+import streamlit as st
+
+import lesson_component
+from classroom import DEFAULT_DATABASE, QUIZ_BANKS, AttemptStore, BatchGrader, Reflection
+from lesson_engine.runtime import runtime_assets
+from lesson_engine.spec import load_lesson
+from lesson_engine.telemetry import telemetry_config
+from lesson_engine.visualizations import VISUALIZATIONS, slider_table
+from magnetism import FieldCache
+
+logger = logging.getLogger(__name__)
+
+# --- Framework Assets ---
+# scripts/build_assets.py writes a purged Tailwind stylesheet, Chart.js and the Inter fonts to ./static,
+# which Streamlit serves at app/static/. Without a complete build the lesson falls back to the public CDNs.
+# URLs are relative to the app root; the lesson component loads them once per page.
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+CDN_ASSETS = [
+    {"kind": "script", "href": "https://cdn.tailwindcss.com"},
+    {"kind": "script", "href": "https://cdn.jsdelivr.net/npm/chart.js"},
+    {"kind": "stylesheet", "href": "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;700&display=swap"},
+]
+
+
+def bundle_manifest():
+    """The built bundle's manifest, or ``None`` when there is no build or a file it lists is missing."""
+    manifest_path = STATIC_DIR / "manifest.json"
+    if not manifest_path.exists():
+        return None
+    manifest = json.loads(manifest_path.read_text())
+    missing = [
+        name for name, entry in manifest.items()
+        if not (STATIC_DIR / name).is_file() or (STATIC_DIR / name).stat().st_size != entry["bytes"]
+    ]
+    if missing:
+        logger.warning("Asset bundle is incomplete (%s); run python scripts/build_assets.py", ", ".join(missing))
+        return None
+    return manifest
+
+
+@st.cache_resource
+def load_assets():
+    manifest = bundle_manifest()
+    if manifest is None:
+        return CDN_ASSETS
+
+    def url(name):
+        # The content hash busts browser caches whenever a rebuild changes the file.
+        return f"app/static/{name}?v={manifest[name]['hash']}"
+
+    fonts = [name for name in manifest if name.endswith(".woff2")]
+    # Fonts are preloaded under the same unversioned URL the stylesheet's @font-face rules request.
+    return [{"kind": "font", "href": f"app/static/{name}"} for name in fonts] + [
+        {"kind": "stylesheet", "href": url("css/lesson.min.css")},
+        {"kind": "script", "href": url("vendor/chart.umd.min.js")},
+    ]
+
+
+# --- Shared Services ---
+@st.cache_resource
+def get_lesson(directory):
+    # Specs and section templates are read once per process.
+    return load_lesson(directory)
+
+
+@st.cache_resource
+def get_quiz_services():
+    # One attempt store and grader per server process; every session of every lesson submits through them.
+    DEFAULT_DATABASE.parent.mkdir(parents=True, exist_ok=True)
+    store = AttemptStore(DEFAULT_DATABASE)
+    return store, BatchGrader(store)
+
+
+@st.cache_resource
+def get_field_cache():
+    # One cache per server process, shared by every session.
+    return FieldCache(max_bytes=64 * 1024 * 1024, max_entries=256)
+
+
+# --- Browser Events ---
+# The payload fields (and their types) each event's handler reads. Events come from the browser, so any
+# other type, or a payload without these fields, is ignored rather than trusted.
+EVENT_PAYLOADS = {
+    "quiz_submitted": {"quizId": str, "answers": list},
+    "quiz_retry": {},
+    "reflection_submitted": {"text": str},
+    "study_plan_generated": {"level": str, "time": str},
+}
+
+QUIZ_GRADING_TIMEOUT = 10  # Seconds a rerun waits for the grader before asking the student to try again
+
+
+def valid_event(event):
+    """Whether ``event`` is a known event type whose payload has the fields its handler reads."""
+    fields = EVENT_PAYLOADS.get(event.get("type")) if isinstance(event, dict) else None
+    if fields is None:
+        return False
+    if not fields:
+        return True
+    payload = event.get("payload")
+    return isinstance(payload, dict) and all(isinstance(payload.get(name), kind) for name, kind in fields.items())
+
+
+def run_lesson(directory):
+    """Render the lesson in ``directory`` and return the browser's state for this session."""
+    spec = get_lesson(Path(directory))
+    issue_quiz = QUIZ_BANKS[spec.quiz["bank"]]
+    st.set_page_config(page_title=spec.title, page_icon=spec.page_icon, layout="wide")
+
+    # --- Credits ---
+    for line in spec.credits:
+        st.markdown(line)
+    if spec.credits:
+        st.markdown("---")
+
+    # --- Quiz Services ---
+    attempt_store, quiz_grader = get_quiz_services()
+    session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+    lesson = st.session_state.setdefault(
+        f"{spec.slug}__lesson",
+        {
+            "quiz": issue_quiz(),
+            "quiz_result": None,
+            "quiz_error": None,
+            "progress": {"quiz": None, "reflection": False, "study_plan": None},
+        },
+    )
+    progress = lesson["progress"]
+
+    # --- Browser Updates ---
+    lesson_state, lesson_events = lesson_component.receive(key=spec.slug)
+    student_name = lesson_state.get("studentName", "")
+    class_code = lesson_state.get("classCode", "").upper()
+    for event in filter(valid_event, lesson_events):
+        if event["type"] == "quiz_submitted":
+            quiz = lesson["quiz"]
+            if event["payload"]["quizId"] == quiz.id and lesson["quiz_result"] is None:
+                try:
+                    result = quiz_grader.submit(
+                        quiz, event["payload"]["answers"], session_id, student_name, class_code
+                    ).result(timeout=QUIZ_GRADING_TIMEOUT)
+                except Exception:  # Timed out or failed: the quiz offers "try again" instead of crashing the page
+                    logger.exception("Could not grade quiz %s", quiz.id)
+                    lesson["quiz_error"] = event["id"]  # Changes per submission, so the browser re-renders each failure
+                    continue
+                lesson["quiz_result"] = result
+                lesson["quiz_error"] = None
+                progress["quiz"] = {"correct": result.correct, "total": result.total}
+        elif event["type"] == "quiz_retry":
+            lesson["quiz"] = issue_quiz()
+            lesson["quiz_result"] = None
+            lesson["quiz_error"] = None
+        elif event["type"] == "reflection_submitted":
+            progress["reflection"] = True
+            attempt_store.append([Reflection(
+                uuid.uuid4().hex, session_id, student_name, class_code, time.time(), event["payload"]["text"][:5000]
+            )])
+        elif event["type"] == "study_plan_generated":
+            progress["study_plan"] = event["payload"]
+
+    # --- Lesson Data ---
+    # Spec-derived patches never change, so after the first render their digests match and nothing is resent.
+    field_cache = get_field_cache()
+    quiz_result = lesson["quiz_result"]
+    patches = {
+        "lesson": spec.shell(),
+        "resources": spec.resources,
+        "studyPlan": spec.recommendations,
+        "quiz": {
+            **lesson["quiz"].public(),
+            "result": None if quiz_result is None else {
+                "correct": quiz_result.correct,
+                "total": quiz_result.total,
+                "marks": list(quiz_result.marks),
+            },
+            "error": lesson.get("quiz_error"),
+        },
+    }
+    # Heavy data (a "lazy" visualization, every slider table) stays out of the first render: its widget
+    # asks for it on mounting (lessonBridge.load), so it is computed and sent only for a page that shows it.
+    requested = set(lesson_state.get("load", ()))
+    for name, config in spec.visualizations.items():
+        if not config.get("lazy") or name in requested:
+            patches[name] = VISUALIZATIONS[name](config, lesson_state, field_cache)
+        if "table" in config and f"{name}Table" in requested:
+            patches[f"{name}Table"] = slider_table(name, config, field_cache)
+
+    # --- Render the Lesson ---
+    assets = load_assets() + runtime_assets(spec.widgets, os.environ.get("LESSON_RUNTIME_URL"))
+    telemetry_url = os.environ.get("LESSON_TELEMETRY_URL")
+    lesson_component.render(
+        [(section.id, section.html) for section in spec.sections],
+        patches,
+        assets,
+        height=spec.height,
+        key=spec.slug,
+        telemetry=telemetry_config(telemetry_url) if telemetry_url else None,
+        service_worker=os.environ.get("LESSON_SERVICE_WORKER_URL"),
+    )
+
+    with st.sidebar:
+        st.markdown("### Your Progress")
+        if student_name:
+            st.markdown(f"**{student_name}** {lesson_state.get('avatar', '')}")
+        if progress["quiz"]:
+            st.markdown(f"Quiz: {progress['quiz']['correct']} / {progress['quiz']['total']} correct")
+        st.markdown(f"Reflection: {'submitted' if progress['reflection'] else 'not yet submitted'}")
+        if progress["study_plan"]:
+            st.markdown(f"Study plan: {progress['study_plan']['level'].split(' - ')[0]}, {progress['study_plan']['time']}")
+
+    return lesson_state
@@ -0,0 +1,61 @@
+"""Study-plan recommendations, precomputed for every choice a student can make.
+
+A plan depends on four things: the student's level, their weekly time
+budget, the resource strand they picked and how they did on the quiz.
+Each of these is a small, fixed set in the lesson spec, so every plan is
+composed once when the spec is loaded. The page receives a table of
+distinct steps and a flat array of plans (lists of step indices) and only
+looks plans up; nothing is assembled in the browser.
+"""
+
+import itertools
+
+
+def compose_plan(level, pace, strand, band):
+    """The steps of one plan, each ``{"text", "url"?}``: quiz advice, the level's steps, pace, then the strand's links."""
+    steps = [{"text": band["advice"]}]
+    steps += [{"text": step} for step in level["steps"]]
+    steps.append({"text": pace})
+    steps += [{"text": f"Explore: {link['name']}", "url": link["url"]} for link in strand["links"]]
+    return steps
+
+
+def check_study_plan(study_plan):
+    """Raise ValueError unless the study plan has one pace per time budget and well-ordered quiz bands."""
+    if len(study_plan.get("paces", ())) != len(study_plan["times"]):
+        raise ValueError("The study plan needs one pace per time budget")
+    bands = study_plan.get("quizBands", ())
+    if len(bands) < 2 or bands[0].get("minScore") is not None:
+        raise ValueError("The study plan needs a quiz band for no attempt (minScore null) and at least one more")
+    scores = [band.get("minScore") for band in bands[1:]]
+    if scores[0] != 0 or any(not isinstance(score, (int, float)) for score in scores) or scores != sorted(scores):
+        raise ValueError("Quiz band scores must start at 0 and increase")
+
+
+def build_recommendations(study_plan, strands):
+    """The ``studyPlan`` patch: choices, quiz bands, the distinct steps and the plan for every combination.
+
+    ``plans`` is indexed by ``((level * times + time) * strands + strand) * bands + band``.
+    """
+    strands = strands or [{"name": "", "links": []}]
+    bands = study_plan["quizBands"]
+    steps = []
+    step_ids = {}
+    plans = []
+    for level, pace, strand, band in itertools.product(study_plan["levels"], study_plan["paces"], strands, bands):
+        plan = []
+        for step in compose_plan(level, pace, strand, band):
+            key = (step["text"], step.get("url"))
+            if key not in step_ids:
+                step_ids[key] = len(steps)
+                steps.append(step)
+            plan.append(step_ids[key])
+        plans.append(plan)
+    return {
+        "levels": [{"label": level["label"], "name": level["name"]} for level in study_plan["levels"]],
+        "times": list(study_plan["times"]),
+        "strands": len(strands),
+        "bands": [band["minScore"] for band in bands],
+        "steps": steps,
+        "plans": plans,
+    }
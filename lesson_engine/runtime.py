@@ -0,0 +1,61 @@
+"""The shared browser runtime every lesson loads, versioned for long-lived caching.
+
+The page shell, quiz, reflection, resources and study plan live in
+``runtime.js``; visualization widgets live in ``widgets/`` and are loaded only
+by lessons whose sections use them. Every URL carries a content hash, so all
+lessons request identical URLs and a browser downloads each file once.
+"""
+
+import functools
+import hashlib
+from pathlib import Path
+
+import lesson_component
+
+FRONTEND_DIR = Path(lesson_component.__file__).parent / "frontend"
+
+RUNTIME_FILES = (("stylesheet", "lesson.css"), ("script", "runtime.js"))
+
+# Widgets built into runtime.js.
+CORE_WIDGETS = ("studentInfo", "quiz", "reflection", "resources", "studyPlan")
+
+# Scripts each visualization widget needs, in load order.
+WIDGET_SCRIPTS = {
+    "fieldLines": ("widgets/field-kernels.js", "widgets/fieldlines.js"),
+    "compass": ("widgets/fieldlines.js", "widgets/compass.js"),
+    "fieldStrengthChart": ("widgets/field-kernels.js", "widgets/magnetism-charts.js"),
+    "electromagnetChart": ("widgets/fieldlines.js", "widgets/magnetism-charts.js"),
+    "particleLab": ("widgets/particles.js",),
+}
+
+WIDGETS = frozenset(CORE_WIDGETS) | WIDGET_SCRIPTS.keys()
+
+RUNTIME_PATHS = frozenset(name for _, name in RUNTIME_FILES) | {
+    name for scripts in WIDGET_SCRIPTS.values() for name in scripts
+}
+
+
+@functools.lru_cache(maxsize=None)
+def file_hash(name):
+    """Content hash of a runtime file, read once per process."""
+    return hashlib.sha256((FRONTEND_DIR / name).read_bytes()).hexdigest()[:12]
+
+
+def runtime_assets(widgets, base_url=None):
+    """Asset entries for the shared runtime plus the scripts ``widgets`` need.
+
+    Without ``base_url`` files are fetched from the lesson component itself;
+    ``server.py`` sets one that serves them with immutable cache headers.
+    """
+    files = list(RUNTIME_FILES)
+    for widget in widgets:
+        for name in WIDGET_SCRIPTS.get(widget, ()):
+            if ("script", name) not in files:
+                files.append(("script", name))
+
+    def asset(kind, name):
+        if base_url is None:
+            return {"kind": kind, "href": f"{name}?v={file_hash(name)}", "base": "component"}
+        return {"kind": kind, "href": f"{base_url}/{name}?v={file_hash(name)}"}
+
+    return [asset(kind, name) for kind, name in files]
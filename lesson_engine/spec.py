@@ -0,0 +1,136 @@
+"""Declarative lesson specs.
+
+A lesson is a directory holding ``lesson.json`` and its section templates.
+The spec names the sections in page order (with their navigation label and
+the widgets mounted in each), the quiz bank, the visualization settings, the
+resource strands and the study plans (precomputed here, once per spec). Everything else (page shell, widgets,
+quiz and grading, attempt storage) is shared by every lesson.
+"""
+
+import json
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+
+from classroom.quiz import QUIZ_BANKS
+from lesson_engine.recommend import build_recommendations, check_study_plan
+from lesson_engine.runtime import WIDGETS
+from lesson_engine.visualizations import TABLES, VISUALIZATIONS
+
+SPEC_FILE = "lesson.json"
+
+
+class _RangeInputs(HTMLParser):
+    # Collects <input type="range"> elements, with the defaults browsers apply to missing attributes.
+    def __init__(self):
+        super().__init__()
+        self.sliders = {}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "input" and attrs.get("type") == "range" and attrs.get("id"):
+            low = float(attrs.get("min", 0))
+            high = float(attrs.get("max", 100))
+            self.sliders[attrs["id"]] = {
+                "min": low,
+                "max": high,
+                "step": float(attrs.get("step", 1)),
+                "value": float(attrs.get("value", (low + high) / 2)),
+            }
+
+
+@dataclass(frozen=True)
+class Section:
+    id: str  # The id of the template's <section> element, used for navigation and lazy mounting
+    html: str
+    nav: str = None
+    widgets: tuple = ()
+
+    @property
+    def sliders(self):
+        """The template's range inputs: element id -> ``{"min", "max", "step", "value"}``."""
+        parser = _RangeInputs()
+        parser.feed(self.html)
+        return parser.sliders
+
+
+@dataclass(frozen=True)
+class LessonSpec:
+    slug: str
+    title: str
+    page_icon: str
+    topic: str
+    credits: tuple
+    footer: str
+    height: int
+    sections: tuple
+    quiz: dict
+    visualizations: dict
+    resources: dict
+    study_plan: dict
+    recommendations: dict  # Every study plan, precomputed (see lesson_engine.recommend)
+
+    @property
+    def widgets(self):
+        """Every widget the lesson mounts, in page order."""
+        return tuple(dict.fromkeys(widget for section in self.sections for widget in section.widgets))
+
+    @property
+    def sliders(self):
+        """Every range input in the lesson's sections, as the page offers them (see ``Section.sliders``)."""
+        return {name: slider for section in self.sections for name, slider in section.sliders.items()}
+
+    def shell(self):
+        """What the shared runtime needs to build this lesson's page shell and mount its widgets."""
+        return {
+            "title": self.title,
+            "topic": self.topic,
+            "footer": self.footer,
+            "sections": [{"id": s.id, "nav": s.nav, "widgets": list(s.widgets)} for s in self.sections],
+            "quizFeedback": self.quiz["feedback"],
+        }
+
+
+def load_lesson(directory):
+    """Read and check the lesson in ``directory``; raises ValueError for an inconsistent spec."""
+    directory = Path(directory)
+    raw = json.loads((directory / SPEC_FILE).read_text(encoding="utf-8"))
+
+    sections = []
+    for entry in raw["sections"]:
+        html = (directory / entry["template"]).read_text(encoding="utf-8")
+        if f'id="{entry["id"]}"' not in html:
+            raise ValueError(f"{entry['template']} has no element with id {entry['id']!r}")
+        unknown = set(entry.get("widgets", ())) - WIDGETS
+        if unknown:
+            raise ValueError(f"Section {entry['id']!r} uses unknown widgets {sorted(unknown)}")
+        sections.append(Section(entry["id"], html, entry.get("nav"), tuple(entry.get("widgets", ()))))
+
+    if raw["quiz"]["bank"] not in QUIZ_BANKS:
+        raise ValueError(f"Unknown quiz bank {raw['quiz']['bank']!r}; expected one of {sorted(QUIZ_BANKS)}")
+    unknown = raw.get("visualizations", {}).keys() - VISUALIZATIONS.keys()
+    if unknown:
+        raise ValueError(f"Unknown visualizations {sorted(unknown)}; expected some of {sorted(VISUALIZATIONS)}")
+    tabled = {name for name, config in raw.get("visualizations", {}).items() if "table" in config}
+    if tabled - TABLES.keys():
+        raise ValueError(f"Visualizations {sorted(tabled - TABLES.keys())} have no slider table; expected some of {sorted(TABLES)}")
+
+    resources = raw.get("resources", {"strands": []})
+    study_plan = raw.get("studyPlan", {"levels": [], "times": [], "paces": [], "quizBands": [{"minScore": None}, {"minScore": 0}]})
+    check_study_plan(study_plan)
+
+    return LessonSpec(
+        slug=directory.name,
+        title=raw["title"],
+        page_icon=raw.get("pageIcon", "📘"),
+        topic=raw["topic"],
+        credits=tuple(raw.get("credits", ())),
+        footer=raw.get("footer", ""),
+        height=raw.get("height", 1000),
+        sections=tuple(sections),
+        quiz=raw["quiz"],
+        visualizations=raw.get("visualizations", {}),
+        resources=resources,
+        study_plan=study_plan,
+        recommendations=build_recommendations(study_plan, resources["strands"]),
+    )
@@ -0,0 +1,99 @@
+"""Slider-stop tables: every model output a slider can ask for, packed into one binary blob.
+
+A table is a few named arrays (float32 or uint8) laid end to end, each
+starting on a 4-byte boundary, with a manifest giving each one's dtype,
+shape and byte offset plus the slider stops its axes follow. The browser
+slices typed-array views out of the blob, so a slider move is an index into
+memory it already holds.
+
+Under ``server.py`` (``LESSON_TABLES_URL`` set) a patch carries only the
+manifest and a content-hashed URL (``?v=<digest>``, like the runtime files)
+served with immutable cache headers, so a browser downloads each table once.
+Otherwise the blob is inlined as base64. Either way the page sends a table
+only when its chart mounts and asks for it (``lessonBridge.load``), so the
+first render never carries one.
+"""
+
+import base64
+import gzip
+import hashlib
+import os
+
+import numpy as np
+
+from magnetism.cache import FieldCache
+
+DTYPES = {"float32": "<f4", "uint8": "u1"}
+
+# Content digest -> blob, for every table handed out as a URL.
+_BLOBS = {}
+
+
+def slider_stops(slider):
+    """The values a ``{"min", "max", "step"}`` slider can take, as the browser computes them."""
+    count = int(round((slider["max"] - slider["min"]) / slider["step"])) + 1
+    return slider["min"] + slider["step"] * np.arange(count)
+
+
+def pack_tables(arrays):
+    """``(manifest, blob)`` for a dict of name -> array; arrays must be float32 or uint8."""
+    manifest = {}
+    chunks = []
+    offset = 0
+    for name, array in arrays.items():
+        dtype = next((kind for kind, code in DTYPES.items() if np.dtype(code) == np.asarray(array).dtype), None)
+        if dtype is None:
+            raise ValueError(f"Table {name!r} has dtype {np.asarray(array).dtype}; expected one of {sorted(DTYPES)}")
+        data = np.ascontiguousarray(array, dtype=DTYPES[dtype]).tobytes()
+        manifest[name] = {"dtype": dtype, "shape": list(np.shape(array)), "offset": offset}
+        padding = -len(data) % 4  # Keeps every float32 view aligned
+        chunks.append(data + b"\0" * padding)
+        offset += len(data) + padding
+    return manifest, b"".join(chunks)
+
+
+def table_patch(name, config, cache, build):
+    """The ``table`` entry of a patch: the arrays ``build()`` returns, computed once per process.
+
+    ``config`` is the provider's whole block, which is the cache key, so it
+    must hold everything ``build`` depends on; its ``table`` entry gives the
+    ``sliders`` (name -> ``{"min", "max", "step"}``) and ``budgetBytes``.
+    """
+
+    def compute():
+        manifest, blob = pack_tables(build())
+        return np.frombuffer(blob, dtype=np.uint8).copy(), {
+            "arrays": manifest,
+            "sliders": config["table"]["sliders"],
+            "bytes": len(blob),
+            "budget": config["table"]["budgetBytes"],
+            "digest": hashlib.sha256(blob).hexdigest()[:16],
+        }
+
+    blob, manifest = cache.get_or_compute(FieldCache.key(f"table:{name}", 0, config), compute)
+    url = os.environ.get("LESSON_TABLES_URL")
+    if url:
+        _BLOBS.setdefault(manifest["digest"], blob.tobytes())
+        return {**manifest, "url": f"{url}/{name}.bin?v={manifest['digest']}"}
+    return {**manifest, "data": base64.b64encode(blob.tobytes()).decode("ascii")}
+
+
+def table_blob(digest):
+    """The bytes of a table handed out by ``table_patch``, or ``None``."""
+    return _BLOBS.get(digest)
+
+
+def size_report(table, blob):
+    """Bytes per array, on the wire and against the table's budget."""
+    shapes = {name: entry["shape"] for name, entry in table["arrays"].items()}
+    return {
+        "arrays": {
+            name: int(np.prod(shape)) * np.dtype(DTYPES[table["arrays"][name]["dtype"]]).itemsize
+            for name, shape in shapes.items()
+        },
+        "bytes": len(blob),
+        "base64_bytes": len(base64.b64encode(blob)),
+        "gzip_bytes": len(gzip.compress(blob, 9)),
+        "budget_bytes": table["budget"],
+        "within_budget": len(blob) <= table["budget"],
+    }
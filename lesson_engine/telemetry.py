@@ -0,0 +1,172 @@
+"""Aggregate performance telemetry from students' browsers.
+
+``telemetry.js`` keeps one histogram per metric in the page and sends the
+counts, gzip-compressed, at most once every ``FLUSH_INTERVAL_S`` seconds.
+Plain counters (frames drawn, frames dropped) travel alongside. The
+collector merges those batches into histograms per device class, so
+memory depends on the number of metrics and device classes, never on how
+many samples or students report. Bucket bounds are sent to the page with
+each render and are the only contract between the two sides.
+"""
+
+import gzip
+import io
+import json
+import re
+import threading
+import time
+
+# Upper bucket bounds in milliseconds; a last bucket counts everything slower.
+HISTOGRAM_BOUNDS_MS = (1, 2, 4, 8, 12, 16, 24, 33, 50, 75, 100, 150, 250, 500, 1000, 2000, 4000, 8000)
+
+FLUSH_INTERVAL_S = 30
+
+MAX_BATCH_BYTES = 64 * 1024  # Compressed and decompressed
+MAX_METRICS = 128  # Distinct metric names kept per device class; later names are dropped
+METRIC_NAME = re.compile(r"[a-z0-9_.]{1,64}")
+
+
+def telemetry_config(url):
+    """What the page needs to start reporting to the collector at ``url`` (relative to the app root)."""
+    return {"url": url, "interval": FLUSH_INTERVAL_S, "bounds": list(HISTOGRAM_BOUNDS_MS)}
+
+
+def device_class(device):
+    """Coarse device class such as ``phone-low`` from the capabilities the page reports."""
+    cores = device.get("cores") or 0
+    memory = device.get("memory") or 0  # GiB, Chromium only
+    width = device.get("width") or 0
+    if device.get("coarse"):
+        form = "phone" if width and width < 768 else "tablet"
+    else:
+        form = "desktop"
+    if (cores and cores <= 2) or (memory and memory <= 2):
+        tier = "low"
+    elif cores >= 8 and (not memory or memory >= 8):
+        tier = "high"
+    else:
+        tier = "mid"
+    return f"{form}-{tier}"
+
+
+def decode_batch(body, encoding=None):
+    """Parse a request body into ``(device_class, metrics, counters)``; raises ValueError if malformed."""
+    if len(body) > MAX_BATCH_BYTES:
+        raise ValueError("Telemetry batch is too large.")
+    if encoding == "gzip":
+        try:
+            decompressor = gzip.GzipFile(fileobj=io.BytesIO(body))
+            body = decompressor.read(MAX_BATCH_BYTES + 1)
+        except (OSError, EOFError) as error:
+            raise ValueError("Telemetry batch is not valid gzip.") from error
+        if len(body) > MAX_BATCH_BYTES:
+            raise ValueError("Telemetry batch is too large.")
+    elif encoding not in (None, "identity"):
+        raise ValueError(f"Unsupported encoding {encoding}")
+    try:
+        batch = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError("Telemetry batch is not valid JSON.") from error
+    if (
+        not isinstance(batch, dict)
+        or not isinstance(batch.get("device"), dict)
+        or not isinstance(batch.get("metrics"), dict)
+        or not isinstance(batch.get("counters", {}), dict)
+    ):
+        raise ValueError("Telemetry batch needs a device, metrics and counters.")
+
+    device = {key: batch["device"].get(key) for key in ("cores", "memory", "width", "coarse")}
+    for key in ("cores", "memory", "width"):
+        if not isinstance(device[key], (int, float)) or isinstance(device[key], bool):
+            device[key] = 0
+
+    buckets = len(HISTOGRAM_BOUNDS_MS) + 1
+    metrics = {}
+    for name, histogram in list(batch["metrics"].items())[:MAX_METRICS]:
+        counts = histogram.get("counts") if isinstance(histogram, dict) else None
+        if (
+            not METRIC_NAME.fullmatch(name)
+            or not isinstance(counts, list)
+            or len(counts) != buckets
+            or not all(isinstance(count, int) and count >= 0 for count in counts)
+            or not isinstance(histogram.get("sum"), (int, float))
+        ):
+            raise ValueError(f"Malformed histogram for {name!r}.")
+        metrics[name] = (counts, float(histogram["sum"]))
+
+    counters = {}
+    for name, value in list(batch.get("counters", {}).items())[:MAX_METRICS]:
+        if not METRIC_NAME.fullmatch(name) or not isinstance(value, int) or value < 0:
+            raise ValueError(f"Malformed counter {name!r}.")
+        counters[name] = value
+    return device_class(device), metrics, counters
+
+
+class TelemetryCollector:
+    """Thread-safe histograms keyed by device class and metric."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._classes = {}  # device class -> metric -> [counts, sum]
+        self._counters = {}  # device class -> counter -> total
+        self._batches = 0
+        self._started = time.time()
+
+    def ingest(self, device, metrics, counters=None):
+        with self._lock:
+            self._batches += 1
+            histograms = self._classes.setdefault(device, {})
+            for name, (counts, total) in metrics.items():
+                if name not in histograms:
+                    if len(histograms) >= MAX_METRICS:
+                        continue
+                    histograms[name] = [[0] * len(counts), 0.0]
+                histogram = histograms[name]
+                for bucket, count in enumerate(counts):
+                    histogram[0][bucket] += count
+                histogram[1] += total
+            totals = self._counters.setdefault(device, {})
+            for name, value in (counters or {}).items():
+                if name in totals or len(totals) < MAX_METRICS:
+                    totals[name] = totals.get(name, 0) + value
+
+    def snapshot(self):
+        """Histograms with their sample count, mean and approximate p50/p95 (bucket upper bounds)."""
+        with self._lock:
+            classes = {
+                device: {name: (list(counts), total) for name, (counts, total) in histograms.items()}
+                for device, histograms in self._classes.items()
+            }
+            counters = {device: dict(totals) for device, totals in self._counters.items()}
+            batches = self._batches
+        return {
+            "since": self._started,
+            "batches": batches,
+            "bounds_ms": list(HISTOGRAM_BOUNDS_MS),
+            "devices": {
+                device: {name: _summarize(counts, total) for name, (counts, total) in sorted(histograms.items())}
+                for device, histograms in sorted(classes.items())
+            },
+            "counters": {device: dict(sorted(totals.items())) for device, totals in sorted(counters.items())},
+        }
+
+
+def _quantile(counts, q):
+    target = q * sum(counts)
+    seen = 0
+    for bucket, count in enumerate(counts):
+        seen += count
+        if count and seen >= target:
+            return HISTOGRAM_BOUNDS_MS[bucket] if bucket < len(HISTOGRAM_BOUNDS_MS) else None
+    return None
+
+
+def _summarize(counts, total):
+    n = sum(counts)
+    return {
+        "n": n,
+        "mean": round(total / n, 2) if n else None,
+        "p50_le": _quantile(counts, 0.50),
+        "p95_le": _quantile(counts, 0.95),
+        "counts": counts,
+    }
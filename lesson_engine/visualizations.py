@@ -0,0 +1,274 @@
+"""Server-computed data behind the visualization widgets.
+
+Each provider takes its block from the lesson spec, the browser state and the
+process-wide ``FieldCache`` and returns the data patch its widget reads. Only
+the selected field-line source, compass scene or coil is sampled and sent; the
+browser keeps the ones it has already seen.
+
+Blocks with a ``table`` entry also get a ``<name>Table`` patch holding the
+model's output at every slider stop (see ``lesson_engine.tables``). It never
+changes, so it is sent once however often the visualization's own patch is.
+
+The particle lab's trajectories are frames of int16 screen coordinates. Under
+``server.py`` (``PARTICLE_STREAM_URL`` set) the patch carries a URL and only
+the run's first frame, which costs no integration; ``particle_stream`` runs
+the Boris pusher when the browser fetches the URL and streams the frames in
+chunks, then the run's stats, so neither the rerun nor the canvas waits for
+the whole run. Otherwise the frames and stats are inlined.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from lesson_engine.tables import slider_stops, table_patch
+from magnetism.cache import FieldCache
+from magnetism.coils import CORE_MATERIALS, coil_table, effective_permeability
+from magnetism.encoding import pack_float32, quantize_directions, quantize_int16
+from magnetism.fields import field_strength
+from magnetism.particles import PARTICLE_FIELDS, boris_push, launch
+
+
+def _field_curve_table(config, cache):
+    sliders = config["table"]["sliders"]
+    ks = slider_stops(sliders["k"])[:, None]
+    xs = np.linspace(config["min"], config["max"], config["resolution"])
+    return {
+        "strength": field_strength(slider_stops(sliders["distance"])[None, :], ks).astype(np.float32),
+        "curves": field_strength(xs[None, :], ks).astype(np.float32),
+    }
+
+
+def field_curve(config, state, cache):
+    _, strengths = cache.evaluate(
+        "inverse_square", config["resolution"], k=config["k"], start=config["min"], stop=config["max"]
+    )
+    return {**config, "ys": np.round(strengths, 6).tolist()}
+
+
+def field_lines(config, state, cache):
+    source = state.get("fieldLineSource", config["default"])
+    if source not in config["sources"]:
+        source = config["default"]
+    entry = config["sources"][source]
+    bx, by = cache.evaluate(entry["model"], config["resolution"], extent=config["extent"], **entry["params"])
+    return {
+        "source": source,
+        "model": entry["model"],
+        "params": entry["params"],
+        "resolution": config["resolution"],
+        "extent": config["extent"],
+        "geometry": entry["geometry"],
+        "bx": pack_float32(bx),
+        "by": pack_float32(by),
+    }
+
+
+def compass(config, state, cache):
+    scenario = state.get("compassScenario", config["default"])
+    if scenario not in config["scenes"]:
+        scenario = config["default"]
+    sources = config["scenes"][scenario]
+    bx, by = cache.evaluate(
+        "superposition",
+        config["resolution"],
+        extent=config["extent"],
+        sources=[(source["kind"], {k: v for k, v in source.items() if k != "kind"}) for source in sources],
+    )
+    return {
+        "scenario": scenario,
+        "resolution": config["resolution"],
+        "extent": config["extent"],
+        "position": config["start"],
+        "sources": sources,
+        "bx": pack_float32(bx),
+        "by": pack_float32(by),
+    }
+
+
+def _core_gains(config):
+    return [float(effective_permeability(CORE_MATERIALS[name], config["length"], config["radius"])) for name in config["cores"]]
+
+
+def _coil_table(config, cache):
+    sliders = config["table"]["sliders"]
+    geometry = {"extent": config["extent"], "length": config["length"], "radius": config["radius"]}
+    turns = slider_stops(sliders["coils"]).astype(int)
+    # Profiles for 1 A in air, like the coil patch: current and core are exact factors the browser applies.
+    _, axis_bx, _, _ = coil_table(turns, config["resolution"], maps=False, **geometry)
+    # Cross-sections at a few turn counts; their field-line pattern barely changes in between.
+    map_turns = config["table"]["mapTurns"]
+    angles, strengths, solved = [], [], []
+    for count in map_turns:
+        _, _, bx, by, evaluated = cache.evaluate("coil", config["resolution"], turns=count, **geometry)
+        angle, strength = quantize_directions(bx, by)
+        angles.append(angle)
+        strengths.append(strength)
+        solved.append(evaluated.sum())
+    return {
+        "axis": axis_bx.astype(np.float32),
+        "mapTurns": np.array(map_turns, dtype=np.float32),
+        "mapSolved": np.array(solved, dtype=np.float32),
+        "mapAngle": np.stack(angles),
+        "mapStrength": np.stack(strengths),
+    }
+
+
+def coil(config, state, cache):
+    turns = state.get("coils", config["turns"])
+    if not isinstance(turns, int) or not 1 <= turns <= config["maxTurns"]:
+        turns = config["turns"]
+    geometry = {"turns": turns, "length": config["length"], "radius": config["radius"]}
+    x, axis_bx, bx, by, evaluated = cache.evaluate("coil", config["resolution"], extent=config["extent"], **geometry)
+    # Fields are for 1 A through an air core; the browser scales them by the current and the core's gain.
+    return {
+        "turns": turns,
+        "resolution": config["resolution"],
+        "extent": config["extent"],
+        "source": "solenoid",
+        "geometry": {**geometry, "wire": config["wire"]},
+        "cores": {name: round(gain, 3) for name, gain in zip(config["cores"], _core_gains(config))},
+        "solved": int(evaluated.sum()),
+        "axis": pack_float32(axis_bx),
+        "bx": pack_float32(bx),
+        "by": pack_float32(by),
+    }
+
+
+# --- Particle lab ---
+
+# Stream digest -> the run it names; filled as the provider hands out stream URLs.
+_PARTICLE_RUNS = {}
+
+
+def _particle_stats(scene, position, velocity, final_position, final_velocity, q_over_m):
+    speed = np.linalg.norm(velocity, axis=1)
+    drift = np.abs(np.linalg.norm(final_velocity, axis=1) - speed) / speed
+    displacement = final_position - position
+    stats = {
+        "speedDrift": float(drift.max()),
+        "displacement": {
+            sign: np.round(displacement[q_over_m * factor > 0].mean(axis=0), 4).tolist()
+            for sign, factor in (("positive", 1.0), ("negative", -1.0))
+        },
+    }
+    bottle = scene.get("bottle")
+    if bottle is not None:
+        # Loss cone of an isotropic launch: only pitch angles with sin^2 > 1/R stay trapped.
+        length = scene["field"].get("length", 1.0)
+        ratio = 1.0 + (bottle / length) ** 2
+        stats["trapped"] = float(np.mean(np.abs(final_position[:, 2]) <= bottle))
+        stats["trappedTheory"] = float(np.sqrt(1.0 - 1.0 / ratio))
+    return stats
+
+
+def _particle_run(run, cache):
+    """``(frames, stats)`` for one scene; frames are ``(frame, particle, 2)`` int16 in the scene's view."""
+
+    def compute():
+        scene = run["scene"]
+        position, velocity, q_over_m = launch(run["particles"], seed=run["seed"], **scene["launch"])
+        model = scene["model"]
+        field = PARTICLE_FIELDS[model]
+        params = scene["field"]
+        started = time.perf_counter()
+        frames, final_position, final_velocity = boris_push(
+            position,
+            velocity,
+            q_over_m,
+            lambda x, y, z: field(x, y, z, **params),
+            scene["dt"],
+            run["steps"],
+            run["recordEvery"],
+            run["display"],
+        )
+        elapsed = time.perf_counter() - started
+        axes = ["xyz".index(axis) for axis in scene["view"]]
+        stats = _particle_stats(scene, position, velocity, final_position, final_velocity, q_over_m)
+        stats["computeMs"] = round(elapsed * 1000.0, 1)
+        return quantize_int16(frames[:, :, axes], scene["extent"]), stats
+
+    return cache.get_or_compute(FieldCache.key("particles", run["particles"], run), compute)
+
+
+def _particle_preview(run):
+    """The run's first frame, straight from the launch: what ``_particle_run`` records before any step."""
+    scene = run["scene"]
+    position, _, _ = launch(run["particles"], seed=run["seed"], **scene["launch"])
+    axes = ["xyz".index(axis) for axis in scene["view"]]
+    first = position[None, :run["display"], axes].astype(np.float32)
+    return quantize_int16(first, scene["extent"])
+
+
+def particle_stream(digest, cache):
+    """Chunks for a run handed out by ``particle_lab``, or ``None`` for an unknown digest.
+
+    The run is integrated (or read from ``cache``) when the first chunk is
+    requested. The int16 frames come ``chunkFrames`` at a time, followed by
+    the run's stats as one JSON chunk.
+    """
+    run = _PARTICLE_RUNS.get(digest)
+    if run is None:
+        return None
+
+    def chunks():
+        frames, stats = _particle_run(run, cache)
+        for start in range(0, len(frames), run["chunkFrames"]):
+            yield frames[start:start + run["chunkFrames"]].tobytes()
+        yield json.dumps(stats).encode()
+
+    return chunks()
+
+
+def particle_lab(config, state, cache):
+    name = state.get("particleScene", config["default"])
+    if name not in config["scenes"]:
+        name = config["default"]
+    scene = config["scenes"][name]
+    run = {key: config[key] for key in ("particles", "steps", "recordEvery", "display", "chunkFrames", "seed")}
+    run["scene"] = scene
+    patch = {
+        "scene": name,
+        "frames": config["steps"] // config["recordEvery"] + 1,
+        "display": min(config["display"], config["particles"]),
+        "particles": config["particles"],
+        "steps": config["steps"],
+        "view": scene["view"],
+        "extent": scene["extent"],
+        "bottle": scene.get("bottle"),
+    }
+    stream_url = os.environ.get("PARTICLE_STREAM_URL")
+    if stream_url:
+        # The rerun only launches the particles; the stream integrates them.
+        digest = hashlib.sha256(json.dumps(run, sort_keys=True).encode()).hexdigest()[:16]
+        _PARTICLE_RUNS[digest] = run
+        patch["stream"] = f"{stream_url}/{digest}"
+        patch["chunkFrames"] = config["chunkFrames"]
+        patch["preview"] = base64.b64encode(_particle_preview(run).tobytes()).decode("ascii")
+    else:
+        frames, stats = _particle_run(run, cache)
+        patch["stats"] = stats
+        patch["data"] = base64.b64encode(frames.tobytes()).decode("ascii")
+    return patch
+
+
+def slider_table(name, config, cache):
+    """The ``<name>Table`` patch for a visualization block with a ``table`` entry."""
+    return table_patch(name, config, cache, lambda: TABLES[name](config, cache))
+
+
+# Patch name -> provider; a lesson spec's "visualizations" block is keyed the same way.
+VISUALIZATIONS = {
+    "fieldCurve": field_curve,
+    "fieldLines": field_lines,
+    "compass": compass,
+    "coil": coil,
+    "particleLab": particle_lab,
+}
+
+# Visualizations whose slider stops can be precomputed -> table builder; see lesson_engine/tables.py.
+TABLES = {"fieldCurve": _field_curve_table, "coil": _coil_table}
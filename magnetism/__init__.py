@@ -0,0 +1,51 @@
+"""Physics engine behind the MathCraft: The Math of Magnetism lesson."""
+
+from magnetism.cache import FIELD_MODELS, CacheStats, FieldCache
+from magnetism.coils import CORE_MATERIALS, coil_maps, coil_table, effective_permeability
+from magnetism.fields import (
+    MU_0,
+    bar_magnet_field,
+    biot_savart,
+    dipole_field,
+    dipole_grid,
+    electromagnet_strength,
+    field_strength,
+    grid,
+    helix,
+    solenoid_axis_field,
+    solenoid_plane_field,
+    superposed_field,
+    uniform_field,
+    wire_field,
+)
+from magnetism.particles import PARTICLE_FIELDS, boris_push, gradient_b, launch, mirror_b, uniform_b
+
+__all__ = [
+    "CORE_MATERIALS",
+    "FIELD_MODELS",
+    "CacheStats",
+    "FieldCache",
+    "MU_0",
+    "PARTICLE_FIELDS",
+    "bar_magnet_field",
+    "biot_savart",
+    "boris_push",
+    "coil_maps",
+    "coil_table",
+    "dipole_field",
+    "dipole_grid",
+    "effective_permeability",
+    "electromagnet_strength",
+    "field_strength",
+    "gradient_b",
+    "grid",
+    "helix",
+    "launch",
+    "mirror_b",
+    "solenoid_axis_field",
+    "solenoid_plane_field",
+    "superposed_field",
+    "uniform_b",
+    "uniform_field",
+    "wire_field",
+]
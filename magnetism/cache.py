@@ -0,0 +1,161 @@
+"""Process-wide LRU cache for sampled field models.
+
+Every widget interaction reruns app.py, and a classroom of students tends to
+request the same handful of configurations, so sampled grids are memoized on
+``(model, parameters, resolution)`` and shared by all sessions in the process.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from magnetism import coils, fields
+
+
+def _inverse_square(resolution, k=100.0, start=1.0, stop=10.0):
+    distances = np.linspace(start, stop, resolution)
+    return distances, fields.field_strength(distances, k)
+
+
+def _dipole(resolution, extent=2.0, moment=1.0):
+    return fields.dipole_grid(resolution, extent, moment)
+
+
+def _wire(resolution, extent=2.0, current=1.0):
+    x, y = fields.grid(resolution, extent)
+    return fields.wire_field(x, y, current)
+
+
+def _bar_magnet(resolution, extent=2.0, length=1.0, strength=1.0):
+    x, y = fields.grid(resolution, extent)
+    return fields.bar_magnet_field(x, y, length, strength)
+
+
+def _superposition(resolution, extent=2.0, sources=()):
+    x, y = fields.grid(resolution, extent)
+    return fields.superposed_field(x, y, sources)
+
+
+def _solenoid_plane(resolution, extent=2.0, current=1.0, turns=10, length=2.0, radius=0.5):
+    x, y = fields.grid(resolution, extent)
+    return fields.solenoid_plane_field(x, y, current, turns, length, radius)
+
+
+def _solenoid_axis(resolution, extent=0.2, current=1.0, turns=10, length=0.1, radius=0.02, relative_permeability=1.0):
+    z = np.linspace(-extent, extent, resolution)
+    return z, fields.solenoid_axis_field(z, current, turns, length, radius, relative_permeability)
+
+
+def _coil(resolution, extent=0.08, turns=10, length=0.1, radius=0.02):
+    return coils.coil_maps(resolution, extent, turns, length, radius)
+
+
+FIELD_MODELS = {
+    "inverse_square": _inverse_square,
+    "dipole": _dipole,
+    "bar_magnet": _bar_magnet,
+    "wire": _wire,
+    "superposition": _superposition,
+    "solenoid_plane": _solenoid_plane,
+    "solenoid_axis": _solenoid_axis,
+    "coil": _coil,
+}
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+def _hashable(value):
+    # Model parameters may nest dicts and lists (e.g. the sources of a superposition).
+    if isinstance(value, dict):
+        return tuple(sorted((name, _hashable(item)) for name, item in value.items()))
+    if isinstance(value, (tuple, list)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+def _freeze(value):
+    # Cached arrays are handed to every session, so nobody may write to them.
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class FieldCache:
+    """Thread-safe LRU cache bounded by entry count and total array bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(model, resolution, params):
+        return model, int(resolution), _hashable(params)
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        # Compute outside the lock so one slow grid does not stall every other session.
+        value = _freeze(compute())
+        size = _nbytes(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._nbytes += size
+                self._evict()
+        return value
+
+    def evaluate(self, model, resolution, **params):
+        """Sample ``model`` from ``FIELD_MODELS`` at ``resolution``, reusing a cached result when possible."""
+        if model not in FIELD_MODELS:
+            raise ValueError(f"Unknown field model {model!r}; expected one of {sorted(FIELD_MODELS)}")
+        return self.get_or_compute(
+            self.key(model, resolution, params),
+            lambda: FIELD_MODELS[model](int(resolution), **params),
+        )
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._nbytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._nbytes -= size
+            self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._nbytes)
@@ -0,0 +1,44 @@
+"""Compact encodings for shipping sampled fields to the browser."""
+
+import base64
+
+import numpy as np
+
+
+def pack_float32(array):
+    """Base64 of the array as little-endian float32, in C order; decode with ``new Float32Array(...)``."""
+    return base64.b64encode(np.ascontiguousarray(array, dtype="<f4").tobytes()).decode("ascii")
+
+
+INT16_OUTSIDE = -32768
+
+
+def quantize_int16(array, extent):
+    """Little-endian int16 with ``[-extent, extent]`` mapped to ``[-32767, 32767]`` and anything else to ``INT16_OUTSIDE``."""
+    array = np.asarray(array, dtype=np.float64)
+    inside = np.isfinite(array) & (np.abs(array) <= extent)
+    scaled = np.rint(np.where(inside, array, 0.0) * (32767.0 / extent))
+    return np.where(inside, scaled, INT16_OUTSIDE).astype("<i2")
+
+
+def quantize_directions(bx, by):
+    """A 2D field as two uint8 arrays: its direction in 256ths of a turn and its strength.
+
+    Strength is the log magnitude between its 5th and 95th percentiles,
+    scaled to 0-255: the same normalization the field-line renderer applies to
+    float grids, at an eighth of their size. A field with no finite, nonzero
+    sample (an empty grid, or one that is zero everywhere) encodes as zeros.
+    """
+    bx = np.asarray(bx, dtype=np.float64)
+    by = np.asarray(by, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.log(np.hypot(bx, by))
+    finite = np.sort(logs[np.isfinite(logs)])
+    if finite.size == 0:
+        zeros = np.zeros(np.broadcast(bx, by).shape, dtype=np.uint8)
+        return zeros, zeros.copy()
+    angle = np.rint(np.arctan2(by, bx) * (128.0 / np.pi)).astype(np.int64) % 256
+    low = finite[int(len(finite) * 0.05)]
+    spread = finite[int(len(finite) * 0.95)] - low or 1.0
+    strength = np.where(np.isfinite(logs), np.clip((logs - low) / spread, 0.0, 1.0), 0.0)
+    return angle.astype(np.uint8), np.rint(strength * 255.0).astype(np.uint8)
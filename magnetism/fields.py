@@ -0,0 +1,187 @@
+"""Vectorized magnetic-field models used by the lesson visualizations.
+
+Every function takes NumPy arrays (or scalars) and evaluates the whole input in
+one call. Lengths are in metres, currents in amperes and fields in tesla,
+except for the two classroom models: ``field_strength`` keeps the lesson's
+arbitrary units and ``electromagnet_strength`` is in millitesla, as the
+electromagnet chart shows it.
+"""
+
+import numpy as np
+
+MU_0 = 4e-7 * np.pi
+
+# Number of (point, segment) pairs handled per Biot–Savart block, which keeps the
+# (points x segments) intermediate arrays to a few megabytes each.
+_BIOT_SAVART_PAIRS = 1 << 20
+
+
+def field_strength(distance, k=100.0):
+    """Inverse-square field strength ``k / r**2`` used by the distance slider."""
+    distance = np.asarray(distance, dtype=np.float64)
+    return k / (distance * distance)
+
+
+def electromagnet_strength(current, coils, length=0.1, radius=0.02):
+    """Field at the centre of the lesson's air-core electromagnet in mT: ``mu_0 N I / sqrt(L**2 + 4 R**2)``.
+
+    This is ``solenoid_axis_field`` at ``z = 0`` for the chart's coil (10 cm
+    long, 2 cm in radius), whose Biot–Savart solution it matches to 0.2%.
+    """
+    current = np.asarray(current, dtype=np.float64)
+    coils = np.asarray(coils, dtype=np.float64)
+    return 1e3 * MU_0 * current * coils / np.sqrt(length * length + 4.0 * radius * radius)
+
+
+def grid(resolution, extent):
+    """Square ``resolution x resolution`` sample grid covering ``[-extent, extent]``."""
+    axis = np.linspace(-extent, extent, resolution)
+    return np.meshgrid(axis, axis)
+
+
+def dipole_field(x, y, moment=1.0):
+    """In-plane field ``(Bx, By)`` of a point dipole at the origin pointing along +y.
+
+    This is the cartesian form of ``B_r = 2 m cos(theta) / r**3`` and
+    ``B_theta = m sin(theta) / r**3`` (with ``mu_0 / 4 pi`` folded into ``m``).
+    The singular point at the origin is returned as zero.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    r2 = x * x + y * y
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_r5 = np.where(r2 > 0.0, r2 ** -2.5, 0.0)
+    bx = 3.0 * moment * x * y * inv_r5
+    by = moment * (3.0 * y * y - r2) * inv_r5
+    return bx, by
+
+
+def dipole_grid(resolution=256, extent=2.0, moment=1.0):
+    """Dipole field sampled on a square grid; returns ``(bx, by)`` arrays."""
+    x, y = grid(resolution, extent)
+    return dipole_field(x, y, moment)
+
+
+def uniform_field(x, y, bx=0.0, by=0.0):
+    """A uniform in-plane field, e.g. the horizontal part of Earth's field (+y is north)."""
+    shape = np.broadcast(np.asarray(x), np.asarray(y)).shape
+    return np.full(shape, float(bx)), np.full(shape, float(by))
+
+
+def bar_magnet_field(x, y, length=1.0, strength=1.0, x0=0.0, y0=0.0):
+    """In-plane field of a bar magnet parallel to the x axis, modelled as two opposite poles.
+
+    The magnet is centred on ``(x0, y0)`` with its north pole at
+    ``x0 + length / 2`` (a negative ``strength`` swaps the poles); each pole
+    contributes ``strength * r / |r|**3``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64) - y0
+    bx = np.zeros(np.broadcast(x, y).shape)
+    by = np.zeros_like(bx)
+    for pole_x, sign in ((x0 + length / 2.0, 1.0), (x0 - length / 2.0, -1.0)):
+        dx = x - pole_x
+        r2 = dx * dx + y * y
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(r2 > 0.0, sign * strength * r2 ** -1.5, 0.0)
+        bx += dx * scale
+        by += y * scale
+    return bx, by
+
+
+def wire_field(x, y, current=1.0, x0=0.0, y0=0.0):
+    """In-plane field of an infinite straight wire through ``(x0, y0)``.
+
+    Positive current flows out of the page, so the field circulates
+    counter-clockwise (right-hand rule).
+    """
+    dx = np.asarray(x, dtype=np.float64) - x0
+    dy = np.asarray(y, dtype=np.float64) - y0
+    r2 = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(r2 > 0.0, MU_0 * current / (2.0 * np.pi * r2), 0.0)
+    return -dy * scale, dx * scale
+
+
+_PLANAR_SOURCES = {
+    "uniform": uniform_field,
+    "bar_magnet": bar_magnet_field,
+    "wire": wire_field,
+}
+
+
+def superposed_field(x, y, sources):
+    """Sum of in-plane fields from ``sources``, a sequence of ``(kind, params)`` pairs.
+
+    ``kind`` is one of ``"uniform"``, ``"bar_magnet"`` or ``"wire"`` and
+    ``params`` holds the keyword arguments of the matching ``*_field`` function.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    bx = np.zeros(np.broadcast(x, y).shape)
+    by = np.zeros_like(bx)
+    for kind, params in sources:
+        if kind not in _PLANAR_SOURCES:
+            raise ValueError(f"Unknown field source {kind!r}; expected one of {sorted(_PLANAR_SOURCES)}")
+        source_bx, source_by = _PLANAR_SOURCES[kind](x, y, **params)
+        bx += source_bx
+        by += source_by
+    return bx, by
+
+
+def solenoid_axis_field(z, current=1.0, turns=10, length=0.1, radius=0.02, relative_permeability=1.0):
+    """Field along the axis of a finite solenoid centred on ``z = 0``."""
+    z = np.asarray(z, dtype=np.float64)
+    n = turns / length
+    front = z + length / 2.0
+    back = z - length / 2.0
+    return 0.5 * MU_0 * relative_permeability * n * current * (
+        front / np.sqrt(front * front + radius * radius) - back / np.sqrt(back * back + radius * radius)
+    )
+
+
+def biot_savart(path, points, current=1.0):
+    """Field at ``points`` (shape ``(P, 3)``) from current along a polyline ``path`` (shape ``(M, 3)``).
+
+    Each straight segment is treated as a current element at its midpoint, so
+    the path should be sampled finely compared to the distance to the points.
+    """
+    path = np.asarray(path, dtype=np.float64)
+    points = np.asarray(points, dtype=np.float64)
+    dl = np.diff(path, axis=0)
+    midpoints = 0.5 * (path[1:] + path[:-1])
+    # With w = 1 / |p - m|**3, sum(w * dl x (p - m)) = (W @ dl) x p - W @ (dl x m), so the only
+    # (points x segments) array needed is W itself, and the sums become matrix products.
+    dl_cross_m = np.cross(dl, midpoints)
+    m_sq = np.einsum("sk,sk->s", midpoints, midpoints)
+    field = np.empty_like(points)
+    block_size = max(1, _BIOT_SAVART_PAIRS // len(dl))
+    for start in range(0, len(points), block_size):
+        block = points[start:start + block_size]
+        r_sq = np.einsum("pk,pk->p", block, block)[:, None] + m_sq[None, :] - 2.0 * (block @ midpoints.T)
+        np.maximum(r_sq, 0.0, out=r_sq)
+        with np.errstate(divide="ignore"):
+            weights = np.where(r_sq > 0.0, r_sq ** -1.5, 0.0)
+        field[start:start + block_size] = np.cross(weights @ dl, block) - weights @ dl_cross_m
+    return field * (MU_0 * current / (4.0 * np.pi))
+
+
+def solenoid_plane_field(x, y, current=1.0, turns=10, length=2.0, radius=0.5):
+    """Field in the ``z = 0`` plane of a coil wound around the x axis (see ``helix``).
+
+    The plane contains the coil axis and cuts every turn at ``y = +/- radius``.
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    points = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    field = biot_savart(helix(turns, length, radius), points, current)
+    return field[:, 0].reshape(x.shape), field[:, 1].reshape(x.shape)
+
+
+def helix(turns=10, length=0.1, radius=0.02, segments_per_turn=48):
+    """Points along a coil wound around the x axis and centred on the origin, shape ``(N, 3)``."""
+    phi = np.linspace(0.0, 2.0 * np.pi * turns, int(turns * segments_per_turn) + 1)
+    return np.stack([
+        -length / 2.0 + length * phi / phi[-1],
+        radius * np.cos(phi),
+        radius * np.sin(phi),
+    ], axis=1)
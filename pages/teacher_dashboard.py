@@ -0,0 +1,145 @@
+import os
+import tempfile
+import time
+from contextlib import closing
+from urllib.parse import urlencode
+
+import streamlit as st
+
+from classroom import DEFAULT_DATABASE, class_codes, load_dashboard
+from classroom.access import access_token
+from classroom.dashboard import SCORE_BUCKETS
+from classroom.export import MIME_TYPES, attempts_table, responses_table, spool_export
+from classroom.problems import generate, iter_printable_html, problem_space
+from classroom.store import connect
+
+# --- Page Setup ---
+st.set_page_config(page_title="MathCraft: Teacher Dashboard", page_icon="📊", layout="wide")
+st.title("📊 Teacher Dashboard")
+
+# --- Access ---
+# Set MAGNETISM_TEACHER_CODE on shared deployments so students cannot open this page.
+TEACHER_CODE = os.environ.get("MAGNETISM_TEACHER_CODE")
+if TEACHER_CODE and st.session_state.get("teacher_code") != TEACHER_CODE:
+    entered = st.text_input("Teacher access code", type="password")
+    if entered != TEACHER_CODE:
+        st.stop()
+    st.session_state["teacher_code"] = entered
+
+# --- Practice Worksheets ---
+def printable_worksheets(worksheets, per_sheet, seed):
+    # Streams the document into a spooled file instead of building one large string.
+    document = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    for chunk in iter_printable_html(generate(worksheets * per_sheet, seed), per_sheet):
+        document.write(chunk.encode("utf-8"))
+    document.seek(0)
+    return document
+
+
+with st.expander("🖨️ Practice Worksheets"):
+    st.markdown(
+        "Unique numeric problems from the lesson's inverse-square and electromagnet models, "
+        "one printable page per worksheet with answer keys at the end."
+    )
+    columns = st.columns(3)
+    worksheets = columns[0].number_input("Worksheets", min_value=1, max_value=4000, value=30)
+    per_sheet = columns[1].number_input("Problems per worksheet", min_value=1, max_value=40, value=10)
+    seed = columns[2].number_input("Seed", min_value=0, value=0, help="The same seed gives the same worksheets.")
+    if worksheets * per_sheet > problem_space():
+        st.warning(f"Only {problem_space():,} unique problems exist; ask for fewer worksheets or problems.")
+    else:
+        st.download_button(
+            "Download worksheets (HTML)",
+            lambda: printable_worksheets(int(worksheets), int(per_sheet), int(seed)),
+            file_name=f"magnetism-worksheets-{seed}.html",
+            mime="text/html",
+        )
+
+if not DEFAULT_DATABASE.exists():
+    st.info("No quiz attempts or reflections have been stored yet.")
+    st.stop()
+
+# --- Class Aggregates ---
+started = time.perf_counter()
+with closing(connect(DEFAULT_DATABASE)) as connection:
+    all_classes = class_codes(connection)
+    selected = st.multiselect(
+        "Classes",
+        all_classes,
+        format_func=lambda code: code or "(no class code)",
+        placeholder="All classes",
+    )
+    dashboard = load_dashboard(connection, selected or None)
+elapsed_ms = (time.perf_counter() - started) * 1000
+
+students = sum(c["students"] for c in dashboard.classes)
+attempts = sum(c["attempts"] for c in dashboard.classes)
+reflected = sum(c["reflected"] for c in dashboard.classes)
+attempted = sum(c["attempted"] for c in dashboard.classes)
+
+columns = st.columns(4)
+columns[0].metric("Students", f"{students:,}")
+columns[1].metric("Quiz attempts", f"{attempts:,}")
+columns[2].metric("Took the quiz", f"{attempted / students:.0%}" if students else "–")
+columns[3].metric("Reflection completion", f"{reflected / students:.0%}" if students else "–")
+
+st.subheader("Per-Question Accuracy")
+st.dataframe(
+    [{"Question": q["title"], "Topic": q["topic"], "Answered": q["answered"], "Accuracy": q["accuracy"]}
+     for q in dashboard.questions],
+    column_config={"Accuracy": st.column_config.ProgressColumn(format="percent", min_value=0.0, max_value=1.0)},
+    hide_index=True,
+)
+
+st.subheader("Score Distribution")
+st.bar_chart(
+    {"Score band (%)": [i * 100 // SCORE_BUCKETS for i in range(SCORE_BUCKETS + 1)], "Attempts": dashboard.scores},
+    x="Score band (%)",
+    y="Attempts",
+)
+
+st.subheader("Classes")
+st.dataframe(
+    [
+        {
+            "Class": c["code"],
+            "Students": c["students"],
+            "Quiz attempts": c["attempts"],
+            "Took the quiz": c["attempted"] / c["students"] if c["students"] else 0.0,
+            "Reflection completion": c["reflected"] / c["students"] if c["students"] else 0.0,
+        }
+        for c in dashboard.classes
+    ],
+    column_config={
+        "Took the quiz": st.column_config.ProgressColumn(format="percent", min_value=0.0, max_value=1.0),
+        "Reflection completion": st.column_config.ProgressColumn(format="percent", min_value=0.0, max_value=1.0),
+    },
+    hide_index=True,
+)
+
+st.caption(f"Aggregates loaded in {elapsed_ms:.1f} ms.")
+
+# --- Result Exports ---
+def spooled_results(table_source, fmt, classes):
+    with closing(connect(DEFAULT_DATABASE)) as connection:
+        return spool_export(table_source(connection, classes), fmt)
+
+
+st.subheader("Export Results")
+st.markdown("Every stored attempt, or every answered question, for the selected classes.")
+export_format = st.radio("Format", list(MIME_TYPES), format_func=str.upper, horizontal=True, key="export_format")
+columns = st.columns(2)
+for column, (name, table_source) in zip(columns, (("attempts", attempts_table), ("responses", responses_table))):
+    if os.environ.get("MAGNETISM_EXPORT_ROUTES"):
+        # Streamed by server.py in constant memory, however large the history. The link carries a
+        # short-lived token rather than the access code, which would linger in histories and logs.
+        token = [("token", access_token("export/class"))] if TEACHER_CODE else []
+        query = urlencode([("class", code) for code in selected] + token)
+        column.link_button(f"Download {name}", f"export/class/{name}.{export_format}?{query}")
+    else:
+        column.download_button(
+            f"Download {name}",
+            lambda table_source=table_source: spooled_results(table_source, export_format, selected or None),
+            file_name=f"{name}.{export_format}",
+            mime=MIME_TYPES[export_format],
+        )
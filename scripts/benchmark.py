@@ -0,0 +1,574 @@
+"""Benchmark the lesson's reruns, payloads, page load, chart frames, field engine and particle lab.
+
+Prints one JSON document (or writes it with -o) so runs can be diffed or
+compared with --compare:
+
+    python scripts/benchmark.py -o bench.json
+    python scripts/benchmark.py --suite fields --compare bench.json
+
+Suites:
+
+* rerun    - app.py script time under Streamlit's AppTest: the first run, a
+             steady rerun where the browser already holds every section and
+             patch, and a rerun after the compass scene changes.
+* payload  - bytes sent per rerun for the same three cases: the lesson
+             component's arguments and every element on the page.
+* browser  - time to first paint and to interactive for the lesson iframe,
+             plus frame times while dragging each chart's sliders and the
+             long tasks (over 50 ms) the iframe's main thread ran meanwhile,
+             which should be none now that fields are prepared in a worker. Starts
+             ``server.py`` on a local port and drives headless Chromium through
+             Playwright (``pip install playwright && playwright install
+             chromium``); skipped when Playwright is missing. Build the local
+             assets first (scripts/build_assets.py) to keep CDNs out of it.
+* fields   - field-model throughput across grid sizes, bypassing the cache.
+* particles - Boris-pusher time for each particle-lab scene at the lesson's
+             particle and step counts, bypassing the cache.
+* kernels  - the browser's batched field kernels (widgets/field-kernels.js:
+             inverse square, dipole, bar magnet, wire and solenoid) against
+             per-point code calling a scalar function inside .map(),
+             per call over a frame's worth of points. Both get the same inputs
+             and must give the same outputs. Runs under Node when it
+             is installed (the same V8 engine as Chromium), otherwise in
+             Playwright's Chromium; skipped when neither is available.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from lesson_engine import load_lesson  # noqa: E402
+from magnetism import FIELD_MODELS, PARTICLE_FIELDS, boris_push, launch  # noqa: E402
+
+LESSON_DIR = ROOT / "lessons" / "magnetism"
+GRID_SIZES = (64, 128, 256, 512, 1024)
+
+
+def _summary(samples_ms):
+    samples = sorted(samples_ms)
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+# --- Reruns and Payloads ---
+def _walk_protos(node):
+    proto = getattr(node, "proto", None)
+    if proto is not None:
+        yield proto
+    children = getattr(node, "children", None)
+    if isinstance(children, dict):
+        for child in children.values():
+            yield from _walk_protos(child)
+
+
+def _rerun_sizes(at):
+    protos = list(_walk_protos(at._tree))
+    component = next(p for p in protos if p.__class__.__name__ == "ComponentInstance")
+    return {
+        "component_bytes": len(component.json_args.encode("utf-8")),
+        "page_bytes": sum(p.ByteSize() for p in protos),
+    }, json.loads(component.json_args)
+
+
+def _browser_message(at, key, seq, manifest, state, held):
+    # What bridge.js reports once it holds everything in ``manifest``; ``held`` collects every patch digest seen.
+    held.update(manifest["patches"].values())
+    at.session_state[key] = {
+        "mount": "benchmark",
+        "seq": seq,
+        "have": {"sections": dict(manifest["sections"]), "patches": manifest["patches"], "held": sorted(held)},
+        "state": state,
+        "events": [],
+    }
+
+
+def _timed_run(at):
+    started = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - started) * 1000
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception[0].value}")
+    return elapsed
+
+
+def measure_reruns(repeats):
+    from streamlit.testing.v1 import AppTest
+
+    key = load_lesson(LESSON_DIR).slug
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+    first_ms = _timed_run(at)
+    first_sizes, args = _rerun_sizes(at)
+
+    steady_ms, scene_ms = [], []
+    seq = 1
+    held = set()
+    for i in range(repeats):
+        _browser_message(at, key, seq, args["manifest"], {}, held)
+        steady_ms.append(_timed_run(at))
+        steady_sizes, args = _rerun_sizes(at)
+        seq += 1
+        # Alternate the compass scene: the first pair sends new grids, later ones the browser already holds.
+        _browser_message(at, key, seq, args["manifest"], {"compassScenario": "current_up" if i % 2 == 0 else "north"}, held)
+        scene_ms.append(_timed_run(at))
+        scene_sizes, args = _rerun_sizes(at)
+        seq += 1
+
+    timings = {
+        "first_run_ms": round(first_ms, 3),
+        "steady_rerun": _summary(steady_ms),
+        "scene_change_rerun": _summary(scene_ms),
+    }
+    sizes = {"first_render": first_sizes, "steady_rerun": steady_sizes, "scene_change_rerun": scene_sizes}
+    return timings, sizes
+
+
+# --- Browser ---
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, timeout=60, database=None):
+    """Start ``server.py`` on ``port``; with ``database`` it stores attempts there instead of data/lesson.db."""
+    env = dict(os.environ)
+    if database is not None:
+        env["MAGNETISM_DATABASE"] = str(database)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "server.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2):
+                return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"server.py did not become healthy on port {port} within {timeout}s")
+
+
+DRAG_SCRIPT = """
+async ([sliderId, steps, min, max, step]) => {
+    const slider = document.getElementById(sliderId);
+    slider.scrollIntoView({ block: 'center' });
+    const nextFrame = () => new Promise(resolve => requestAnimationFrame(resolve));
+    for (let i = 0; i < 10; i++) await nextFrame(); // Let the section mount and the chart draw
+    const intervals = [];
+    let last = performance.now();
+    for (let i = 0; i < steps; i++) {
+        const t = (i % 60) / 59;
+        slider.value = String(min + step * Math.round((max - min) * (i % 120 < 60 ? t : 1 - t) / step));
+        slider.dispatchEvent(new Event('input'));
+        await nextFrame();
+        const now = performance.now();
+        intervals.push(now - last);
+        last = now;
+    }
+    return intervals;
+}
+"""
+
+# Main-thread tasks over 50 ms, collected from here on (the browser only reports those).
+LONG_TASK_SCRIPT = """
+() => {
+    window.benchmarkLongTasks = [];
+    new PerformanceObserver(list => list.getEntries().forEach(entry => window.benchmarkLongTasks.push(entry.duration)))
+        .observe({ type: 'longtask' });
+}
+"""
+
+
+def measure_browser(drag_steps, executable=None):
+    try:
+        from playwright.sync_api import Error as PlaywrightError
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return {"skipped": "playwright is not installed"}
+
+    port = free_port()
+    server = start_server(port)
+    try:
+        with sync_playwright() as playwright:
+            try:
+                browser = playwright.chromium.launch(executable_path=executable)
+            except PlaywrightError as error:
+                return {"skipped": f"could not launch Chromium: {str(error).splitlines()[0]}"}
+            page = browser.new_page(viewport={"width": 1280, "height": 1000})
+            page.goto(f"http://127.0.0.1:{port}/", wait_until="load")
+            page.wait_for_selector("iframe", timeout=60_000)
+            frame = None
+            deadline = time.monotonic() + 60
+            while frame is None and time.monotonic() < deadline:
+                frame = next((f for f in page.frames if "lesson_component" in f.url), None)
+                page.wait_for_timeout(50)
+            if frame is None:
+                raise RuntimeError("the lesson iframe never appeared")
+            frame.wait_for_function("performance.getEntriesByName('lesson-interactive').length > 0", timeout=60_000)
+
+            # Iframe timestamps are converted to milliseconds since the page navigation started.
+            page_origin = page.evaluate("performance.timeOrigin")
+            frame_timing = frame.evaluate("""() => ({
+                origin: performance.timeOrigin,
+                firstPaint: (performance.getEntriesByName('first-contentful-paint')[0] || {}).startTime,
+                interactive: performance.getEntriesByName('lesson-interactive')[0].startTime,
+                resources: performance.getEntriesByType('resource').map(r => ({ name: r.name, bytes: r.transferSize }))
+            })""")
+            offset = frame_timing["origin"] - page_origin
+            result = {
+                "assets": "local" if (ROOT / "static" / "manifest.json").exists() else "cdn",
+                "iframe_first_paint_ms": None if frame_timing["firstPaint"] is None
+                else round(offset + frame_timing["firstPaint"], 1),
+                "iframe_interactive_ms": round(offset + frame_timing["interactive"], 1),
+                "iframe_transfer_bytes": sum(r["bytes"] for r in frame_timing["resources"]),
+                "slider_frames": {},
+            }
+            frame.evaluate(LONG_TASK_SCRIPT)
+            # Every range input in the lesson, over the stops its template offers.
+            for section in load_lesson(LESSON_DIR).sections:
+                for name, slider in section.sliders.items():
+                    drag = [name, drag_steps, slider["min"], slider["max"], slider["step"]]
+                    result["slider_frames"][f"{section.id}/{name}"] = _summary(frame.evaluate(DRAG_SCRIPT, drag))
+            frame.wait_for_timeout(500)  # Let the last worker results land
+            long_tasks = frame.evaluate("window.benchmarkLongTasks")
+            result["drag_long_tasks"] = {"count": len(long_tasks), "max_ms": round(max(long_tasks, default=0), 1)}
+            browser.close()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return result
+
+
+# --- Field Engine ---
+def _field_params(model):
+    if model == "superposition":
+        scenes = load_lesson(LESSON_DIR).visualizations["compass"]["scenes"]
+        return {"sources": [(s["kind"], {k: v for k, v in s.items() if k != "kind"}) for s in scenes["magnet_and_wire"]]}
+    return {}
+
+
+def measure_fields(grid_sizes, budget_s):
+    results = {}
+    for model, compute in FIELD_MODELS.items():
+        params = _field_params(model)
+        results[model] = {}
+        for size in grid_sizes:
+            # The coil's adaptive lattice needs one more point than a power-of-two grid.
+            resolution = size + 1 if model == "coil" else size
+            points = size if model in ("inverse_square", "solenoid_axis") else resolution * resolution
+            samples = []
+            deadline = time.perf_counter() + budget_s
+            while not samples or (time.perf_counter() < deadline and len(samples) < 50):
+                started = time.perf_counter()
+                compute(resolution, **params)
+                samples.append(time.perf_counter() - started)
+            best = min(samples)
+            results[model][str(size)] = {
+                "points": points,
+                "best_ms": round(best * 1000, 3),
+                "median_ms": round(statistics.median(samples) * 1000, 3),
+                "mpoints_per_s": round(points / best / 1e6, 2),
+            }
+    return results
+
+
+# --- Particle Lab ---
+def measure_particles(repeats):
+    config = load_lesson(LESSON_DIR).visualizations["particleLab"]
+    results = {}
+    for name, scene in config["scenes"].items():
+        position, velocity, q_over_m = launch(config["particles"], seed=config["seed"], **scene["launch"])
+        field, params = PARTICLE_FIELDS[scene["model"]], scene["field"]
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            boris_push(
+                position,
+                velocity,
+                q_over_m,
+                lambda x, y, z: field(x, y, z, **params),
+                scene["dt"],
+                config["steps"],
+                config["recordEvery"],
+                config["display"],
+            )
+            samples.append(time.perf_counter() - started)
+        best = min(samples)
+        results[name] = {
+            "particles": config["particles"],
+            "steps": config["steps"],
+            "best_ms": round(best * 1000, 3),
+            "median_ms": round(statistics.median(samples) * 1000, 3),
+            "mpushes_per_s": round(config["particles"] * config["steps"] / best / 1e6, 2),
+        }
+    return results
+
+
+# --- Field Kernels ---
+KERNELS_FILE = ROOT / "lesson_component" / "frontend" / "widgets" / "field-kernels.js"
+
+# Returns {kernel: {map_ms, batched_ms, speedup}} for `points` samples, each case timed for about `budgetMs`.
+KERNEL_SCRIPT = """
+([points, budgetMs]) => {
+    const K = window.FieldKernels;
+    const distance = new Float64Array(points);
+    const x = new Float64Array(points);
+    const y = new Float64Array(points);
+    for (let i = 0; i < points; i++) {
+        distance[i] = 1 + Math.abs(Math.sin(i * 12.9898)) * 9; // The distance slider's 1-10 range
+        x[i] = Math.sin(i * 78.233) * 2; // Tracer positions across the field-line view's extent
+        y[i] = Math.sin(i * 37.719) * 2;
+    }
+    // Plain arrays, as the .map() code held its samples.
+    const xVals = Array.from(distance);
+    const points2d = Array.from(x, (px, i) => [px, y[i]]);
+    const out = new Float64Array(points);
+    const bx = new Float64Array(points);
+    const by = new Float64Array(points);
+
+    // Scalar forms of the field models (magnetism/fields.py) with the kernels' arithmetic, called once per
+    // point and returning a fresh [Bx, By] pair, as .map() code does.
+    const MU_0 = 4e-7 * Math.PI;
+    const strengthAt = (d, k) => k / (d * d);
+    function dipoleAt(px, py, moment) {
+        const r2 = px * px + py * py;
+        const scale = r2 > 0 ? moment / (r2 * r2 * Math.sqrt(r2)) : 0;
+        return [3 * px * py * scale, (3 * py * py - r2) * scale];
+    }
+    function poleAt(px, py, poleX, strength) {
+        const dx = px - poleX;
+        const r2 = dx * dx + py * py;
+        const scale = r2 > 0 ? strength / (r2 * Math.sqrt(r2)) : 0;
+        return [dx * scale, py * scale];
+    }
+    function barMagnetAt(px, py, length, strength) {
+        const north = poleAt(px, py, length / 2, strength);
+        const south = poleAt(px, py, -length / 2, -strength);
+        return [north[0] + south[0], north[1] + south[1]];
+    }
+    function wireAt(px, py, current) {
+        const r2 = px * px + py * py;
+        const scale = r2 > 0 ? MU_0 * current / (2 * Math.PI * r2) : 0;
+        return [-py * scale, px * scale];
+    }
+    function ellipticKE(m) {
+        let a = 1;
+        let b = Math.sqrt(1 - m);
+        let c = Math.sqrt(m);
+        let sum = m / 2;
+        for (let n = 1; Math.abs(c) > 1e-16; n++) {
+            c = (a - b) / 2;
+            [a, b] = [(a + b) / 2, Math.sqrt(a * b)];
+            sum += Math.pow(2, n - 1) * c * c;
+        }
+        const k = Math.PI / (2 * a);
+        return [k, k * (1 - sum)];
+    }
+    function loopAt(z, rho, radius, current) {
+        const alpha2 = radius * radius + rho * rho + z * z - 2 * radius * rho;
+        const beta2 = radius * radius + rho * rho + z * z + 2 * radius * rho;
+        if (!(alpha2 > 0)) return [0, 0];
+        const [k, e] = ellipticKE(1 - alpha2 / beta2);
+        const c = MU_0 * current / (2 * Math.PI * alpha2 * Math.sqrt(beta2));
+        const axial = c * ((radius * radius - rho * rho - z * z) * e + alpha2 * k);
+        const radial = rho > 0 ? c * z / rho * ((radius * radius + rho * rho + z * z) * e - alpha2 * k) : 0;
+        return [axial, radial];
+    }
+    function solenoidAt(px, py, turns, length, radius, current) {
+        let axial = 0;
+        let radial = 0;
+        for (let turn = 0; turn < turns; turn++) {
+            const [a, r] = loopAt(px + length / 2 - (turn + 0.5) * length / turns, Math.abs(py), radius, current);
+            axial += a;
+            radial += r;
+        }
+        return [axial, py < 0 ? -radial : radial];
+    }
+
+    // name -> [map-based code, batched kernel, outputs to compare]; the lesson's field-line sources.
+    const cases = {
+        inverseSquare: [() => xVals.map(d => strengthAt(d, 100)), () => [K.inverseSquare(distance, 100, out)]],
+        dipole: [() => points2d.map(([px, py]) => dipoleAt(px, py, 1)), () => K.dipole(x, y, 1, bx, by)],
+        barMagnet: [() => points2d.map(([px, py]) => barMagnetAt(px, py, 1, 1)), () => K.barMagnet(x, y, 1, 1, 0, 0, bx, by)],
+        wire: [() => points2d.map(([px, py]) => wireAt(px, py, 1)), () => K.wire(x, y, 1, 0, 0, bx, by)],
+        solenoid: [
+            () => points2d.map(([px, py]) => solenoidAt(px, py, 10, 2, 0.5, 1)),
+            () => K.solenoid(x, y, 1, 10, 2, 0.5, bx, by)
+        ]
+    };
+    function best(run) {
+        let fastest = Infinity;
+        const stop = performance.now() + budgetMs;
+        do {
+            const start = performance.now();
+            run();
+            fastest = Math.min(fastest, performance.now() - start);
+        } while (performance.now() < stop);
+        return fastest;
+    }
+    const results = {};
+    for (const [name, [mapped, batched]] of Object.entries(cases)) {
+        // Both sides get the same inputs; a kernel that disagrees with the scalar code is a bug, not a
+        // result. Outputs agree to rounding, relative to the largest value of each component.
+        const expected = mapped();
+        const actual = batched();
+        actual.forEach((values, component) => {
+            const column = expected.map(value => Array.isArray(value) ? value[component] : value);
+            const scale = column.reduce((largest, value) => Math.max(largest, Math.abs(value)), 0);
+            for (let i = 0; i < points; i++) {
+                if (!(Math.abs(values[i] - column[i]) <= 1e-12 * scale)) {
+                    throw new Error(`${name} differs from the scalar model at point ${i}: ${values[i]} != ${column[i]}`);
+                }
+            }
+        });
+        best(mapped); // Warm both up so the JIT has compiled them before timing
+        best(batched);
+        const mapMs = best(mapped);
+        const batchedMs = best(batched);
+        results[name] = {
+            points: points,
+            map_ms: Math.round(mapMs * 1000) / 1000,
+            batched_ms: Math.round(batchedMs * 1000) / 1000,
+            speedup: Math.round(mapMs / batchedMs * 10) / 10
+        };
+    }
+    return results;
+}
+"""
+
+
+def measure_kernels(points, budget_s, executable=None):
+    args = [points, budget_s * 1000 / 2]
+    node = shutil.which("node")
+    if node:
+        script = (f"globalThis.window = globalThis;\n{KERNELS_FILE.read_text()}\n"
+                  f"console.log(JSON.stringify(({KERNEL_SCRIPT})({json.dumps(args)})));")
+        output = subprocess.run([node, "-e", script], capture_output=True, text=True, check=True).stdout
+        return {"engine": f"node {subprocess.run([node, '--version'], capture_output=True, text=True).stdout.strip()}",
+                **json.loads(output)}
+    try:
+        from playwright.sync_api import Error as PlaywrightError
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return {"skipped": "neither Node nor Playwright is installed"}
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch(executable_path=executable)
+        except PlaywrightError as error:
+            return {"skipped": f"could not launch Chromium: {str(error).splitlines()[0]}"}
+        page = browser.new_page()
+        page.add_script_tag(path=str(KERNELS_FILE))
+        results = {"engine": f"chromium {browser.version}", **page.evaluate(KERNEL_SCRIPT, args)}
+        browser.close()
+    return results
+
+
+# --- Report ---
+def _metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import streamlit
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for name, item in value.items():
+            yield from _flatten(item, f"{prefix}{name}.")
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix[:-1], value
+
+
+def compare(previous, current, threshold):
+    """Metrics that moved by more than ``threshold`` (a fraction) between two reports."""
+    before = dict(_flatten(previous["results"]))
+    changes = {}
+    for name, value in _flatten(current["results"]):
+        old = before.get(name)
+        if old and name.rsplit(".", 1)[-1] not in ("n", "points", "particles", "steps") and abs(value - old) / abs(old) > threshold:
+            changes[name] = {"before": old, "after": value, "change": round((value - old) / abs(old), 3)}
+    return changes
+
+
+SUITES = ("rerun", "payload", "browser", "fields", "particles", "kernels")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("-o", "--output", type=Path, help="write the report here instead of stdout")
+    parser.add_argument("--repeats", type=int, default=20, help="reruns per rerun case")
+    parser.add_argument("--drag-steps", type=int, default=240, help="slider positions per drag")
+    parser.add_argument("--chromium", help="Chromium/Chrome executable (default: Playwright's own)")
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=list(GRID_SIZES))
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds per field model and grid size")
+    parser.add_argument("--particle-repeats", type=int, default=5, help="runs per particle-lab scene")
+    parser.add_argument("--kernel-points", type=int, default=16384, help="points per field-kernel call")
+    parser.add_argument("--compare", type=Path, help="previous report; adds the metrics that changed")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change --compare reports")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if "rerun" in args.suite or "payload" in args.suite:
+        timings, sizes = measure_reruns(args.repeats)
+        if "rerun" in args.suite:
+            results["rerun"] = timings
+        if "payload" in args.suite:
+            results["payload"] = sizes
+    if "browser" in args.suite:
+        results["browser"] = measure_browser(args.drag_steps, args.chromium)
+    if "fields" in args.suite:
+        results["fields"] = measure_fields(args.grid_sizes, args.budget)
+    if "particles" in args.suite:
+        results["particles"] = measure_particles(args.particle_repeats)
+    if "kernels" in args.suite:
+        results["kernels"] = measure_kernels(args.kernel_points, args.budget, args.chromium)
+
+    report = {"meta": _metadata(), "results": results}
+    if args.compare:
+        report["changes"] = compare(json.loads(args.compare.read_text()), report, args.threshold)
+
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Build the self-hosted asset bundle served from ./static.
+
+Produces a purged, minified Tailwind stylesheet, a vendored Chart.js and the
+Inter font files, then writes static/manifest.json with a content hash per
+file. app.py uses the bundle whenever the manifest exists and falls back to
+the public CDNs otherwise.
+
+Run from the repository root (needs network access and Node.js for npx):
+
+    python scripts/build_assets.py
+
+The bundle is not tracked by git, so a deployment builds it before starting
+the server. ``--check`` verifies an existing build against its manifest and
+exits with status 1 when a file is missing or has changed, so it can gate a
+deploy:
+
+    python scripts/build_assets.py --check
+"""
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STATIC_DIR = ROOT / "static"
+
+TAILWIND_VERSION = "3.4.17"
+CHART_JS_VERSION = "4.4.4"
+INTER_VERSION = "5.0.18"
+INTER_WEIGHTS = (400, 500, 700)
+
+CHART_JS_URL = f"https://cdn.jsdelivr.net/npm/chart.js@{CHART_JS_VERSION}/dist/chart.umd.min.js"
+INTER_URL = f"https://cdn.jsdelivr.net/npm/@fontsource/inter@{INTER_VERSION}/files/inter-latin-{{weight}}-normal.woff2"
+
+CSS_OUTPUT = "css/lesson.min.css"
+CHART_JS_OUTPUT = "vendor/chart.umd.min.js"
+
+
+def download(url, target):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with urllib.request.urlopen(url, timeout=60) as response:
+        target.write_bytes(response.read())
+    print(f"downloaded {url} -> {target.relative_to(ROOT)}")
+
+
+def build_css():
+    target = STATIC_DIR / CSS_OUTPUT
+    target.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        [
+            "npx", "--yes", f"tailwindcss@{TAILWIND_VERSION}",
+            "-c", str(ROOT / "tailwind.config.js"),
+            "-i", str(ROOT / "assets" / "tailwind.css"),
+            "-o", str(target),
+            "--minify",
+        ],
+        cwd=ROOT,
+        check=True,
+    )
+    print(f"built {target.relative_to(ROOT)}")
+
+
+def write_manifest():
+    manifest = {}
+    for path in sorted(STATIC_DIR.rglob("*")):
+        if path.is_file() and path.name != "manifest.json":
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+            manifest[path.relative_to(STATIC_DIR).as_posix()] = {"hash": digest, "bytes": path.stat().st_size}
+    (STATIC_DIR / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    for name, entry in manifest.items():
+        print(f"{entry['bytes']:>10,}  {entry['hash']}  {name}")
+
+
+def check_manifest():
+    """Files the manifest lists that are missing or no longer match their hash."""
+    manifest_path = STATIC_DIR / "manifest.json"
+    if not manifest_path.exists():
+        return ["manifest.json"]
+    problems = []
+    for name, entry in json.loads(manifest_path.read_text()).items():
+        path = STATIC_DIR / name
+        if not path.is_file() or hashlib.sha256(path.read_bytes()).hexdigest()[:12] != entry["hash"]:
+            problems.append(name)
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skip-css", action="store_true", help="keep the existing stylesheet (no Node.js needed)")
+    parser.add_argument("--skip-downloads", action="store_true", help="keep the existing Chart.js and font files")
+    parser.add_argument("--check", action="store_true", help="verify the existing build instead of building")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check_manifest()
+        for name in problems:
+            print(f"missing or changed: static/{name}")
+        return 1 if problems else 0
+
+    if not args.skip_downloads:
+        download(CHART_JS_URL, STATIC_DIR / CHART_JS_OUTPUT)
+        for weight in INTER_WEIGHTS:
+            download(INTER_URL.format(weight=weight), STATIC_DIR / "fonts" / f"inter-latin-{weight}-normal.woff2")
+    if not args.skip_css:
+        build_css()
+    write_manifest()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
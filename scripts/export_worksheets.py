@@ -0,0 +1,46 @@
+"""Write a set of unique practice worksheets (with answer keys) as one printable HTML file.
+
+The file is written as it is generated, so a full semester of worksheets
+never has to fit in memory. Open it in a browser and print; each worksheet
+starts on a new page and the answer keys follow at the end.
+
+    python scripts/export_worksheets.py --worksheets 3000 --per-sheet 12 -o semester.html
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from classroom.problems import FAMILY_NAMES, generate, iter_printable_html, problem_space  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", type=Path, default=Path("worksheets.html"))
+    parser.add_argument("--worksheets", type=int, default=180, help="number of worksheets (default: one a school day)")
+    parser.add_argument("--per-sheet", type=int, default=10, help="problems per worksheet")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible set")
+    parser.add_argument("--families", nargs="+", choices=FAMILY_NAMES, default=list(FAMILY_NAMES))
+    parser.add_argument("--title", default="Magnetism Practice")
+    args = parser.parse_args(argv)
+
+    count = args.worksheets * args.per_sheet
+    available = problem_space(args.families)
+    if count > available:
+        parser.error(f"{count} problems requested but only {available} unique problems exist for these families")
+
+    started = time.perf_counter()
+    batch = generate(count, args.seed, args.families)
+    with args.output.open("w", encoding="utf-8") as output:
+        for chunk in iter_printable_html(batch, args.per_sheet, args.title):
+            output.write(chunk)
+    print(f"wrote {count:,} problems on {args.worksheets:,} worksheets to {args.output} "
+          f"in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""Simulate a classroom of students against a locally started lesson server.
+
+Each simulated student speaks Streamlit's WebSocket protocol the way the
+lesson page does: it loads the page, then reports coils slider releases
+(the only slider the page reports), a compass scene change, a quiz submission, a reflection and a study plan through the
+lesson component, waiting for each rerun to finish before thinking and
+acting again. Students arrive spread over --ramp seconds, like a class
+opening the lesson at the bell.
+
+    python scripts/load_test.py --students 30 60 120 200 -o load.json
+
+Every stage reports p50/p95/p99 latency per action, server CPU (share of
+one core) and resident memory per session, read from /proc on Linux. The
+report also names the smallest class size whose median rerun is more
+than --queue-factor times slower than a single student's: the point at
+which reruns start queueing behind each other.
+
+Students only move sliders to stops the lesson's own range inputs offer.
+The server started here records their attempts in a temporary database that
+is deleted afterwards, so data/lesson.db and the teacher aggregates never see them.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark import LESSON_DIR, free_port, start_server  # noqa: E402
+from lesson_engine import load_lesson  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from websockets.asyncio.client import connect  # noqa: E402
+
+REPORTED_SLIDERS = ("coils-slider",)  # Sent once on release; the others are drawn in the browser alone
+REFLECTION = "Maglev trains float above the track because the repulsion between magnets follows an inverse-square law."
+
+
+def slider_value(slider, rng):
+    """One of a range input's stops, as its widget reports it (ints for whole-number sliders)."""
+    stops = int(round((slider["max"] - slider["min"]) / slider["step"]))
+    value = round(slider["min"] + slider["step"] * rng.randint(0, stops), 6)
+    return int(value) if slider["min"].is_integer() and slider["step"].is_integer() else value
+
+
+# --- Server Statistics ---
+def _clock_ticks():
+    return os.sysconf("SC_CLK_TCK")
+
+
+def process_stats(pid):
+    """CPU seconds used and resident bytes of ``pid``, or None where /proc is unavailable."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return None
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / _clock_ticks()  # utime + stime
+    rss_kib = next(int(line.split()[1]) for line in status.splitlines() if line.startswith("VmRSS:"))
+    return cpu_seconds, rss_kib * 1024
+
+
+class ServerMonitor:
+    """Samples a process's CPU and memory in the background while a stage runs."""
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+
+    async def run(self):
+        while True:
+            stats = process_stats(self.pid) if self.pid else None
+            if stats is not None:
+                self.samples.append((time.monotonic(), *stats))
+            await asyncio.sleep(self.interval)
+
+    def summary(self, baseline_rss, sessions):
+        if len(self.samples) < 2:
+            return {"cpu_percent": None, "peak_rss_mib": None, "rss_per_session_kib": None}
+        (t0, cpu0, _), (t1, cpu1, _) = self.samples[0], self.samples[-1]
+        peak_rss = max(rss for _, _, rss in self.samples)
+        return {
+            "cpu_percent": round(100 * (cpu1 - cpu0) / (t1 - t0), 1),
+            "peak_rss_mib": round(peak_rss / 2**20, 1),
+            "rss_per_session_kib": round(max(0, peak_rss - baseline_rss) / sessions / 1024, 1),
+        }
+
+
+# --- Simulated Student ---
+class Student:
+    def __init__(self, number, base_url, spec, rng, think, in_flight):
+        self.number = number
+        self.spec = spec
+        self.base_url = base_url
+        self.rng = rng
+        self.think = think
+        self.in_flight = in_flight
+        self.timings = []  # (action, seconds)
+        self.errors = 0
+        self.socket = None
+        self.page_hash = ""
+        self.component_id = None
+        self.args = None
+        self.quiz = None
+        self.seq = 0
+        self.event_id = 0
+        self.held = set()  # Every patch digest received, as bridge.js keeps them
+
+    def _message(self, state, events):
+        # The component value bridge.js would send after applying the last render.
+        self.seq += 1
+        manifest = self.args["manifest"]
+        self.held.update(manifest["patches"].values())
+        return {
+            "mount": f"student-{self.number}",
+            "seq": self.seq,
+            "have": {"sections": dict(manifest["sections"]), "patches": manifest["patches"], "held": sorted(self.held)},
+            "state": state,
+            "events": events,
+        }
+
+    def _event(self, kind, payload):
+        self.event_id += 1
+        return {"id": self.event_id, "seq": self.seq + 1, "type": kind, "payload": payload}
+
+    async def _rerun(self, action, value=None):
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = self.page_hash
+        if value is not None:
+            widget = message.rerun_script.widget_states.widgets.add()
+            widget.id = self.component_id
+            widget.json_value = json.dumps(value)
+
+        started = time.perf_counter()
+        self.in_flight.append(1)
+        try:
+            await self.socket.send(message.SerializeToString())
+            while True:
+                forward = ForwardMsg()
+                forward.ParseFromString(await self.socket.recv())
+                kind = forward.WhichOneof("type")
+                if kind == "new_session":
+                    self.page_hash = forward.new_session.page_script_hash
+                elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                    element = forward.delta.new_element
+                    if element.WhichOneof("type") == "component_instance":
+                        self.component_id = element.component_instance.id
+                        self.args = json.loads(element.component_instance.json_args)
+                        # Patches are only resent when they change; keep the quiz the browser holds.
+                        self.quiz = self.args["patches"].get("quiz", self.quiz)
+                    elif element.WhichOneof("type") == "exception":
+                        self.errors += 1
+                elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+        finally:
+            self.in_flight.pop()
+        self.timings.append((action, time.perf_counter() - started))
+
+    async def _pause(self):
+        await asyncio.sleep(self.rng.uniform(*self.think))
+
+    async def run(self):
+        started = time.perf_counter()
+        await asyncio.to_thread(lambda: urllib.request.urlopen(self.base_url, timeout=60).read())
+        ws_url = self.base_url.replace("http", "ws", 1) + "_stcore/stream"
+        async with connect(ws_url, subprotocols=["streamlit"], max_size=2**26) as self.socket:
+            await self._rerun("first_run")
+            self.timings.append(("page_load", time.perf_counter() - started))
+
+            await self._pause()
+            await self._rerun("profile", self._message(
+                {"studentName": f"Student {self.number}", "classCode": "LOAD", "avatar": "🧲"}, []
+            ))
+            sliders = self.spec.sliders  # The lesson's own range inputs, so only values the page can send
+            reported = [name for name in REPORTED_SLIDERS if name in sliders]
+            for name in self.rng.choices(reported, k=3) if reported else ():
+                await self._pause()
+                value = slider_value(sliders[name], self.rng)
+                await self._rerun("slider", self._message({name.removesuffix("-slider"): value}, []))
+
+            await self._pause()
+            scenes = list(self.spec.visualizations["compass"]["scenes"])
+            await self._rerun("compass_scene", self._message({"compassScenario": self.rng.choice(scenes)}, []))
+
+            await self._pause()
+            quiz = self.quiz
+            answers = [self.rng.randrange(len(q["options"])) for q in quiz["questions"]]
+            await self._rerun("quiz_submit", self._message(
+                {}, [self._event("quiz_submitted", {"quizId": quiz["id"], "answers": answers})]
+            ))
+
+            await self._pause()
+            await self._rerun("reflection", self._message({}, [self._event("reflection_submitted", {"text": REFLECTION})]))
+
+            await self._pause()
+            plan = self.spec.study_plan
+            await self._rerun("study_plan", self._message({}, [self._event("study_plan_generated", {
+                "level": self.rng.choice(plan["levels"])["label"], "time": self.rng.choice(plan["times"]),
+            })]))
+
+
+# --- Stages ---
+def _percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(1000 * ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+    return {"n": len(ordered), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": pick(1.0)}
+
+
+async def run_stage(base_url, students, ramp, think, seed, server_pid):
+    rng = random.Random(seed)
+    spec = load_lesson(LESSON_DIR)
+    in_flight = []
+    peak_in_flight = 0
+    baseline = process_stats(server_pid) if server_pid else None
+    monitor = ServerMonitor(server_pid)
+    monitor_task = asyncio.create_task(monitor.run())
+
+    async def arrive(student, delay):
+        await asyncio.sleep(delay)
+        await student.run()
+
+    async def watch_in_flight():
+        nonlocal peak_in_flight
+        while True:
+            peak_in_flight = max(peak_in_flight, len(in_flight))
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.create_task(watch_in_flight())
+    roster = [Student(i, base_url, spec, random.Random(rng.random()), think, in_flight) for i in range(students)]
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(arrive(student, rng.uniform(0, ramp)) for student in roster), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - started
+    watcher.cancel()
+    monitor_task.cancel()
+
+    by_action = {}
+    for student in roster:
+        for action, seconds in student.timings:
+            by_action.setdefault(action, []).append(seconds)
+    # Interactions only: a first run also pays for the page's full render.
+    reruns = [s for action, samples in by_action.items() if action not in ("page_load", "first_run") for s in samples]
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    return {
+        "students": students,
+        "duration_s": round(elapsed, 1),
+        "failed_students": len(failures),
+        "first_failure": repr(failures[0]) if failures else None,
+        "script_errors": sum(student.errors for student in roster),
+        "peak_reruns_in_flight": peak_in_flight,
+        "reruns": _percentiles(reruns) if reruns else None,
+        "actions": {action: _percentiles(samples) for action, samples in sorted(by_action.items())},
+        "server": monitor.summary(baseline[1] if baseline else 0, students),
+    }
+
+
+def queueing_onset(stages, factor):
+    """Smallest class size whose median rerun is ``factor`` times the single-student median."""
+    baseline = stages[0]["reruns"]["p50_ms"]
+    for stage in stages[1:]:
+        if stage["reruns"] and stage["reruns"]["p50_ms"] > factor * baseline:
+            return stage["students"]
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, nargs="+", default=[30, 60, 120, 200], help="class sizes, one stage each")
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which a class arrives")
+    parser.add_argument("--think", type=float, nargs=2, default=[0.5, 2.0], metavar=("MIN", "MAX"),
+                        help="seconds a student pauses between actions")
+    parser.add_argument("--queue-factor", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="test a server that is already running (no CPU or memory figures)")
+    parser.add_argument("-o", "--output", type=Path, help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    server = None
+    scratch = None
+    if args.url:
+        base_url = args.url.rstrip("/") + "/"
+    else:
+        # The simulated class writes to a throwaway database, never the real data/lesson.db.
+        scratch = tempfile.TemporaryDirectory(prefix="magnetism-load-")
+        port = free_port()
+        server = start_server(port, database=Path(scratch.name) / "lesson.db")
+        base_url = f"http://127.0.0.1:{port}/"
+    try:
+        # One untimed student warms the script, imports and caches so the first stage measures sessions only.
+        print("warm-up", file=sys.stderr)
+        asyncio.run(run_stage(base_url, 1, 0.0, (0.0, 0.0), args.seed, None))
+        stages = []
+        # A lone student first: the uncontended baseline that queueing is measured against.
+        for students in [1] + sorted(args.students):
+            print(f"stage: {students} students", file=sys.stderr)
+            stages.append(asyncio.run(run_stage(
+                base_url, students, 0.0 if students == 1 else args.ramp, args.think, args.seed + students,
+                server.pid if server else None,
+            )))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+        if scratch:
+            scratch.cleanup()
+
+    report = {
+        "url": base_url,
+        "ramp_s": args.ramp,
+        "think_s": args.think,
+        "queueing_starts_at": queueing_onset(stages, args.queue_factor),
+        "stages": stages,
+    }
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
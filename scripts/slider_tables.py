@@ -0,0 +1,66 @@
+"""Report the size of the lesson's slider-stop tables against their budgets.
+
+Every visualization with a ``table`` entry in lesson.json is built the way
+the app builds it and reported per array, as raw bytes, as base64 (what the
+inline fallback sends) and gzip-compressed, against its ``budgetBytes``.
+``--budget`` adds a limit on all tables together. Exits with status 1 when
+anything is over budget, so it can gate a change to the tables:
+
+    python scripts/slider_tables.py
+    python scripts/slider_tables.py --budget 98304 -o tables.json
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from lesson_engine import load_lesson  # noqa: E402
+from lesson_engine.tables import size_report  # noqa: E402
+from lesson_engine.visualizations import slider_table  # noqa: E402
+from magnetism import FieldCache  # noqa: E402
+
+
+def report(lesson_dir, budget=None):
+    os.environ.pop("LESSON_TABLES_URL", None)  # Inline tables carry their bytes
+    spec = load_lesson(lesson_dir)
+    cache = FieldCache()
+    tables = {}
+    for name, config in spec.visualizations.items():
+        if "table" in config:
+            table = slider_table(name, config, cache)
+            tables[name] = size_report(table, base64.b64decode(table["data"]))
+    total = sum(table["bytes"] for table in tables.values())
+    return {
+        "tables": tables,
+        "bytes": total,
+        "base64_bytes": sum(table["base64_bytes"] for table in tables.values()),
+        "gzip_bytes": sum(table["gzip_bytes"] for table in tables.values()),
+        "budget_bytes": budget,
+        "within_budget": all(table["within_budget"] for table in tables.values()) and (budget is None or total <= budget),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lesson", type=Path, default=ROOT / "lessons" / "magnetism", help="lesson directory")
+    parser.add_argument("--budget", type=int, help="bytes allowed for all tables together")
+    parser.add_argument("-o", "--output", type=Path, help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    result = report(args.lesson, args.budget)
+    text = json.dumps(result, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0 if result["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""ASGI entry point: the lesson plus streaming export and shared-runtime endpoints.
+
+    streamlit run server.py        (or: uvicorn server:app --port 8501)
+
+Exports are streamed chunk by chunk, so even a multi-million-row class
+history is sent in constant memory:
+
+    /export/lab/<dataset>.<csv|parquet>?resolution=N[&model=...]
+    /export/class/<attempts|responses>.<csv|parquet>[?class=CODE&class=...]
+
+When ``MAGNETISM_TEACHER_CODE`` is set, class exports need the code in an
+``X-Teacher-Code`` header, or the short-lived ``?token=...`` the teacher
+dashboard puts in its download links (see ``classroom/access.py``).
+
+The lesson runtime (``lesson.css``, ``runtime.js``, widget scripts) is served
+from ``/lesson-runtime/`` under content-hashed URLs with immutable cache
+headers, so every lesson after the first loads it from the browser cache.
+
+Slider-stop tables are served from ``/lesson-tables/<name>.bin?v=<digest>``
+the same way: a browser fetches each one once and keeps it.
+
+Pages post performance telemetry to ``/telemetry``, which aggregates it into
+histograms per device class; ``GET /telemetry`` returns them as JSON (with
+the ``X-Teacher-Code`` header when a teacher code is set).
+
+The particle lab's trajectories are integrated when the browser fetches
+``/particles/<digest>`` and streamed in chunks of frames, so the page's
+rerun never waits for them and the canvas animates the start of a run while
+the rest is still arriving.
+
+``/lesson-sw.js`` is the lesson's service worker: repeat visits load the
+page shell, the component and every asset from the browser's cache, and a
+lesson that is already open keeps working through a dropped connection.
+It needs the asset bundle from ``scripts/build_assets.py``; the server warns
+at startup when it is missing, or refuses to start when
+``MAGNETISM_REQUIRE_ASSETS=1``.
+Running ``streamlit run app.py`` still works; the pages then fall back to
+in-app downloads.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import streamlit as st
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from classroom import DEFAULT_DATABASE
+from classroom.access import TEACHER_HEADER, teacher_allowed
+from classroom.export import MIME_TYPES, attempts_table, iter_export, lab_table, responses_table
+from classroom.store import connect
+from lesson_engine.offline import service_worker_script
+from lesson_engine.page import bundle_manifest, get_field_cache
+from lesson_engine.runtime import FRONTEND_DIR, RUNTIME_PATHS, file_hash
+from lesson_engine.tables import table_blob
+from lesson_engine.telemetry import TelemetryCollector, decode_batch
+from lesson_engine.visualizations import particle_stream
+
+os.environ["MAGNETISM_EXPORT_ROUTES"] = "1"  # Lets the pages link here instead of building files in memory
+os.environ["LESSON_RUNTIME_URL"] = "lesson-runtime"  # Lessons load the shared runtime from lesson_runtime below
+os.environ["LESSON_TELEMETRY_URL"] = "telemetry"  # Pages report performance to the collector below
+os.environ["LESSON_SERVICE_WORKER_URL"] = "lesson-sw.js"  # Pages register lesson_service_worker below
+os.environ["LESSON_TABLES_URL"] = "lesson-tables"  # Slider tables are fetched from lesson_table below
+os.environ["PARTICLE_STREAM_URL"] = "particles"  # The particle lab streams its frames from particles below
+
+CLASS_TABLES = {"attempts": attempts_table, "responses": responses_table}
+
+logger = logging.getLogger(__name__)
+
+# Offline use needs the self-hosted bundle: without it the pages load Tailwind, Chart.js and the fonts from
+# CDNs, which a device can only cache if it reached them once. MAGNETISM_REQUIRE_ASSETS=1 makes that fatal.
+if bundle_manifest() is None:
+    message = "No complete asset bundle in static/; run python scripts/build_assets.py for offline use"
+    if os.environ.get("MAGNETISM_REQUIRE_ASSETS") == "1":
+        raise RuntimeError(message)
+    logger.warning("%s. Falling back to the CDNs.", message)
+
+telemetry_collector = TelemetryCollector()
+
+
+def _stream(name, fmt, chunks):
+    return StreamingResponse(
+        chunks,
+        media_type=MIME_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+async def export_lab(request):
+    fmt = request.path_params["fmt"]
+    dataset = request.path_params["dataset"]
+    try:
+        resolution = int(request.query_params.get("resolution", "256"))
+        table = lab_table(dataset, resolution, request.query_params.get("model", "bar_magnet"))
+        chunks = iter_export(table, fmt)
+    except ValueError as error:
+        return PlainTextResponse(str(error), status_code=400)
+    return _stream(f"{dataset}-{resolution}", fmt, chunks)
+
+
+def _teacher_denied(request, scope):
+    if teacher_allowed(request.headers, request.query_params.get("token"), scope):
+        return None
+    return PlainTextResponse(
+        f"A teacher access code is required: send it in the {TEACHER_HEADER} header, or reload the teacher "
+        "dashboard for a fresh download link.",
+        status_code=403,
+    )
+
+
+async def export_class(request):
+    denied = _teacher_denied(request, "export/class")
+    if denied:
+        return denied
+    dataset = request.path_params["dataset"]
+    fmt = request.path_params["fmt"]
+    if dataset not in CLASS_TABLES or fmt not in MIME_TYPES:
+        return PlainTextResponse(f"Unknown export {dataset}.{fmt}", status_code=404)
+    if not DEFAULT_DATABASE.exists():
+        return PlainTextResponse("No results have been stored yet.", status_code=404)
+
+    def chunks():
+        # Runs in Starlette's threadpool; the connection lives exactly as long as the download.
+        connection = connect(DEFAULT_DATABASE)
+        try:
+            yield from iter_export(CLASS_TABLES[dataset](connection, request.query_params.getlist("class") or None), fmt)
+        finally:
+            connection.close()
+
+    return _stream(dataset, fmt, chunks())
+
+
+async def lesson_runtime(request):
+    name = request.path_params["path"]
+    if name not in RUNTIME_PATHS:
+        return PlainTextResponse(f"Unknown runtime file {name}", status_code=404)
+    # A versioned URL always names the same bytes, so browsers may keep it; anything else revalidates.
+    immutable = request.query_params.get("v") == file_hash(name)
+    return FileResponse(
+        FRONTEND_DIR / name,
+        headers={"Cache-Control": "public, max-age=31536000, immutable" if immutable else "no-cache"},
+    )
+
+
+async def lesson_table(request):
+    blob = table_blob(request.query_params.get("v", ""))
+    if blob is None:
+        return PlainTextResponse(f"Unknown table {request.path_params['name']}", status_code=404)
+    # The digest names the bytes, so the response never changes.
+    return Response(
+        blob,
+        media_type="application/octet-stream",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+async def lesson_service_worker(request):
+    # Always revalidated: a changed script is how browsers learn about a new asset version.
+    return Response(
+        service_worker_script(os.environ["LESSON_RUNTIME_URL"]),
+        media_type="text/javascript",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+async def particles(request):
+    chunks = particle_stream(request.path_params["digest"], get_field_cache())
+    if chunks is None:
+        return PlainTextResponse("Unknown particle run", status_code=404)
+    # Runs in Starlette's threadpool, which integrates the run (or reads it from the cache) before its first chunk.
+    return StreamingResponse(chunks, media_type="application/octet-stream", headers={"Cache-Control": "no-store"})
+
+
+async def telemetry(request):
+    if request.method == "GET":
+        return _teacher_denied(request, "telemetry") or JSONResponse(telemetry_collector.snapshot())
+    try:
+        device, metrics, counters = decode_batch(await request.body(), request.headers.get("content-encoding"))
+    except ValueError as error:
+        return PlainTextResponse(str(error), status_code=400)
+    telemetry_collector.ingest(device, metrics, counters)
+    return Response(status_code=204)
+
+
+app = st.App(
+    Path(__file__).with_name("app.py"),
+    routes=[
+        Route("/export/lab/{dataset}.{fmt}", export_lab),
+        Route("/export/class/{dataset}.{fmt}", export_class),
+        Route("/lesson-runtime/{path:path}", lesson_runtime),
+        Route("/lesson-tables/{name}.bin", lesson_table),
+        Route("/particles/{digest}", particles),
+        Route("/telemetry", telemetry, methods=["GET", "POST"]),
+        Route("/lesson-sw.js", lesson_service_worker),
+    ],
+)
@@ -0,0 +1,9 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+    // Only classes that appear in the lesson markup end up in static/css/lesson.min.css.
+    content: ['./lessons/**/*.html', './lesson_component/frontend/**/*.{html,js}'],
+    theme: {
+        extend: {},
+    },
+    plugins: [],
+};
@@ -0,0 +1,27 @@
+import pytest
+
+from classroom.access import TEACHER_HEADER, access_token, teacher_allowed, valid_token
+
+
+def test_tokens_are_scoped_and_expire():
+    token = access_token("export/class", ttl=60, now=1000)
+    assert valid_token(token, "export/class", now=1059)
+    assert not valid_token(token, "export/class", now=1061)
+    assert not valid_token(token, "telemetry", now=1000)
+
+
+@pytest.mark.parametrize("token", [None, "", "soon.abc", "99999999999", "99999999999.0123456789abcdef0123456789abcdef"])
+def test_forged_tokens_are_rejected(token):
+    assert not valid_token(token, "export/class")
+
+
+def test_teacher_code_in_a_header_or_a_token(monkeypatch):
+    monkeypatch.delenv("MAGNETISM_TEACHER_CODE", raising=False)
+    assert teacher_allowed({}, None, "export/class")
+
+    monkeypatch.setenv("MAGNETISM_TEACHER_CODE", "s3cret")
+    assert not teacher_allowed({}, None, "export/class")
+    assert not teacher_allowed({TEACHER_HEADER: "guess"}, None, "export/class")
+    assert teacher_allowed({TEACHER_HEADER: "s3cret"}, None, "export/class")
+    assert teacher_allowed({}, access_token("export/class"), "export/class")
+    assert "s3cret" not in access_token("export/class")
@@ -0,0 +1,35 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "benchmark.py"
+spec = importlib.util.spec_from_file_location("benchmark", SCRIPT)
+benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark)
+
+
+def report(**results):
+    return {"results": results}
+
+
+def test_compare_lists_metrics_that_moved():
+    before = report(fields={"inverse_square": {"n": 64, "best_ms": 2.0, "mpoints_per_s": 10.0}}, rerun={"steady": {"best_ms": 40.0}})
+    after = report(fields={"inverse_square": {"n": 128, "best_ms": 3.0, "mpoints_per_s": 10.5}}, rerun={"steady": {"best_ms": 40.0}})
+    assert benchmark.compare(before, after, 0.1) == {
+        "fields.inverse_square.best_ms": {"before": 2.0, "after": 3.0, "change": 0.5},
+    }
+
+
+def test_compare_skips_metrics_missing_from_the_earlier_report():
+    before = report(browser={"skipped": "Playwright is not installed"})
+    after = report(browser={"first_paint_ms": 120.0, "flag": True})
+    assert benchmark.compare(before, after, 0.1) == {}
+
+
+def test_kernels_match_the_scalar_code():
+    results = benchmark.measure_kernels(256, 0.02)
+    if "skipped" in results:
+        pytest.skip(results["skipped"])
+    assert set(results) == {"engine", "inverseSquare", "dipole", "barMagnet", "wire", "solenoid"}
+    assert all(results[name]["points"] == 256 for name in results if name != "engine")
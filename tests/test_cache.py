@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from magnetism import FieldCache
+
+
+def test_results_are_shared_and_read_only():
+    cache = FieldCache()
+    first = cache.evaluate("dipole", 16, extent=1.0)
+    assert cache.evaluate("dipole", 16, extent=1.0) is first
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+    with pytest.raises(ValueError):
+        first[0][0, 0] = 1.0  # Handed to every session, so frozen
+
+
+def test_nested_parameters_are_keys():
+    cache = FieldCache()
+    sources = [("wire", {"current": 1.0}), ("uniform", {"by": 1e-5})]
+    first = cache.evaluate("superposition", 8, sources=sources)
+    assert cache.evaluate("superposition", 8, sources=[list(s) for s in sources]) is first
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = FieldCache(max_entries=2)
+    a = cache.evaluate("inverse_square", 10)
+    cache.evaluate("inverse_square", 20)
+    cache.evaluate("inverse_square", 10)  # a is now the most recently used
+    cache.evaluate("inverse_square", 30)
+    assert cache.evaluate("inverse_square", 10) is a
+    assert cache.stats().evictions == 1 and cache.stats().entries == 2
+
+
+def test_byte_budget():
+    cache = FieldCache(max_bytes=3 * 64 * 64 * 8)  # Room for one 64 x 64 pair of float64 grids, not two
+    cache.evaluate("dipole", 64)
+    cache.evaluate("wire", 64)
+    stats = cache.stats()
+    assert stats.entries == 1 and stats.nbytes == 2 * 64 * 64 * 8
+    big = cache.evaluate("dipole", 128)  # Larger than the whole budget: returned but not kept
+    assert isinstance(big[0], np.ndarray) and cache.stats().entries == 1
+
+
+def test_unknown_model():
+    with pytest.raises(ValueError, match="Unknown field model"):
+        FieldCache().evaluate("monopole", 8)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from magnetism import coil_maps, coil_table, effective_permeability, solenoid_axis_field
+from magnetism.coils import axis_profile
+from magnetism.fields import biot_savart, helix
+
+
+def test_axis_profile_matches_the_finite_solenoid():
+    # A tightly wound helix is close to the ideal finite solenoid, whose axial field is known in closed form.
+    # Interpolated points may be off by the sampler's 1% tolerance of the peak, plus a little for the winding pitch.
+    x, axis_bx = axis_profile(resolution=65, extent=0.08, turns=100, length=0.1, radius=0.02)
+    expected = solenoid_axis_field(x, current=1.0, turns=100, length=0.1, radius=0.02)
+    np.testing.assert_allclose(axis_bx, expected, atol=0.015 * expected.max())
+
+
+def test_adaptive_map_solves_part_and_interpolates_the_rest():
+    x, axis_bx, bx, by, evaluated = coil_maps(resolution=33, extent=0.08, turns=20)
+    assert bx.shape == by.shape == evaluated.shape == (33, 33)
+    assert 0.2 < evaluated.mean() < 0.9
+
+    axis = np.linspace(-0.08, 0.08, 33)
+    gx, gy = np.meshgrid(axis, axis)
+    points = np.column_stack([gx.ravel(), gy.ravel(), np.zeros(gx.size)])
+    exact = biot_savart(helix(20, 0.1, 0.02), points)[:, :2].reshape(33, 33, 2)
+    # Away from the windings (|y| near the radius, inside the coil's length) interpolation stays close.
+    far = ~((np.abs(np.abs(gy) - 0.02) < 0.01) & (np.abs(gx) < 0.06))
+    error = np.hypot(bx - exact[..., 0], by - exact[..., 1])
+    scale = np.hypot(exact[..., 0], exact[..., 1])
+    assert np.median(error[far] / scale[far]) < 0.01
+    np.testing.assert_allclose(bx[evaluated], exact[..., 0][evaluated], rtol=1e-9, atol=1e-15)
+
+
+def test_resolution_must_fit_the_lattice():
+    with pytest.raises(ValueError, match="1 plus a multiple of 8"):
+        coil_maps(resolution=32)
+
+
+def test_table_stacks_turn_counts():
+    x, axis_bx, bx, by = coil_table([5, 10], resolution=17, maps=False)
+    assert axis_bx.shape == (2, 17) and bx is None and by is None
+    np.testing.assert_allclose(axis_bx[1], 2 * axis_bx[0], rtol=0.05)  # Twice the turns, about twice the field
+
+
+def test_core_gain_is_limited_by_its_shape():
+    assert effective_permeability(1.0, 0.1, 0.02) == pytest.approx(1.0)
+    assert effective_permeability(5000.0, 0.04, 0.02) == pytest.approx(3.0, rel=0.01)  # A sphere-like rod: 1 / N = 3
+    long_rod = effective_permeability(5000.0, 1.0, 0.005)
+    assert 100 < long_rod < 5000
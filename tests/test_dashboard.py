@@ -0,0 +1,57 @@
+from contextlib import closing
+
+import pytest
+
+from classroom import Attempt, AttemptStore, Reflection, class_codes, load_dashboard
+
+
+def attempt(attempt_id, student, class_code, marks):
+    responses = tuple(
+        (question, "topic", 0, mark)
+        for question, mark in zip(("distance_law", "inverse_square_value:k=50,r=2", "field_purpose"), marks)
+    )
+    return Attempt(attempt_id, "s", student, class_code, "q", 1.0, sum(marks), len(marks), responses)
+
+
+@pytest.fixture
+def connection(tmp_path):
+    store = AttemptStore(tmp_path / "lesson.db", max_delay=0.01)
+    store.append([
+        attempt("a1", "Ada", "PHYS1", (True, True, True)),
+        attempt("a2", "Ada", "PHYS1", (True, False, False)),
+        attempt("a3", "Grace", "PHYS1", (False, False, False)),
+        attempt("a4", "Alan", "PHYS2", (True, True, False)),
+        Reflection("r1", "s", "Grace", "PHYS1", 1.0, "Field lines never cross."),
+        Reflection("r2", "s", "Emmy", "", 1.0, "No class code."),
+    ]).result(timeout=5)
+    with closing(store.reader()) as connection:
+        yield connection
+
+
+def test_class_summaries(connection):
+    dashboard = load_dashboard(connection)
+    assert [(c["code"], c["students"], c["attempted"], c["reflected"], c["attempts"]) for c in dashboard.classes] == [
+        ("(no class code)", 1, 0, 1, 0),
+        ("PHYS1", 2, 2, 1, 3),
+        ("PHYS2", 1, 1, 0, 1),
+    ]
+    assert class_codes(connection) == ["", "PHYS1", "PHYS2"]
+
+
+def test_question_accuracy_merges_parametric_variants(connection):
+    questions = {q["question"]: q for q in load_dashboard(connection, ["PHYS1"]).questions}
+    assert set(questions) == {"distance_law", "inverse_square_value", "field_purpose"}
+    assert questions["distance_law"]["answered"] == 3
+    assert questions["distance_law"]["accuracy"] == pytest.approx(2 / 3)
+    assert questions["inverse_square_value"]["title"] == "Evaluate k / r² (parametric)"
+
+
+def test_score_bands(connection):
+    scores = load_dashboard(connection).scores
+    assert len(scores) == 11 and sum(scores) == 4
+    assert (scores[0], scores[3], scores[6], scores[10]) == (1, 1, 1, 1)  # 0%, 33%, 67% and a perfect score
+
+
+def test_no_classes_selected(connection):
+    dashboard = load_dashboard(connection, [])
+    assert dashboard.classes == [] and dashboard.questions == [] and sum(dashboard.scores) == 0
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from magnetism.encoding import INT16_OUTSIDE, quantize_directions, quantize_int16
+
+
+def test_directions_and_strength():
+    bx = np.array([1.0, 0.0, -1.0, 0.0, 10.0])
+    by = np.array([0.0, 1.0, 0.0, -1.0, 0.0])
+    angle, strength = quantize_directions(bx, by)
+    assert angle.tolist() == [0, 64, 128, 192, 0]
+    assert strength.dtype == np.uint8
+    assert strength[4] == 255 and strength[0] == 0
+
+
+@pytest.mark.parametrize("bx, by", [
+    (np.zeros((0, 0)), np.zeros((0, 0))),
+    (np.zeros((3, 4)), np.zeros((3, 4))),
+    (np.full(5, np.nan), np.full(5, np.nan)),
+])
+def test_field_without_finite_samples_encodes_as_zeros(bx, by):
+    angle, strength = quantize_directions(bx, by)
+    assert angle.shape == strength.shape == bx.shape
+    assert not angle.any() and not strength.any()
+
+
+def test_int16_marks_values_outside_the_extent():
+    encoded = quantize_int16([0.0, 1.0, -1.0, 2.0, np.nan], extent=1.0)
+    assert encoded.tolist() == [0, 32767, -32767, INT16_OUTSIDE, INT16_OUTSIDE]
@@ -0,0 +1,91 @@
+import csv
+import io
+from contextlib import closing
+
+import numpy as np
+import pytest
+
+from classroom import Attempt, AttemptStore
+from classroom.export import (
+    Table, attempts_table, field_curve, field_grid, iter_csv, iter_export, lab_table, responses_table, spool_export,
+)
+from magnetism import fields
+
+
+def read_csv(parts):
+    return list(csv.reader(io.StringIO(b"".join(parts).decode("utf-8"))))
+
+
+def test_csv_streams_one_chunk_at_a_time():
+    produced = []
+
+    def chunks():
+        for first in range(0, 30, 10):
+            produced.append(first)
+            yield {"n": np.arange(first, first + 10), "label": [f"row {i}" for i in range(first, first + 10)]}
+
+    parts = iter_csv(Table((("n", "int64"), ("label", "string")), chunks()))
+    first = next(parts)
+    assert produced == [0]  # Nothing beyond the first chunk has been computed yet
+    rows = read_csv([first, *parts])
+    assert rows[0] == ["n", "label"] and len(rows) == 31 and rows[-1] == ["29", "row 29"]
+
+
+def test_field_curve_matches_the_model():
+    rows = read_csv(iter_export(field_curve(k=50.0, start=1.0, stop=5.0, resolution=250, chunk_rows=64), "csv"))[1:]
+    distance, strength = np.array(rows, dtype=float).T
+    np.testing.assert_allclose(distance, np.linspace(1.0, 5.0, 250))
+    np.testing.assert_allclose(strength, fields.field_strength(distance, 50.0))
+
+
+def test_parquet_has_a_row_group_per_chunk():
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(iter_export(field_grid("wire", resolution=20, chunk_rows=100), "parquet"))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 4  # Five grid rows of 20 points per chunk
+    table = parquet.read()
+    x, y = fields.grid(20, 2.0)
+    bx, by = fields.wire_field(x, y)
+    np.testing.assert_allclose(table.column("bx").to_numpy(), bx.ravel())
+    np.testing.assert_allclose(table.column("magnitude").to_numpy(), np.hypot(bx, by).ravel())
+
+
+def test_stored_results_stream_through_a_cursor(tmp_path):
+    store = AttemptStore(tmp_path / "lesson.db", max_delay=0.01)
+    responses = (("distance_law", "inverse_square", 1, True), ("field_purpose", "fields", 0, False))
+    store.append([
+        Attempt(f"a{i}", "s", f"student {i}", "PHYS1" if i % 2 else "PHYS2", "q", float(i), 1, 2, responses)
+        for i in range(5)
+    ]).result(timeout=5)
+    with closing(store.reader()) as connection:
+        attempts = read_csv(iter_csv(attempts_table(connection, chunk_rows=2)))
+        assert [row[0] for row in attempts[1:]] == ["a0", "a1", "a2", "a3", "a4"]
+        answered = read_csv(iter_csv(responses_table(connection, ["PHYS1"], chunk_rows=3)))
+        assert answered[0][:4] == ["attempt_id", "class_code", "student", "position"]
+        assert [(row[0], row[3]) for row in answered[1:]] == [("a1", "0"), ("a1", "1"), ("a3", "0"), ("a3", "1")]
+
+
+def test_empty_table_is_just_a_header():
+    assert read_csv(iter_csv(Table((("a", "int64"),), iter(())))) == [["a"]]
+
+
+def test_spooled_export_is_rewound():
+    spool = spool_export(lab_table("electromagnet", 3), "csv")
+    rows = read_csv([spool.read()])
+    assert rows[0] == ["current", "coils", "strength"] and len(rows) == 1 + 3 * 100
+
+
+@pytest.mark.parametrize("args, message", [
+    (("field-map", 10), "Unknown lab dataset"),
+    (("field-grid", 5000), "between 2 and 4096"),
+    (("field-grid", 10, "monopole"), "Unknown grid model"),
+    (("field-grid", 130, "solenoid_plane"), "between 2 and 129"),
+])
+def test_lab_table_checks_its_arguments(args, message):
+    with pytest.raises(ValueError, match=message):
+        lab_table(*args)
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError, match="Unknown export format"):
+        iter_export(field_curve(resolution=2), "xlsx")
@@ -0,0 +1,75 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from magnetism.fields import MU_0, bar_magnet_field, dipole_field, grid, solenoid_plane_field, wire_field
+
+KERNELS_FILE = Path(__file__).resolve().parent.parent / "lesson_component" / "frontend" / "widgets" / "field-kernels.js"
+NODE = shutil.which("node")
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="Node is not installed")
+
+
+def run_kernel(model, params, x, y):
+    """``(bx, by)`` from the browser kernel ``FieldKernels.bind(model, params)`` at the points ``(x, y)``."""
+    script = f"""
+globalThis.window = globalThis;
+{KERNELS_FILE.read_text()}
+const [model, params, xs, ys] = {json.dumps([model, params, np.ravel(x).tolist(), np.ravel(y).tolist()])};
+const x = Float64Array.from(xs);
+const y = Float64Array.from(ys);
+const [bx, by] = FieldKernels.bind(model, params)(x, y, new Float64Array(x.length), new Float64Array(x.length));
+console.log(JSON.stringify([Array.from(bx), Array.from(by)]));
+"""
+    output = subprocess.run([NODE, "-e", script], capture_output=True, text=True, check=True).stdout
+    bx, by = json.loads(output)
+    return np.reshape(bx, np.shape(x)), np.reshape(by, np.shape(x))
+
+
+@pytest.mark.parametrize("model, params, reference", [
+    ("dipole", {"moment": 2.0}, lambda x, y: dipole_field(x, y, moment=2.0)),
+    ("bar_magnet", {"length": 0.6, "x0": 0.2}, lambda x, y: bar_magnet_field(x, y, length=0.6, x0=0.2)),
+    ("wire", {"current": -3.0, "y0": 0.5}, lambda x, y: wire_field(x, y, current=-3.0, y0=0.5)),
+])
+def test_kernels_match_the_python_models(model, params, reference):
+    x, y = grid(33, 2.0)
+    bx, by = run_kernel(model, params, x, y)
+    expected_bx, expected_by = reference(x, y)
+    np.testing.assert_allclose(bx, expected_bx, rtol=1e-12, atol=0)
+    np.testing.assert_allclose(by, expected_by, rtol=1e-12, atol=0)
+
+
+def test_singular_points_are_zero():
+    for model in ("dipole", "wire"):
+        bx, by = run_kernel(model, {}, np.zeros(1), np.zeros(1))
+        assert bx[0] == 0 and by[0] == 0
+
+
+def test_solenoid_on_axis_is_the_sum_of_its_loops():
+    x = np.linspace(-2.0, 2.0, 41)
+    bx, by = run_kernel("solenoid_plane", {"turns": 10, "length": 2.0, "radius": 0.5, "current": 2.0}, x, np.zeros_like(x))
+    centres = -1.0 + (np.arange(10) + 0.5) * 0.2
+    z = x[:, None] - centres[None, :]
+    expected = (MU_0 * 2.0 * 0.25 / (2.0 * (0.25 + z * z) ** 1.5)).sum(axis=1)
+    np.testing.assert_allclose(bx, expected, rtol=1e-12)
+    assert not by.any()
+
+
+def test_solenoid_follows_the_helix_away_from_the_windings():
+    # The kernel stacks circular loops where the server sums a helix; they agree except right next to the wire.
+    x, y = grid(41, 2.0)
+    bx, by = run_kernel("solenoid_plane", {}, x, y)
+    expected_bx, expected_by = solenoid_plane_field(x, y)
+    away = np.abs(np.abs(y) - 0.5) > 0.15
+    error = np.hypot(bx - expected_bx, by - expected_by)[away]
+    assert error.max() < 0.05 * np.hypot(expected_bx, expected_by).max()
+    assert np.median(error / np.hypot(expected_bx, expected_by)[away]) < 0.01
+
+
+def test_models_without_a_kernel():
+    script = f"globalThis.window = globalThis;\n{KERNELS_FILE.read_text()}\nconsole.log(FieldKernels.bind('coil', {{}}));"
+    assert subprocess.run([NODE, "-e", script], capture_output=True, text=True, check=True).stdout.strip() == "null"
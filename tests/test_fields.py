@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from magnetism import coil_table, fields
+from magnetism.fields import MU_0
+
+
+def test_inverse_square():
+    assert fields.field_strength([1.0, 2.0, 10.0], k=100.0).tolist() == [100.0, 25.0, 1.0]
+
+
+def test_dipole_axis_equator_and_origin():
+    bx, by = fields.dipole_field([0.0, 2.0, 0.0], [2.0, 0.0, 0.0], moment=1.0)
+    np.testing.assert_allclose(bx, [0.0, 0.0, 0.0], atol=1e-15)
+    np.testing.assert_allclose(by, [2 / 8, -1 / 8, 0.0])  # 2m / r^3 on the axis, -m / r^3 on the equator
+
+
+def test_wire_circulates_counter_clockwise():
+    bx, by = fields.wire_field([0.5, 0.0, 0.0], [0.0, 0.5, 0.0], current=2.0)
+    expected = MU_0 * 2.0 / (2 * np.pi * 0.5)
+    np.testing.assert_allclose(bx, [0.0, -expected, 0.0], atol=1e-20)
+    np.testing.assert_allclose(by, [expected, 0.0, 0.0], atol=1e-20)
+
+
+def test_bar_magnet_points_away_from_north():
+    bx, by = fields.bar_magnet_field([2.0, -2.0], [0.0, 0.0], length=1.0)
+    assert bx[0] > 0 and bx[1] > 0  # Out of the north pole at +x, into the south pole at -x
+    np.testing.assert_allclose(by, 0.0)
+
+
+def test_superposition_adds_sources():
+    x, y = fields.grid(9, 1.0)
+    sources = [("uniform", {"bx": 0.0, "by": 1e-5}), ("wire", {"current": 3.0, "x0": 0.25})]
+    bx, by = fields.superposed_field(x, y, sources)
+    wire_bx, wire_by = fields.wire_field(x, y, 3.0, x0=0.25)
+    np.testing.assert_allclose(bx, wire_bx)
+    np.testing.assert_allclose(by, wire_by + 1e-5)
+    with pytest.raises(ValueError, match="Unknown field source"):
+        fields.superposed_field(x, y, [("monopole", {})])
+
+
+def test_long_solenoid_centre_matches_mu0_n_i():
+    inside = fields.solenoid_axis_field(0.0, current=2.0, turns=1000, length=1.0, radius=0.01)
+    assert inside == pytest.approx(MU_0 * 1000 * 2.0, rel=1e-3)
+
+
+def test_electromagnet_strength_is_the_lesson_coils_centre_field():
+    turns = np.array([1, 10, 50, 100])
+    expected = fields.solenoid_axis_field(0.0, current=2.5, turns=turns, length=0.1, radius=0.02) * 1e3
+    np.testing.assert_allclose(fields.electromagnet_strength(2.5, turns), expected, rtol=1e-12)
+    _, axis, _, _ = coil_table(turns, 65, maps=False, extent=0.08, length=0.1, radius=0.02)
+    np.testing.assert_allclose(fields.electromagnet_strength(1.0, turns), axis[:, 32] * 1e3, rtol=0.002)
+
+
+def test_biot_savart_loop_centre():
+    phi = np.linspace(0.0, 2 * np.pi, 2001)
+    radius = 0.05
+    loop = np.stack([np.zeros_like(phi), radius * np.cos(phi), radius * np.sin(phi)], axis=1)
+    field = fields.biot_savart(loop, [[0.0, 0.0, 0.0]], current=1.5)
+    np.testing.assert_allclose(field[0], [MU_0 * 1.5 / (2 * radius), 0.0, 0.0], rtol=1e-5, atol=1e-12)
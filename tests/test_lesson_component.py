@@ -0,0 +1,66 @@
+from lesson_component import acknowledgement, apply_message, held_patches
+
+
+def new_client():
+    return {"mount": None, "seq": 0, "event_id": 0, "state": {}}
+
+
+def message(mount, seq, state=None, events=()):
+    return {"mount": mount, "seq": seq, "have": {"sections": {}, "patches": {}}, "state": state or {}, "events": list(events)}
+
+
+def event(event_id, seq, kind="quiz_submitted"):
+    return {"id": event_id, "seq": seq, "type": kind, "payload": {}}
+
+
+def test_events_are_delivered_once():
+    client = new_client()
+    first = message("a", 1, {"current": 2}, [event(1, 1)])
+    assert [e["id"] for e in apply_message(client, first)] == [1]
+    # The same value is seen again on every rerun until the browser sends another.
+    assert apply_message(client, first) == []
+    second = message("a", 2, events=[event(1, 1), event(2, 2)])  # Event 1 not acknowledged yet, so repeated
+    assert [e["id"] for e in apply_message(client, second)] == [2]
+    assert client["state"] == {"current": 2}
+    assert acknowledgement(client) == {"mount": "a", "seq": 2}
+
+
+def test_remount_restarts_the_sequence():
+    client = new_client()
+    apply_message(client, message("a", 7, events=[event(1, 3), event(2, 7)]))
+    # The remounted page numbers from 1 again; its events must not be mistaken for old ones.
+    events = apply_message(client, message("b", 1, {"strand": "x"}, [event(1, 1, "reflection_submitted")]))
+    assert [(e["id"], e["type"]) for e in events] == [(1, "reflection_submitted")]
+    assert acknowledgement(client) == {"mount": "b", "seq": 1}
+    assert client["state"]["strand"] == "x"
+
+
+def test_stale_message_from_the_old_mount_does_not_reset():
+    client = new_client()
+    old = message("a", 5, events=[event(3, 5)])
+    apply_message(client, old)
+    assert apply_message(client, old) == []
+    assert acknowledgement(client) == {"mount": "a", "seq": 5}
+
+
+def test_sequence_going_backwards_restarts():
+    client = new_client()
+    apply_message(client, message(None, 9, events=[event(4, 9)]))
+    events = apply_message(client, message(None, 1, events=[event(1, 1)]))
+    assert [e["id"] for e in events] == [1]
+
+
+def test_no_message_yet():
+    client = new_client()
+    assert apply_message(client, None) == []
+    assert acknowledgement(client) == {"mount": None, "seq": 0}
+
+
+def test_held_patches_include_replaced_ones():
+    # The browser shows the "wire" grid now but still holds the "north" one it was sent before.
+    have = {"sections": {}, "patches": {"compass": "b2", "coil": "c1"}, "held": ["a1", "b2", "c1"]}
+    assert held_patches(have) == {"a1", "b2", "c1"}
+
+
+def test_held_patches_without_a_held_list():
+    assert held_patches({"sections": {}, "patches": {"compass": "b2"}}) == {"b2"}
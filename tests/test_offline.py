@@ -0,0 +1,29 @@
+import json
+
+from lesson_engine.offline import COMPONENT_URL, precache_urls, service_worker_script
+from lesson_engine.runtime import FRONTEND_DIR, file_hash
+
+PREFIX = "const LESSON_OFFLINE = "
+
+
+def offline_config(script):
+    header = script.split("\n", 1)[0]
+    assert header.startswith(PREFIX) and header.endswith(";")
+    return json.loads(header[len(PREFIX):-1])
+
+
+def test_precache_covers_the_page_component_and_runtime():
+    urls = precache_urls("lesson-runtime")
+    assert urls[0] == "./"
+    assert f"{COMPONENT_URL}/index.html" in urls
+    assert f"lesson-runtime/runtime.js?v={file_hash('runtime.js')}" in urls
+    assert f"lesson-runtime/widgets/particles.js?v={file_hash('widgets/particles.js')}" in urls
+    assert len(urls) == len(set(urls))
+
+
+def test_service_worker_is_versioned_by_what_it_precaches():
+    script = service_worker_script("lesson-runtime")
+    config = offline_config(script)
+    assert config["precache"] == precache_urls("lesson-runtime")
+    assert script.split("\n", 1)[1] == (FRONTEND_DIR / "sw.js").read_text(encoding="utf-8")
+    assert offline_config(service_worker_script("other-runtime"))["version"] != config["version"]
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from lesson_engine import page
+from lesson_engine.page import valid_event
+
+
+@pytest.mark.parametrize("event", [
+    {"id": 1, "type": "quiz_submitted", "payload": {"quizId": "q", "answers": [0, None, 2]}},
+    {"id": 2, "type": "quiz_retry", "payload": {"quizId": "q"}},
+    {"id": 3, "type": "quiz_retry"},
+    {"id": 4, "type": "reflection_submitted", "payload": {"text": "Field lines never cross."}},
+    {"id": 5, "type": "study_plan_generated", "payload": {"level": "Beginner - new", "time": "2 hours"}},
+])
+def test_valid_events(event):
+    assert valid_event(event)
+
+
+@pytest.mark.parametrize("event", [
+    None,
+    ["quiz_submitted"],
+    {"id": 1, "type": "unknown", "payload": {}},
+    {"id": 1, "type": "quiz_submitted"},
+    {"id": 1, "type": "quiz_submitted", "payload": "answers"},
+    {"id": 1, "type": "quiz_submitted", "payload": {"quizId": "q", "answers": "0,1,2"}},
+    {"id": 1, "type": "quiz_submitted", "payload": {"answers": [0]}},
+    {"id": 1, "type": "reflection_submitted", "payload": {"text": 42}},
+    {"id": 1, "type": "study_plan_generated", "payload": {"level": "Beginner"}},
+])
+def test_malformed_events_are_ignored(event):
+    assert not valid_event(event)
+
+
+def write_bundle(static, files):
+    manifest = {}
+    for name, content in files.items():
+        (static / name).parent.mkdir(parents=True, exist_ok=True)
+        (static / name).write_bytes(content)
+        manifest[name] = {"hash": "0" * 12, "bytes": len(content)}
+    (static / "manifest.json").write_text(json.dumps(manifest))
+
+
+def test_bundle_is_used_only_when_complete(tmp_path, monkeypatch):
+    monkeypatch.setattr(page, "STATIC_DIR", tmp_path)
+    assert page.bundle_manifest() is None  # Never built
+    write_bundle(tmp_path, {"css/lesson.min.css": b"body{}", "vendor/chart.umd.min.js": b"//"})
+    assert set(page.bundle_manifest()) == {"css/lesson.min.css", "vendor/chart.umd.min.js"}
+    (tmp_path / "vendor" / "chart.umd.min.js").unlink()
+    assert page.bundle_manifest() is None  # A partial build falls back to the CDNs
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from magnetism import PARTICLE_FIELDS, boris_push, launch
+
+
+def speeds(velocity):
+    return np.linalg.norm(velocity, axis=1)
+
+
+@pytest.mark.parametrize("name", sorted(PARTICLE_FIELDS))
+def test_magnetic_field_does_no_work(name):
+    # A pure magnetic field only turns velocities, so every particle's kinetic energy is conserved.
+    position, velocity, q_over_m = launch(500, directions="isotropic", seed=3)
+    _, _, final = boris_push(position, velocity, q_over_m, PARTICLE_FIELDS[name], dt=0.05, steps=2000, record_every=100)
+    np.testing.assert_allclose(speeds(final) ** 2, speeds(velocity) ** 2, rtol=1e-10)
+
+
+def test_cyclotron_orbit_closes_after_one_period():
+    position = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    velocity = np.array([[0.5, 0.0, 0.0], [0.0, 0.2, 0.0]])
+    steps = 2000
+    frames, final, _ = boris_push(position, velocity, np.array([1.0, -1.0]), PARTICLE_FIELDS["uniform"], 2 * np.pi / steps, steps)
+    np.testing.assert_allclose(final, position, atol=1e-5)  # Period 2 pi m / (q B) = 2 pi
+    radius = np.ptp(frames[:, 0, 1]) / 2
+    assert radius == pytest.approx(0.5, rel=1e-3)  # Larmor radius v / (q B / m)
+
+
+def test_uniform_fast_path_matches_the_general_step():
+    position, velocity, q_over_m = launch(64, directions="isotropic", seed=1)
+    b = (0.2, -0.4, 1.0)
+
+    def as_arrays(x, y, z):
+        return np.full_like(x, b[0]), np.full_like(x, b[1]), np.full_like(x, b[2])
+
+    fast = boris_push(position, velocity, q_over_m, lambda x, y, z: b, 0.1, 300)
+    general = boris_push(position, velocity, q_over_m, as_arrays, 0.1, 300)
+    for fast_part, general_part in zip(fast, general):
+        np.testing.assert_allclose(fast_part, general_part, rtol=1e-9, atol=1e-9)
+
+
+def test_recording():
+    position, velocity, q_over_m = launch(10, seed=0)
+    frames, _, _ = boris_push(position, velocity, q_over_m, PARTICLE_FIELDS["gradient"], 0.1, 50, record_every=10, record=4)
+    assert frames.shape == (6, 4, 3) and frames.dtype == np.float32
+    np.testing.assert_allclose(frames[0], position[:4], rtol=1e-6)
+
+
+def test_launch_is_reproducible():
+    first = launch(100, seed=7)
+    second = launch(100, seed=7)
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
+    with pytest.raises(ValueError, match="Unknown launch directions"):
+        launch(10, directions="radial")
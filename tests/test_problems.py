@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from classroom.problems import (
+    FAMILIES, FAMILY_NAMES, check_answers, generate, iter_printable_html, parse_responses, problem_space,
+)
+
+
+def test_problem_space_counts_distinct_questions():
+    batch = generate(problem_space(), seed=0)
+    assert len({batch.prompt(i) for i in range(len(batch))}) == len(batch) == problem_space()
+
+
+@pytest.mark.parametrize("family", FAMILIES, ids=FAMILY_NAMES)
+def test_every_number_in_a_prompt_changes_the_answer(family):
+    # Otherwise problems that differ only in that number are the same question reworded.
+    grid = np.meshgrid(*family.axes, indexing="ij")
+    shown = [column for column in family.build(*(axis.ravel() for axis in grid))[:3] if column.any()]
+    answer = [f"{value:.10g}" for value in family.build(*(axis.ravel() for axis in grid))[3]]  # Beyond rounding
+    for dropped in range(len(shown)):
+        others = [column for i, column in enumerate(shown) if i != dropped]
+        assert len(set(zip(*others, answer))) > len(set(zip(*others)))
+
+
+def test_batches_are_unique_and_reproducible():
+    batch = generate(2000, seed=5)
+    assert len({batch.prompt(i) for i in range(len(batch))}) == len(batch) == 2000
+    again = generate(2000, seed=5)
+    np.testing.assert_array_equal(batch.answer, again.answer)
+    assert set(batch.family.tolist()) == set(range(len(FAMILY_NAMES)))
+
+
+def test_answers_solve_their_prompts():
+    batch = generate(400, seed=1)
+    assert check_answers(batch, batch.answer).all()
+    assert check_answers(batch, batch.answer * 1.015).all()  # Rounded working within 2% still counts
+    assert not check_answers(batch, batch.answer * 1.05).any()
+
+
+def test_typed_responses():
+    parsed = parse_responses(["1,250", " 3.5 ", "", "about 4", None])
+    np.testing.assert_array_equal(parsed[:2], [1250.0, 3.5])
+    assert np.isnan(parsed[2:]).all()
+    batch = generate(5, seed=2)
+    assert not check_answers(batch, np.full(5, np.nan)).any()  # Blank answers are always wrong
+
+
+def test_problem_space_limits_a_batch():
+    family = FAMILY_NAMES[0]
+    with pytest.raises(ValueError, match="unique problems"):
+        generate(problem_space([family]) + 1, families=[family])
+    assert (generate(10, seed=0, families=[family]).family == 0).all()
+
+
+def test_printable_worksheets_stream_by_sheet():
+    batch = generate(25, seed=3)
+    parts = list(iter_printable_html(batch, per_sheet=10, title="Unit <3>"))
+    assert len(parts) == 1 + 3 + 3 + 1  # Head, three worksheets, three answer keys, tail
+    document = "".join(parts)
+    assert "Unit &lt;3&gt;: Worksheet 3" in document and document.count("<li>") == 50
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from classroom import BatchGrader, issue_quiz
+from magnetism import fields
+
+
+class RecordingStore:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def append(self, records):
+        with self.lock:
+            self.batches.append(list(records))
+
+
+def test_public_quiz_has_no_answer_key():
+    quiz = issue_quiz(seed=1)
+    public = quiz.public()
+    assert public["id"] == quiz.id
+    assert [q["id"] for q in public["questions"]] == [q.id for q in quiz.questions]
+    assert all(set(q) == {"id", "prompt", "options"} for q in public["questions"])
+
+
+def test_same_seed_same_questions():
+    assert issue_quiz(seed=4).questions == issue_quiz(seed=4).questions
+    assert issue_quiz(seed=4).id != issue_quiz(seed=4).id  # Every issued quiz is its own attempt
+
+
+def test_electromagnet_question_uses_the_lessons_coil():
+    for seed in range(40):
+        question = next((q for q in issue_quiz(seed=seed).questions if q.id.startswith("electromagnet:")), None)
+        if question is not None:
+            break
+    current, coils = (float(part.split("=")[1]) for part in question.id.split(":")[1].split(","))
+    assert "0.5 ×" not in question.prompt
+    assert question.options[question.answer] == f"{fields.electromagnet_strength(current, coils):.4g} mT"
+    assert len(set(question.options)) == 4
+
+
+def test_grading_and_stored_attempt():
+    store = RecordingStore()
+    grader = BatchGrader(store)
+    quiz = issue_quiz(seed=2)
+    key = [q.answer for q in quiz.questions]
+    answers = [key[0], (key[1] + 1) % len(quiz.questions[1].options), None, "2", 99]
+    result = grader.submit(quiz, answers, "s1", "Ada", "PHYS1").result(timeout=5)
+    assert result.marks[:2] == (True, False) and not any(result.marks[2:])  # Blank, non-int and out of range are wrong
+    assert (result.correct, result.total) == (1, len(quiz.questions))
+
+    perfect = grader.submit(quiz, key, "s1", "Ada", "PHYS1").result(timeout=5)
+    assert perfect.correct == perfect.total
+    (attempt,) = [a for batch in store.batches for a in batch if a.correct == perfect.total]
+    assert attempt.responses[0][:3] == (quiz.questions[0].id, quiz.questions[0].topic, key[0])
+
+
+def test_submissions_are_graded_in_batches():
+    store = RecordingStore()
+    grader = BatchGrader(store, max_delay=0.2)
+    quizzes = [issue_quiz(seed=seed) for seed in range(50)]
+    futures = [grader.submit(quiz, [q.answer for q in quiz.questions]) for quiz in quizzes]
+    results = [future.result(timeout=5) for future in futures]
+    assert all(r.correct == r.total for r in results)
+    assert [r.quiz_id for r in results] == [q.id for q in quizzes]
+    assert sum(len(batch) for batch in store.batches) == 50 and len(store.batches) < 50
+
+
+def test_a_failed_batch_fails_its_futures_and_the_grader_carries_on():
+    grader = BatchGrader(max_delay=0.0)
+    quiz = issue_quiz(seed=3)
+    with pytest.raises(TypeError):
+        grader.submit(quiz, 7).result(timeout=5)  # Not a list of answers
+    assert grader.submit(quiz, []).result(timeout=5).correct == 0
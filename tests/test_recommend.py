@@ -0,0 +1,55 @@
+import copy
+import itertools
+
+import pytest
+
+from lesson_engine.recommend import build_recommendations, check_study_plan, compose_plan
+
+STUDY_PLAN = {
+    "levels": [
+        {"label": "Beginner - new", "name": "Beginner", "steps": ["Read the concepts."]},
+        {"label": "Advanced - ready", "name": "Advanced", "steps": ["Derive the field.", "Build a coil."]},
+    ],
+    "times": ["1 hour", "3 hours"],
+    "paces": ["One section a week.", "Two sections a week."],
+    "quizBands": [{"minScore": None, "advice": "Take the quiz."}, {"minScore": 0, "advice": "Review."}, {"minScore": 0.8, "advice": "Stretch."}],
+}
+STRANDS = [
+    {"name": "Fields", "links": [{"name": "Khan", "url": "https://example.org/k"}]},
+    {"name": "Motors", "links": []},
+]
+
+
+def test_every_combination_is_precomputed():
+    table = build_recommendations(STUDY_PLAN, STRANDS)
+    levels, times, strands, bands = 2, 2, 2, 3
+    assert len(table["plans"]) == levels * times * strands * bands
+    assert table["bands"] == [None, 0, 0.8] and table["strands"] == 2
+    for level, time, strand, band in itertools.product(range(levels), range(times), range(strands), range(bands)):
+        plan = table["plans"][((level * times + time) * strands + strand) * bands + band]
+        expected = compose_plan(STUDY_PLAN["levels"][level], STUDY_PLAN["paces"][time], STRANDS[strand], STUDY_PLAN["quizBands"][band])
+        assert [table["steps"][step] for step in plan] == expected
+
+
+def test_shared_steps_are_sent_once():
+    table = build_recommendations(STUDY_PLAN, STRANDS)
+    keys = [(step["text"], step.get("url")) for step in table["steps"]]
+    assert len(keys) == len(set(keys))
+
+
+def test_lesson_without_strands():
+    table = build_recommendations(STUDY_PLAN, [])
+    assert table["strands"] == 1 and len(table["plans"]) == 12
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda plan: plan["paces"].pop(), "one pace per time budget"),
+    (lambda plan: plan["quizBands"].pop(0), "no attempt"),
+    (lambda plan: plan["quizBands"][2].update(minScore=-1), "start at 0 and increase"),
+    (lambda plan: plan["quizBands"][1].update(minScore=0.5), "start at 0 and increase"),
+])
+def test_study_plan_checks(change, message):
+    plan = copy.deepcopy(STUDY_PLAN)
+    change(plan)
+    with pytest.raises(ValueError, match=message):
+        check_study_plan(plan)
@@ -0,0 +1,53 @@
+import inspect
+import re
+
+from lesson_engine import visualizations
+from lesson_engine.runtime import CORE_WIDGETS, FRONTEND_DIR, RUNTIME_PATHS, WIDGET_SCRIPTS, file_hash, runtime_assets
+
+
+def hrefs(assets):
+    return [asset["href"].split("?")[0] for asset in assets]
+
+
+def test_core_widgets_load_only_the_runtime():
+    assert hrefs(runtime_assets(CORE_WIDGETS)) == ["lesson.css", "runtime.js"]
+
+
+def test_widget_scripts_load_once_in_order():
+    names = hrefs(runtime_assets(["compass", "fieldStrengthChart", "electromagnetChart", "fieldLines"]))
+    assert names == [
+        "lesson.css",
+        "runtime.js",
+        "widgets/fieldlines.js",
+        "widgets/compass.js",
+        "widgets/field-kernels.js",
+        "widgets/magnetism-charts.js",
+    ]
+
+
+def test_urls_carry_content_hashes():
+    component = runtime_assets(["particleLab"])
+    served = runtime_assets(["particleLab"], "lesson-runtime")
+    assert component[-1] == {
+        "kind": "script",
+        "href": f"widgets/particles.js?v={file_hash('widgets/particles.js')}",
+        "base": "component",
+    }
+    assert served[-1] == {"kind": "script", "href": f"lesson-runtime/widgets/particles.js?v={file_hash('widgets/particles.js')}"}
+
+
+def test_every_runtime_path_exists():
+    assert {name for scripts in WIDGET_SCRIPTS.values() for name in scripts} <= RUNTIME_PATHS
+    for name in RUNTIME_PATHS:
+        assert len(file_hash(name)) == 12
+
+
+def test_widgets_only_report_state_the_server_reads():
+    # Every reported value reruns the page, so slider drags the server ignores must stay in the browser.
+    reported = {
+        key
+        for script in (FRONTEND_DIR / "widgets").glob("*.js")
+        for key in re.findall(r"lessonBridge\.update\('(\w+)'", script.read_text())
+    }
+    read = set(re.findall(r'state\.get\("(\w+)"', inspect.getsource(visualizations)))
+    assert reported == read == {"fieldLineSource", "compassScenario", "coils", "particleScene"}
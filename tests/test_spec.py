@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from lesson_engine import load_lesson
+
+LESSON_DIR = Path(__file__).resolve().parent.parent / "lessons" / "magnetism"
+
+
+def write_lesson(directory, sections, **extra):
+    (directory / "sections").mkdir()
+    entries = []
+    for section_id, html, widgets in sections:
+        (directory / "sections" / f"{section_id}.html").write_text(html)
+        entries.append({"id": section_id, "template": f"sections/{section_id}.html", "nav": section_id, "widgets": widgets})
+    spec = {"title": "Optics", "topic": "Light", "sections": entries, "quiz": {"bank": "magnetism", "feedback": {}}}
+    spec.update(extra)
+    (directory / "lesson.json").write_text(json.dumps(spec))
+    return directory
+
+
+def test_magnetism_lesson_loads():
+    spec = load_lesson(LESSON_DIR)
+    assert spec.slug == "magnetism"
+    assert spec.widgets[:2] == ("studentInfo", "compass") and len(set(spec.widgets)) == len(spec.widgets)
+    shell = spec.shell()
+    assert [s["id"] for s in shell["sections"]] == [s.id for s in spec.sections]
+    assert set(shell["quizFeedback"]) >= {"perfect", "partial"}
+
+
+def test_minimal_lesson_gets_defaults(tmp_path):
+    spec = load_lesson(write_lesson(tmp_path, [("intro", '<section id="intro"></section>', ["quiz"])]))
+    assert spec.slug == tmp_path.name and spec.height == 1000 and spec.visualizations == {}
+    assert spec.widgets == ("quiz",)
+
+
+@pytest.mark.parametrize("sections, extra, message", [
+    ([("intro", "<section></section>", [])], {}, "no element with id 'intro'"),
+    ([("intro", '<section id="intro"></section>', ["hologram"])], {}, "unknown widgets"),
+    ([("intro", '<section id="intro"></section>', [])], {"quiz": {"bank": "optics"}}, "Unknown quiz bank"),
+    ([("intro", '<section id="intro"></section>', [])], {"visualizations": {"prism": {}}}, "Unknown visualizations"),
+])
+def test_inconsistent_specs_are_rejected(tmp_path, sections, extra, message):
+    with pytest.raises(ValueError, match=message):
+        load_lesson(write_lesson(tmp_path, sections, **extra))
+
+
+def test_sliders_are_read_from_the_templates():
+    sliders = load_lesson(LESSON_DIR).sliders
+    assert sliders["distance-slider"] == {"min": 1.0, "max": 10.0, "step": 0.1, "value": 1.0}
+    assert set(sliders) == {"distance-slider", "k-slider", "current-slider", "coils-slider"}
+
+
+def test_slider_attributes_default_like_a_browser(tmp_path):
+    html = '<section id="lab"><input type="range" id="a"><input type="range" id="b" min="2" max="4" step="0.5"><input id="c"></section>'
+    (section,) = load_lesson(write_lesson(tmp_path, [("lab", html, [])])).sections
+    assert section.sliders == {
+        "a": {"min": 0.0, "max": 100.0, "step": 1.0, "value": 50.0},
+        "b": {"min": 2.0, "max": 4.0, "step": 0.5, "value": 3.0},
+    }
@@ -0,0 +1,57 @@
+from contextlib import closing
+
+import pytest
+
+from classroom import Attempt, AttemptStore, Reflection, load_dashboard
+
+
+def attempt(attempt_id, student="Ada", class_code="PHYS1", correct=1):
+    responses = (("concept_0", "poles", 0, correct == 1), ("inverse_square_value:k=50,r=2", "inverse", 1, False))
+    return Attempt(attempt_id, "s1", student, class_code, "quiz", 1.0, correct, 2, responses)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AttemptStore(tmp_path / "lesson.db", max_delay=0.01)
+
+
+def summary(store):
+    with closing(store.reader()) as connection:
+        return load_dashboard(connection)
+
+
+def test_records_are_committed(store):
+    store.append([attempt("a1"), Reflection("r1", "s1", "Ada", "PHYS1", 1.0, "Magnets!")]).result(timeout=5)
+    (classroom,) = summary(store).classes
+    assert classroom == {
+        "code": "PHYS1", "students": 1, "attempted": 1, "reflected": 1, "attempts": 1, "reflections": 1,
+    }
+
+
+def test_replayed_records_do_not_count_twice(store):
+    # A browser resends an unacknowledged event, so the same attempt can reach the store again.
+    store.append([attempt("a1"), attempt("a2", student=" ada ")]).result(timeout=5)
+    store.append([attempt("a1"), attempt("a2", student=" ada ")]).result(timeout=5)
+    dashboard = summary(store)
+    (classroom,) = dashboard.classes
+    assert (classroom["students"], classroom["attempts"]) == (1, 2)  # Names match ignoring case and spacing
+    assert {q["question"]: q["answered"] for q in dashboard.questions} == {"concept_0": 2, "inverse_square_value": 2}
+    assert sum(dashboard.scores) == 2
+
+
+def test_writer_survives_a_failed_batch(store, monkeypatch):
+    write = store._write
+    calls = []
+
+    def fail_once(connection, records):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise RuntimeError("disk on fire")
+        write(connection, records)
+
+    monkeypatch.setattr(store, "_write", fail_once)
+    with pytest.raises(RuntimeError, match="disk on fire"):
+        store.append([attempt("a1")]).result(timeout=5)
+    store.append([attempt("a2")]).result(timeout=5)  # The writer thread is still running
+    assert store.flush(timeout=5)
+    assert summary(store).classes[0]["attempts"] == 1
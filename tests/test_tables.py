@@ -0,0 +1,84 @@
+import base64
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from lesson_engine import load_lesson
+from lesson_engine.tables import pack_tables, size_report, slider_stops, table_blob, table_patch
+from lesson_engine.visualizations import slider_table
+from magnetism import FieldCache
+from magnetism.fields import field_strength
+
+VISUALIZATIONS = load_lesson(Path(__file__).resolve().parent.parent / "lessons" / "magnetism").visualizations
+
+
+def unpack(manifest, blob):
+    dtypes = {"float32": np.float32, "uint8": np.uint8}
+    arrays = {}
+    for name, entry in manifest.items():
+        dtype = dtypes[entry["dtype"]]
+        count = int(np.prod(entry["shape"]))
+        arrays[name] = np.frombuffer(blob, dtype=dtype, count=count, offset=entry["offset"]).reshape(entry["shape"])
+    return arrays
+
+
+def test_slider_stops_match_the_browser():
+    stops = slider_stops({"min": 1, "max": 10, "step": 0.1})
+    assert len(stops) == 91
+    assert stops[0] == 1 and stops[-1] == pytest.approx(10)
+    assert slider_stops({"min": 1, "max": 100, "step": 1}).tolist() == list(range(1, 101))
+
+
+def test_pack_tables_round_trips_with_aligned_offsets():
+    arrays = {
+        "mask": np.arange(5, dtype=np.uint8),
+        "curve": np.linspace(0, 1, 6, dtype=np.float32).reshape(2, 3),
+        "grid": np.arange(3, dtype=np.uint8),
+    }
+    manifest, blob = pack_tables(arrays)
+    assert [entry["offset"] for entry in manifest.values()] == [0, 8, 32]
+    assert len(blob) % 4 == 0
+    for name, array in unpack(manifest, blob).items():
+        np.testing.assert_array_equal(array, arrays[name])
+
+
+def test_pack_tables_rejects_other_dtypes():
+    with pytest.raises(ValueError, match="float64"):
+        pack_tables({"curve": np.zeros(3)})
+
+
+def test_table_patch_inlines_or_serves_by_digest(monkeypatch):
+    config = {"table": {"sliders": {}, "budgetBytes": 64}}
+    build = lambda: {"curve": np.arange(4, dtype=np.float32)}  # noqa: E731
+    cache = FieldCache()
+    monkeypatch.delenv("LESSON_TABLES_URL", raising=False)
+    inline = table_patch("test", config, cache, build)
+    blob = base64.b64decode(inline["data"])
+    assert inline["bytes"] == len(blob) == 16
+    assert size_report(inline, blob)["within_budget"]
+
+    monkeypatch.setenv("LESSON_TABLES_URL", "/lesson-tables")
+    served = table_patch("test", config, cache, build)
+    assert "data" not in served
+    assert served["url"] == f"/lesson-tables/test.bin?v={inline['digest']}"
+    assert table_blob(inline["digest"]) == blob
+    assert table_blob("unknown") is None
+
+
+@pytest.mark.parametrize("name", [name for name, config in VISUALIZATIONS.items() if "table" in config])
+def test_lesson_tables_fit_their_budgets(name, monkeypatch):
+    monkeypatch.delenv("LESSON_TABLES_URL", raising=False)
+    table = slider_table(name, VISUALIZATIONS[name], FieldCache())
+    assert size_report(table, base64.b64decode(table["data"]))["within_budget"]
+
+
+def test_field_curve_table_holds_every_stop(monkeypatch):
+    monkeypatch.delenv("LESSON_TABLES_URL", raising=False)
+    config = VISUALIZATIONS["fieldCurve"]
+    table = slider_table("fieldCurve", config, FieldCache())
+    strength = unpack(table["arrays"], base64.b64decode(table["data"]))["strength"]
+    sliders = config["table"]["sliders"]
+    ks, distances = slider_stops(sliders["k"]), slider_stops(sliders["distance"])
+    assert strength.shape == (len(ks), len(distances))
+    np.testing.assert_allclose(strength[3, 40], field_strength(distances[40], ks[3]), rtol=1e-6)
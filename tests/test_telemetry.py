@@ -0,0 +1,65 @@
+import gzip
+import json
+
+import pytest
+
+from lesson_engine import TelemetryCollector, decode_batch, device_class
+from lesson_engine.telemetry import HISTOGRAM_BOUNDS_MS, MAX_BATCH_BYTES
+
+BUCKETS = len(HISTOGRAM_BOUNDS_MS) + 1
+
+
+def histogram(**counts):
+    values = [0] * BUCKETS
+    for bucket, count in counts.items():
+        values[int(bucket[1:])] = count
+    return {"counts": values, "sum": float(sum(values))}
+
+
+def batch(metrics, device=None, counters=None):
+    return json.dumps({"device": device or {"cores": 8, "memory": 8}, "metrics": metrics, "counters": counters or {}}).encode()
+
+
+@pytest.mark.parametrize("device, expected", [
+    ({"cores": 8, "memory": 16, "width": 1440}, "desktop-high"),
+    ({"cores": 4, "width": 1440}, "desktop-mid"),
+    ({"cores": 2, "coarse": True, "width": 390}, "phone-low"),
+    ({"cores": 8, "coarse": True, "width": 1024, "memory": 4}, "tablet-mid"),
+    ({}, "desktop-mid"),
+])
+def test_device_classes(device, expected):
+    assert device_class(device) == expected
+
+
+def test_gzip_batch_decodes():
+    body = gzip.compress(batch({"chart.update": histogram(b3=4)}, counters={"frames.dropped": 2}))
+    device, metrics, counters = decode_batch(body, "gzip")
+    assert device == "desktop-high"
+    assert metrics["chart.update"][0][3] == 4 and counters == {"frames.dropped": 2}
+
+
+@pytest.mark.parametrize("body, encoding", [
+    (b"{", None),
+    (b"not gzip", "gzip"),
+    (batch({"chart.update": {"counts": [1], "sum": 1}}), None),
+    (batch({"Bad Name!": histogram(b0=1)}), None),
+    (batch({"m": histogram(b0=1)}, counters={"c": -1}), None),
+    (json.dumps({"metrics": {}}).encode(), None),
+    (b"{}", "br"),
+    (gzip.compress(b" " * (MAX_BATCH_BYTES + 10)), "gzip"),  # Small compressed, too large once inflated
+])
+def test_malformed_batches_are_rejected(body, encoding):
+    with pytest.raises(ValueError):
+        decode_batch(body, encoding)
+
+
+def test_collector_merges_batches_per_device_class():
+    collector = TelemetryCollector()
+    collector.ingest("phone-low", {"chart.update": ([0, 0, 0, 10] + [0] * (BUCKETS - 4), 60.0)}, {"frames": 5})
+    collector.ingest("phone-low", {"chart.update": ([0] * (BUCKETS - 1) + [1], 9000.0)}, {"frames": 7})
+    snapshot = collector.snapshot()
+    summary = snapshot["devices"]["phone-low"]["chart.update"]
+    assert snapshot["batches"] == 2 and summary["n"] == 11
+    assert summary["p50_le"] == HISTOGRAM_BOUNDS_MS[3] and summary["p95_le"] is None  # Slower than the last bound
+    assert summary["mean"] == pytest.approx(9060.0 / 11, abs=0.01)
+    assert snapshot["counters"] == {"phone-low": {"frames": 12}}
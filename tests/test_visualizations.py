@@ -0,0 +1,85 @@
+import base64
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from lesson_engine import load_lesson
+from lesson_engine.visualizations import compass, field_curve, field_lines, particle_lab, particle_stream
+from magnetism import FieldCache
+from magnetism.fields import field_strength, grid, superposed_field
+
+VISUALIZATIONS = load_lesson(Path(__file__).resolve().parent.parent / "lessons" / "magnetism").visualizations
+
+
+def unpack_float32(data, resolution):
+    return np.frombuffer(base64.b64decode(data), dtype="<f4").reshape(resolution, resolution)
+
+
+def test_field_curve_samples_the_inverse_square_law():
+    config = VISUALIZATIONS["fieldCurve"]
+    patch = field_curve(config, {}, FieldCache())
+    xs = np.linspace(config["min"], config["max"], config["resolution"])
+    np.testing.assert_allclose(patch["ys"], field_strength(xs, config["k"]), atol=1e-6)
+
+
+@pytest.mark.parametrize("state", [{}, {"fieldLineSource": "unknown"}, {"fieldLineSource": None}])
+def test_field_lines_fall_back_to_the_default_source(state):
+    config = VISUALIZATIONS["fieldLines"]
+    patch = field_lines(config, state, FieldCache())
+    assert patch["source"] == config["default"]
+    # The browser moves its tracers with the batched kernel for this model (widgets/field-kernels.js).
+    assert patch["model"] == "bar_magnet" and patch["params"] == {"length": 1.0}
+
+
+def test_compass_sends_the_superposed_field_of_its_scene():
+    config = VISUALIZATIONS["compass"]
+    scene = next(name for name in config["scenes"] if name != config["default"])
+    patch = compass(config, {"compassScenario": scene}, FieldCache())
+    assert patch["scenario"] == scene and patch["sources"] == config["scenes"][scene]
+    x, y = grid(config["resolution"], config["extent"])
+    sources = [(source["kind"], {k: v for k, v in source.items() if k != "kind"}) for source in patch["sources"]]
+    bx, _ = superposed_field(x, y, sources)
+    np.testing.assert_allclose(unpack_float32(patch["bx"], config["resolution"]), bx, rtol=1e-6, atol=1e-12)
+
+
+def test_compass_falls_back_to_the_default_scene():
+    config = VISUALIZATIONS["compass"]
+    assert compass(config, {"compassScenario": "unknown"}, FieldCache())["scenario"] == config["default"]
+
+
+def small_particle_lab():
+    return {**VISUALIZATIONS["particleLab"], "particles": 200, "steps": 60, "recordEvery": 5, "display": 40, "chunkFrames": 5}
+
+
+def test_particle_lab_inlines_int16_frames(monkeypatch):
+    monkeypatch.delenv("PARTICLE_STREAM_URL", raising=False)
+    config = small_particle_lab()
+    patch = particle_lab(config, {"particleScene": "unknown"}, FieldCache())
+    assert patch["scene"] == config["default"]
+    frames = np.frombuffer(base64.b64decode(patch["data"]), dtype="<i2")
+    assert frames.size == patch["frames"] * patch["display"] * 2
+    assert patch["stats"]["speedDrift"] < 1e-9
+
+
+def test_particle_lab_streams_the_same_frames_in_chunks(monkeypatch):
+    config = small_particle_lab()
+    monkeypatch.setenv("PARTICLE_STREAM_URL", "/particles")
+    cache = FieldCache()
+    streamed = particle_lab(config, {"particleScene": "mirror"}, cache)
+    # The rerun only launches the particles: nothing is integrated until the stream is read.
+    assert cache.stats().misses == 0
+    assert "data" not in streamed and "stats" not in streamed and streamed["chunkFrames"] == 5
+    monkeypatch.delenv("PARTICLE_STREAM_URL")
+    inline = particle_lab(config, {"particleScene": "mirror"}, FieldCache())
+    assert {key: streamed[key] for key in ("frames", "display")} == {key: inline[key] for key in ("frames", "display")}
+    frame_bytes = inline["display"] * 4
+    assert base64.b64decode(streamed["preview"]) == base64.b64decode(inline["data"])[:frame_bytes]
+    digest = streamed["stream"].rsplit("/", 1)[1]
+    chunks = list(particle_stream(digest, cache))
+    assert len(chunks) == -(-streamed["frames"] // 5) + 1
+    assert b"".join(chunks[:-1]) == base64.b64decode(inline["data"])
+    stats = json.loads(chunks[-1])
+    assert stats.keys() == inline["stats"].keys() and stats["trapped"] == inline["stats"]["trapped"]
+    assert particle_stream("unknown", cache) is None